@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: autosave of one answer, full-row save vs. key-level JSON patch.
+
+Runs against a throwaway test database. For checklists whose answer_data
+holds a growing number of keys (plus a remark on every photo row), times one
+autosave the old way (load the row, change one key, save() every column) and
+the new way (Checklist.set_data_key, a single json_set UPDATE), and checks
+both leave the same answer_data.
+
+Usage:
+    python benchmarks/bench_autosave.py [--iterations 200] [--sizes 100,1000,5000]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "checklist.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import F  # noqa: E402
+
+from core.models import Checklist, Project  # noqa: E402
+
+
+def old_autosave(checklist_id: int, row: str, value):
+	"""The previous checklist_autosave_api answer branch."""
+	checklist = Checklist.objects.get(id=checklist_id)
+	answer_data = checklist.answer_data or {}
+	answer_data[row] = value
+	checklist.answer_data = answer_data
+	checklist.save()
+	Checklist.objects.filter(pk=checklist.pk).update(content_version=F("content_version") + 1)
+
+
+def new_autosave(checklist_id: int, row: str, value):
+	"""The current answer branch: no blob is read, one key is written."""
+	checklist = Checklist.objects.only("id").get(id=checklist_id)
+	checklist.set_data_key("answer_data", row, value)
+
+
+def make_checklist(user, project, keys: int) -> Checklist:
+	answers = {str(row): f"Answer text for row {row} " * 3 for row in range(keys)}
+	remarks = {str(row): f"Remark for photo row {row}" for row in range(22, 186)}
+	return Checklist.objects.create(
+		user=user, project=project, site_id=f"BENCH-{keys}",
+		answer_data=answers, remark_data=remarks,
+	)
+
+
+def time_autosave(label, autosave, checklist_id, iterations):
+	samples = []
+	for iteration in range(iterations):
+		started = time.perf_counter()
+		autosave(checklist_id, "5", f"edit {iteration}")
+		samples.append(time.perf_counter() - started)
+	print(f"  {label:<16} median {statistics.median(samples) * 1000:7.2f} ms   p95 {sorted(samples)[int(len(samples) * 0.95)] * 1000:7.2f} ms")
+	return statistics.median(samples)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--iterations", type=int, default=200)
+	parser.add_argument("--sizes", default="100,1000,5000")
+	args = parser.parse_args()
+	sizes = [int(size) for size in args.sizes.split(",")]
+
+	old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+	try:
+		user = User.objects.create_user("bench")
+		project = Project.objects.create(name="Bench")
+		for keys in sizes:
+			old_checklist = make_checklist(user, project, keys)
+			new_checklist = make_checklist(user, project, keys)
+			print(f"\nanswer_data with {keys} keys ({len(json.dumps(old_checklist.answer_data)) / 1024:.0f} KiB)")
+			before = time_autosave("full-row save", old_autosave, old_checklist.id, args.iterations)
+			after = time_autosave("json_set patch", new_autosave, new_checklist.id, args.iterations)
+			old_checklist.refresh_from_db()
+			new_checklist.refresh_from_db()
+			if old_checklist.answer_data != new_checklist.answer_data:
+				print("  answer_data differs")
+				return 1
+			print(f"  Speedup: {before / after:.1f}x")
+	finally:
+		connection.creation.destroy_test_db(old_name, verbosity=0)
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark: zip-level copy-through writer vs. full openpyxl round-trip.
+
+Builds the same checklist workbook from the FDED template shipped in the repo
+with both writers, checks that the results are cell-for-cell identical and
+prints timings. The checklist lives in a throwaway test database.
+
+Usage:
+    python benchmarks/bench_excel_copy.py [--iterations 10] [--photos 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "checklist.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from openpyxl import load_workbook  # noqa: E402
+from openpyxl.utils import get_column_letter  # noqa: E402
+from PIL import Image as PilImage  # noqa: E402
+
+from core.equipment import parse_electrical_edit, parse_equipment_edit, upsert_electrical_data, upsert_tower_equipment  # noqa: E402
+from core.models import Checklist, Project  # noqa: E402
+from core.template_cache import IMAGE_SECTION_ROWS  # noqa: E402
+from core.views import _build_excel_patch, _write_excel_copy_openpyxl  # noqa: E402
+from core.xlsx_writer import TemplatePrototype, write_patched_workbook  # noqa: E402
+
+TEMPLATE = BASE_DIR / "FDED-SURVEY-CHECKLIST-NOKIA-TAWAL-TEMPLATE.xlsx"
+
+
+def make_checklist(media_root: str, photos: int) -> Checklist:
+	"""A checklist with answers in every section, equipment rows and `photos` photos."""
+	answers = {str(row): f"Answer {row}" for row in range(4, 19)}
+	answers.update({str(row): f"{row * 1.5}" for row in range(187, 194)})
+
+	photo_rows = [row for start, stop in IMAGE_SECTION_ROWS for row in range(start, stop)]
+	remarks = {str(row): f"Remark for row {row}" for row in photo_rows}
+
+	images = []
+	os.makedirs(os.path.join(media_root, "photos"), exist_ok=True)
+	for idx in range(photos):
+		name = f"photos/photo_{idx}.jpg"
+		PilImage.effect_noise((1920, 1080), 40 + idx).convert("RGB").save(os.path.join(media_root, name), quality=90)
+		images.append((photo_rows[idx // 2], name))
+
+	checklist = Checklist.objects.create(
+		user=User.objects.create_user("bench"),
+		project=Project.objects.create(name="Bench"),
+		site_id="BENCH-1", answer_data=answers, remark_data=remarks,
+	)
+	for row, name in images:
+		checklist.add_image(row, name)
+	equipment = []
+	for idx in range(1, 7):
+		equipment.append(parse_equipment_edit({
+			"operator": "STC", "equipment_type": "ANTENNA",
+			"equipment_data": {"model": f"ANT-{idx}", "dimension": "1.2m", "height": "25", "azimuth": str(idx * 60), "sector": "A", "position_index": idx},
+		}))
+		equipment.append(parse_equipment_edit({
+			"operator": "OTHER", "equipment_type": "RADIO",
+			"equipment_data": {"model": f"RRU-{idx}", "dimension": "small", "height": "24", "sector": "B", "position_index": idx},
+		}))
+	upsert_tower_equipment(checklist, equipment)
+	upsert_electrical_data(checklist, [
+		parse_electrical_edit({"row": row, "electrical_data": {"voltage": "230", "current_r": "10", "current_y": "11", "current_b": "12", "remarks": "ok"}})
+		for row in (261, 262, 263)
+	])
+	return checklist
+
+
+def _column_width(ws, col: int) -> float:
+	"""Width of a column, whether it has its own <col> or sits in a range."""
+	letter = get_column_letter(col)
+	if letter in ws.column_dimensions:
+		return ws.column_dimensions[letter].width or 0
+	for dimension in ws.column_dimensions.values():
+		if dimension.min and dimension.max and dimension.min <= col <= dimension.max:
+			return dimension.width or 0
+	return 0
+
+
+def compare(path_a: str, path_b: str):
+	"""Return a list of differences between two workbooks' active sheets."""
+	ws_a = load_workbook(path_a).active
+	ws_b = load_workbook(path_b).active
+	diffs = []
+	max_row = max(ws_a.max_row, ws_b.max_row)
+	max_col = max(ws_a.max_column, ws_b.max_column)
+	for row in range(1, max_row + 1):
+		for col in range(1, max_col + 1):
+			value_a = ws_a.cell(row=row, column=col).value
+			value_b = ws_b.cell(row=row, column=col).value
+			if value_a != value_b:
+				diffs.append(f"cell {ws_a.cell(row=row, column=col).coordinate}: {value_a!r} != {value_b!r}")
+	if sorted(map(str, ws_a.merged_cells.ranges)) != sorted(map(str, ws_b.merged_cells.ranges)):
+		diffs.append("merged ranges differ")
+	for row in range(1, max_row + 1):
+		height_a = ws_a.row_dimensions[row].height
+		height_b = ws_b.row_dimensions[row].height
+		if height_a != height_b and not (height_a and height_b and abs(height_a - height_b) < 1e-6):
+			diffs.append(f"row {row} height: {height_a} != {height_b}")
+	for col in range(1, max_col + 1):
+		width_a = _column_width(ws_a, col)
+		width_b = _column_width(ws_b, col)
+		if abs(width_a - width_b) > 1e-6:
+			diffs.append(f"column {col} width: {width_a} != {width_b}")
+	anchors_a = sorted((img.anchor._from.row, img.anchor._from.col) for img in ws_a._images)
+	anchors_b = sorted((img.anchor._from.row, img.anchor._from.col) for img in ws_b._images)
+	if anchors_a != anchors_b:
+		diffs.append(f"images differ: {len(anchors_a)} vs {len(anchors_b)}")
+	return diffs
+
+
+def time_writer(label, writer, iterations):
+	samples = []
+	for _ in range(iterations):
+		started = time.perf_counter()
+		writer()
+		samples.append(time.perf_counter() - started)
+	print(f"{label:<22} median {statistics.median(samples) * 1000:8.1f} ms   min {min(samples) * 1000:8.1f} ms")
+	return statistics.median(samples)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--iterations", type=int, default=10)
+	parser.add_argument("--photos", type=int, default=20)
+	args = parser.parse_args()
+
+	old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+	try:
+		return run(args)
+	finally:
+		connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def run(args):
+	with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+		checklist = make_checklist(media_root, args.photos)
+		patch = _build_excel_patch(checklist)
+		openpyxl_out = os.path.join(media_root, "openpyxl.xlsx")
+		zip_out = os.path.join(media_root, "copy_through.xlsx")
+
+		_write_excel_copy_openpyxl(str(TEMPLATE), openpyxl_out, patch)
+		write_patched_workbook(str(TEMPLATE), zip_out, patch)
+		diffs = compare(openpyxl_out, zip_out)
+		if diffs:
+			print("Outputs differ:")
+			for diff in diffs[:50]:
+				print(f"  {diff}")
+			return 1
+		print(f"Outputs identical ({len(patch.cells)} cell writes, {len(patch.images)} photos)")
+
+		print(f"\nTemplate: {TEMPLATE.name}, {args.iterations} iterations")
+		before = time_writer("openpyxl round-trip", lambda: _write_excel_copy_openpyxl(str(TEMPLATE), openpyxl_out, patch), args.iterations)
+		after = time_writer("zip copy-through", lambda: write_patched_workbook(str(TEMPLATE), zip_out, patch), args.iterations)
+		prototype = TemplatePrototype(str(TEMPLATE))
+		preloaded = time_writer("  + cached prototype", lambda: write_patched_workbook(prototype, zip_out, patch), args.iterations)
+		print(f"\nSpeedup: {before / after:.1f}x ({before / preloaded:.1f}x with a cached prototype)")
+		print(f"Output size: openpyxl {os.path.getsize(openpyxl_out) / 1024:.0f} KiB, copy-through {os.path.getsize(zip_out) / 1024:.0f} KiB")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
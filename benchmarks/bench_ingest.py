@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: photo ingestion of one multi-photo upload, one at a time vs. the pool.
+
+Makes --photos synthetic camera-sized photos (noisy, so they compress like
+real ones): half 12 MP JPEGs at quality 95, half PNGs like the ones a canvas
+capture produces. Times core.ingest.ingest_photo over them one after another,
+then core.ingest.ingest_photos on the shared thread pool, and reports the
+bytes saved.
+
+Usage:
+    python benchmarks/bench_ingest.py [--photos 8] [--threads 4]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "checklist.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.files.uploadedfile import SimpleUploadedFile  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from PIL import Image as PilImage  # noqa: E402
+
+from core import ingest  # noqa: E402
+
+
+def make_photo(index: int) -> SimpleUploadedFile:
+	image = PilImage.effect_noise((4000, 3000) if index % 2 else (1920, 1080), 40).convert("RGB")
+	output = io.BytesIO()
+	if index % 2:
+		image.save(output, format="JPEG", quality=95)
+		return SimpleUploadedFile(f"IMG_{index}.JPG", output.getvalue())
+	image.save(output, format="PNG")
+	return SimpleUploadedFile(f"photo_{index}.jpg", output.getvalue())
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--photos", type=int, default=8)
+	parser.add_argument("--threads", type=int, default=4)
+	args = parser.parse_args()
+
+	uploads = [make_photo(index) for index in range(args.photos)]
+	payloads = [ingest.read_upload(upload)[0] for upload in uploads]
+	received = sum(len(payload) for payload in payloads)
+	print(f"{args.photos} photos, {received / 1024 / 1024:.1f} MiB received")
+
+	with override_settings(PHOTO_INGEST_THREADS=args.threads):
+		started = time.perf_counter()
+		for payload in payloads:
+			ingest.ingest_photo(payload)
+		sequential = time.perf_counter() - started
+
+		started = time.perf_counter()
+		results = ingest.ingest_photos(payloads)
+		pooled = time.perf_counter() - started
+
+	stored = sum(len(result.content) for result in results)
+	print(f"  one at a time     {sequential * 1000:8.0f} ms")
+	print(f"  pool ({args.threads} threads)  {pooled * 1000:8.0f} ms   ({sequential / pooled:.1f}x)")
+	print(f"  stored {stored / 1024 / 1024:.1f} MiB, saved {(received - stored) / 1024 / 1024:.1f} MiB ({1 - stored / received:.0%})")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
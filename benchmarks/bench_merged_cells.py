@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: resolving writes into merged cells, linear scan vs. anchor index.
+
+Applies cell writes to the FDED template's active sheet the old way (scan
+every merged range for each write into a MergedCell) and through the
+(row, col) -> anchor index, checks both leave the same values and prints the
+write time for two workloads:
+
+- a full checklist, as built by _build_excel_patch (the FDED layout writes
+  mostly to anchor cells, so the scan rarely runs)
+- one write into a covered, non-anchor cell of every merged range, the case
+  where the scan cost grows with writes x merged ranges
+
+Usage:
+    python benchmarks/bench_merged_cells.py [--iterations 50]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "checklist.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from openpyxl import load_workbook  # noqa: E402
+from openpyxl.cell.cell import MergedCell  # noqa: E402
+from openpyxl.utils import get_column_letter  # noqa: E402
+
+from bench_excel_copy import TEMPLATE, make_checklist  # noqa: E402
+from core.views import _build_excel_patch  # noqa: E402
+from core.xlsx_writer import split_coordinate, worksheet_merged_anchor_index  # noqa: E402
+
+
+def write_linear_scan(worksheet, cells):
+	"""The previous write path: a linear scan of merged ranges per merged write."""
+	for cell_ref, value in cells.items():
+		cell = worksheet[cell_ref]
+		if isinstance(cell, MergedCell):
+			for merged_range in worksheet.merged_cells.ranges:
+				if cell.coordinate in merged_range:
+					worksheet[merged_range.start_cell.coordinate] = value
+					break
+		else:
+			worksheet[cell_ref] = value
+
+
+def write_indexed(worksheet, cells):
+	"""The current write path: one index per worksheet, O(1) per write."""
+	anchors = worksheet_merged_anchor_index(worksheet)
+	for cell_ref, value in cells.items():
+		key = split_coordinate(cell_ref)
+		row, column = anchors.get(key, key)
+		worksheet.cell(row=row, column=column).value = value
+
+
+def snapshot(worksheet):
+	return {
+		cell.coordinate: cell.value
+		for row in worksheet.iter_rows()
+		for cell in row
+		if not isinstance(cell, MergedCell) and cell.value is not None
+	}
+
+
+def time_writes(label, writer, worksheet, cells, iterations):
+	samples = []
+	for _ in range(iterations):
+		started = time.perf_counter()
+		writer(worksheet, cells)
+		samples.append(time.perf_counter() - started)
+	print(f"{label:<22} median {statistics.median(samples) * 1000:8.2f} ms   min {min(samples) * 1000:8.2f} ms")
+	return statistics.median(samples)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--iterations", type=int, default=50)
+	args = parser.parse_args()
+
+	# make_checklist saves its checklist, so build the patch in a throwaway database
+	old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+	try:
+		with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+			checklist_cells = _build_excel_patch(make_checklist(media_root, photos=0)).cells
+	finally:
+		connection.creation.destroy_test_db(old_name, verbosity=0)
+
+	template_ws = load_workbook(TEMPLATE).active
+	merged_cells = {}
+	for cell_range in template_ws.merged_cells.ranges:
+		coordinate = f"{get_column_letter(cell_range.max_col)}{cell_range.max_row}"
+		merged_cells[coordinate] = f"value for {cell_range.coord}"
+	print(f"{len(template_ws.merged_cells.ranges)} merged ranges, {args.iterations} iterations")
+
+	for title, cells in (("Checklist writes", checklist_cells), ("Writes into merged cells", merged_cells)):
+		scan_ws = load_workbook(TEMPLATE).active
+		indexed_ws = load_workbook(TEMPLATE).active
+		write_linear_scan(scan_ws, cells)
+		write_indexed(indexed_ws, cells)
+		if snapshot(scan_ws) != snapshot(indexed_ws):
+			print(f"{title}: write paths disagree")
+			return 1
+
+		merged_writes = sum(isinstance(scan_ws[ref], MergedCell) for ref in cells)
+		print(f"\n{title}: {len(cells)} cell writes, {merged_writes} into merged cells")
+		before = time_writes("linear scan", write_linear_scan, scan_ws, cells, args.iterations)
+		after = time_writes("anchor index", write_indexed, indexed_ws, cells, args.iterations)
+		print(f"Speedup: {before / after:.1f}x")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming question reader vs. full openpyxl workbook load.
+
+Reads the questions out of the FDED template, and out of a copy padded with
+extra rows below the checklist, with both readers. Checks they return the
+same layout and prints time and peak Python memory (tracemalloc) for each.
+
+Usage:
+    python benchmarks/bench_template_reader.py [--iterations 10] [--extra-rows 20000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "checklist.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from openpyxl import load_workbook  # noqa: E402
+
+from core.template_cache import parse_template_questions, parse_template_questions_openpyxl  # noqa: E402
+
+TEMPLATE = BASE_DIR / "FDED-SURVEY-CHECKLIST-NOKIA-TAWAL-TEMPLATE.xlsx"
+
+
+def make_padded_template(path: str, extra_rows: int):
+	"""The FDED template with `extra_rows` rows of text appended below it."""
+	workbook = load_workbook(TEMPLATE)
+	worksheet = workbook.active
+	first = worksheet.max_row + 1
+	for row in range(first, first + extra_rows):
+		for col in range(1, 9):
+			worksheet.cell(row=row, column=col, value=f"Padding text for row {row} column {col}")
+	workbook.save(path)
+
+
+def measure(label, reader, path, iterations):
+	samples = []
+	for _ in range(iterations):
+		started = time.perf_counter()
+		reader(path)
+		samples.append(time.perf_counter() - started)
+	tracemalloc.start()
+	reader(path)
+	_current, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	print(
+		f"{label:<12} median {statistics.median(samples) * 1000:9.1f} ms"
+		f"   min {min(samples) * 1000:9.1f} ms   peak {peak / 1024 / 1024:7.1f} MiB"
+	)
+	return statistics.median(samples)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--iterations", type=int, default=10)
+	parser.add_argument("--extra-rows", type=int, default=20000)
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory() as tmp_dir:
+		padded = os.path.join(tmp_dir, "padded.xlsx")
+		make_padded_template(padded, args.extra_rows)
+
+		for title, path in (
+			(TEMPLATE.name, str(TEMPLATE)),
+			(f"padded with {args.extra_rows} rows", padded),
+		):
+			streamed = parse_template_questions(path)
+			if streamed != parse_template_questions_openpyxl(path):
+				print(f"{title}: readers disagree")
+				return 1
+			general, image, dc_power, _site_id = streamed
+			print(f"\n{title} ({os.path.getsize(path) / 1024:.0f} KiB, {len(general) + len(image) + len(dc_power)} questions)")
+			before = measure("openpyxl", parse_template_questions_openpyxl, path, args.iterations)
+			after = measure("streaming", parse_template_questions, path, args.iterations)
+			print(f"Speedup: {before / after:.1f}x")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
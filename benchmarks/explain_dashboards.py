@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Query plans of the dashboard and assignment queries on a seeded database.
+
+Seeds a throwaway test database with --rows checklists, work assignments and
+locations spread over a few projects and engineers. Then prints EXPLAIN QUERY
+PLAN and the time to fetch the first page for every list query of
+dev_admin_view, _team_lead_dashboard, _engineer_dashboard and assign_work,
+first with the dashboard indexes dropped and then with them in place.
+
+Usage:
+    python benchmarks/explain_dashboards.py [--rows 100000] [--page 50]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "checklist.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection, models  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from core.models import Checklist, GeoLocation, Profile, Project, WorkAssignment  # noqa: E402
+
+PROJECTS = 5
+ENGINEERS_PER_PROJECT = 20
+BATCH_SIZE = 5000
+
+
+def seed(rows: int):
+	rng = random.Random(15)
+	now = timezone.now()
+	admin = User.objects.create_user("bench-admin")
+	projects = [Project.objects.create(name=f"Bench {idx}") for idx in range(PROJECTS)]
+	engineers = []
+	for project in projects:
+		for idx in range(ENGINEERS_PER_PROJECT):
+			user = User.objects.create_user(f"eng-{project.id}-{idx}")
+			Profile.objects.filter(user=user).update(project=project, path=f"E{project.id}-{idx}")
+			engineers.append((user, project))
+
+	statuses = [choice for choice, _label in Checklist.Status.choices]
+	checklists = []
+	for idx in range(rows):
+		user, project = engineers[idx % len(engineers)]
+		checklists.append(Checklist(
+			user=user, project=project, site_id=f"SITE-{idx:06d}", status=rng.choice(statuses),
+			answer_data={"12": f"SITE-{idx:06d}"},
+		))
+	Checklist.objects.bulk_create(checklists, batch_size=BATCH_SIZE)
+
+	assignments = []
+	for idx in range(0, rows, 2):
+		user, project = engineers[idx % len(engineers)]
+		assignments.append(WorkAssignment(
+			site_id=f"SITE-{idx:06d}", latitude=24, longitude=46, description="",
+			assigned_to=user, assigned_by=admin, project=project,
+		))
+	WorkAssignment.objects.bulk_create(assignments, batch_size=BATCH_SIZE)
+
+	locations = [
+		GeoLocation(
+			name=f"SITE-{idx:06d}", latitude=24, longitude=46,
+			project=projects[idx % PROJECTS], created_by=admin,
+		)
+		for idx in range(rows)
+	]
+	GeoLocation.objects.bulk_create(locations, batch_size=BATCH_SIZE)
+	GeoLocation.objects.filter(name__in=WorkAssignment.objects.values("site_id")).update(is_assigned=True)
+
+	# auto_now / auto_now_add give every row the same instant; spread them out like real edits
+	with connection.cursor() as cursor:
+		for model, field in ((Checklist, "updated_at"), (WorkAssignment, "created_at"), (GeoLocation, "created_at")):
+			cursor.execute(
+				f"UPDATE {model._meta.db_table} SET {field} = datetime(%s, '-' || (id * 37 %% %s) || ' minutes')",
+				[now.strftime("%Y-%m-%d %H:%M:%S"), rows],
+			)
+		cursor.execute("ANALYZE")
+	return projects, engineers
+
+
+def dashboard_queries(project, engineer):
+	"""(label, queryset) for each list the dashboards render, built as the views build them."""
+	checklists = Checklist.objects.select_related("user", "user__profile", "project")
+	return [
+		("admin: checklists", checklists.order_by("-updated_at")),
+		("admin: checklists by status", checklists.filter(status=Checklist.Status.SUBMITTED).order_by("-updated_at")),
+		("admin: final per engineer", Checklist.objects.values("user__username").filter(status=Checklist.Status.FINAL).annotate(total=models.Count("id")).order_by("-total")),
+		("admin: unassigned locations", GeoLocation.objects.select_related("project", "created_by").filter(is_assigned=False).order_by("-created_at")),
+		("admin: work assignments", WorkAssignment.objects.select_related("assigned_to", "assigned_to__profile", "assigned_by", "project").order_by("-created_at")),
+		("team lead: checklists", checklists.filter(project=project).order_by("-updated_at")),
+		("team lead: checklists by status", checklists.filter(project=project, status=Checklist.Status.SUBMITTED).order_by("-updated_at")),
+		("team lead: final per engineer", Checklist.objects.values("user__username").filter(project=project, status=Checklist.Status.FINAL).annotate(total=models.Count("id")).order_by("-total")),
+		("team lead: unassigned locations", GeoLocation.objects.select_related("project", "created_by").filter(models.Q(project=project) | models.Q(project__isnull=True)).filter(is_assigned=False).order_by("-created_at")),
+		("team lead: work assignments", WorkAssignment.objects.select_related("assigned_to", "assigned_to__profile", "assigned_by", "project").filter(project=project).order_by("-created_at")),
+		("engineer: checklists", Checklist.objects.filter(user=engineer, project=project).order_by("-updated_at")),
+		("engineer: my work", WorkAssignment.objects.select_related("assigned_by", "project").filter(assigned_to=engineer).order_by("-created_at")),
+		("assign_work: site taken?", WorkAssignment.objects.select_related("assigned_to").filter(site_id="SITE-000500")),
+	]
+
+
+def dashboard_indexes():
+	return [(model, index) for model in (Checklist, GeoLocation, WorkAssignment) for index in model._meta.indexes]
+
+
+def report(queries, page: int):
+	timings = {}
+	for label, queryset in queries:
+		started = time.perf_counter()
+		list(queryset[:page])
+		timings[label] = time.perf_counter() - started
+		print(f"\n{label} ({timings[label] * 1000:.1f} ms for {page} rows)")
+		for line in queryset.explain().splitlines():
+			print(f"    {line}")
+	return timings
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--rows", type=int, default=100000)
+	parser.add_argument("--page", type=int, default=50)
+	args = parser.parse_args()
+
+	old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+	try:
+		started = time.perf_counter()
+		projects, engineers = seed(args.rows)
+		print(f"Seeded {args.rows} checklists, {args.rows // 2} assignments, {args.rows} locations in {time.perf_counter() - started:.1f} s")
+		engineer, project = engineers[0]
+		queries = dashboard_queries(project, engineer)
+
+		print("\n=== Without the dashboard indexes ===")
+		with connection.schema_editor() as editor:
+			for model, index in dashboard_indexes():
+				editor.remove_index(model, index)
+		before = report(queries, args.page)
+
+		print("\n=== With the dashboard indexes ===")
+		with connection.schema_editor() as editor:
+			for model, index in dashboard_indexes():
+				editor.add_index(model, index)
+		with connection.cursor() as cursor:
+			cursor.execute("ANALYZE")
+		after = report(queries, args.page)
+
+		print("\nFirst page, without -> with indexes")
+		for label, _queryset in queries:
+			print(f"  {label:<34} {before[label] * 1000:8.1f} ms -> {after[label] * 1000:8.1f} ms")
+	finally:
+		connection.creation.destroy_test_db(old_name, verbosity=0)
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
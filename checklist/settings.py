@@ -89,6 +89,11 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Web workers and job workers write concurrently; wait for locks instead of failing
+            'timeout': 20,
+            'init_command': 'PRAGMA journal_mode=WAL;',
+        },
     }
 }
 
@@ -134,6 +139,42 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Parsed template layouts shared by all gunicorn workers
+TEMPLATE_CACHE_DIR = BASE_DIR / 'cache' / 'templates'
+TEMPLATE_CACHE_SIZE = 16
+
+# Gallery thumbnails made on demand; least recently used ones are deleted past the limit
+THUMBNAIL_CACHE_DIR = BASE_DIR / 'cache' / 'thumbnails'
+THUMBNAIL_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Uploaded photos are re-encoded before they are stored (core.ingest)
+PHOTO_MAX_EDGE = 2560
+PHOTO_FORMAT = 'JPEG'  # or 'WEBP'
+PHOTO_QUALITY = 82
+PHOTO_INGEST_THREADS = 4
+# Django's default handlers, plus a SHA-256 of each file taken as it streams in
+FILE_UPLOAD_HANDLERS = [
+    'core.ingest.HashingMemoryFileUploadHandler',
+    'core.ingest.HashingTemporaryFileUploadHandler',
+]
+
+# Resumable chunked uploads (core.uploads); chunks must fit nginx's client_max_body_size
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+UPLOAD_MAX_BYTES = {'zip': 2 * 1024 * 1024 * 1024, 'photo': 64 * 1024 * 1024}
+UPLOAD_SESSION_MAX_AGE = 2 * 24 * 60 * 60  # seconds without a chunk before manage.py purge_uploads drops it
+
+# Background jobs (manage.py run_workers)
+JOB_WORKER_PROCESSES = 2
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = 10  # seconds, doubled on each retry
+JOB_POLL_INTERVAL = 1.0
+JOB_RETENTION = 7 * 24 * 60 * 60  # seconds a DONE job is kept
+JOB_PURGE_INTERVAL = 60 * 60  # seconds between run_workers' purges of old DONE jobs
+
+# Dashboard tables: rows per page (?page_size= may ask for up to the maximum)
+DASHBOARD_PAGE_SIZE = 50
+DASHBOARD_MAX_PAGE_SIZE = 200
+
 
 # Logging
 LOGGING = {
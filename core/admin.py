@@ -3,7 +3,7 @@ from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from django.contrib.auth.models import User
 
 from .models import (
-	Checklist, Profile, Project, GeoLocation, WorkAssignment,
+	Checklist, Profile, Project, GeoLocation, WorkAssignment, Job, StatusCount, PhotoBlob, UploadSession,
 	ChecklistSection, ChecklistImage, DCPowerSystemData, TowerEquipment, ElectricalData
 )
 
@@ -69,6 +69,36 @@ class WorkAssignmentAdmin(admin.ModelAdmin):
 	)
 
 
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+	list_display = ('id', 'kind', 'target_id', 'status', 'attempts', 'duration_ms', 'created_at', 'finished_at')
+	list_filter = ('status', 'kind')
+	search_fields = ('target_id',)
+	readonly_fields = ('created_at', 'started_at', 'finished_at', 'duration_ms', 'last_error')
+
+
+@admin.register(StatusCount)
+class StatusCountAdmin(admin.ModelAdmin):
+	list_display = ('kind', 'project', 'user', 'status', 'count')
+	list_filter = ('kind', 'status', 'project')
+	search_fields = ('user__username',)
+	readonly_fields = ('kind', 'project', 'user', 'status', 'count')
+
+
+@admin.register(PhotoBlob)
+class PhotoBlobAdmin(admin.ModelAdmin):
+	list_display = ('file', 'size', 'ref_count', 'created_at')
+	search_fields = ('sha256', 'source_sha256')
+	readonly_fields = ('sha256', 'file', 'size', 'source_sha256', 'ref_count', 'created_at')
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+	list_display = ('filename', 'kind', 'checklist', 'user', 'received', 'size', 'updated_at')
+	list_filter = ('kind',)
+	readonly_fields = ('id', 'checklist', 'user', 'kind', 'row_number', 'filename', 'size', 'received', 'path', 'created_at', 'updated_at')
+
+
 class UserAdmin(DjangoUserAdmin):
 	inlines = [ProfileInline]
 
@@ -89,9 +119,9 @@ class ChecklistSectionAdmin(admin.ModelAdmin):
 
 @admin.register(ChecklistImage)
 class ChecklistImageAdmin(admin.ModelAdmin):
-	list_display = ('checklist', 'section', 'column_position', 'uploaded_at')
+	list_display = ('checklist', 'row_number', 'image', 'original_size', 'stored_size', 'uploaded_at')
 	list_filter = ('uploaded_at', 'column_position')
-	readonly_fields = ('uploaded_at',)
+	readonly_fields = ('uploaded_at', 'blob')
 
 
 @admin.register(DCPowerSystemData)
@@ -0,0 +1,160 @@
+"""
+Tower equipment and electrical readings of a checklist.
+
+These used to be answer_data keys ("equipment_<unique_id>", "electrical_<row>")
+that every reader had to find by scanning all keys and regrouping. They are now
+TowerEquipment / ElectricalData rows, unique per (checklist, operator_type,
+equipment_type, position_index) and (checklist, row_number), so lookups use
+that index and a batch of edits is written with one bulk upsert per model.
+"""
+from .models import ElectricalData, TowerEquipment
+
+# Equipment blocks: (operator, type, first row, max rows, field -> column)
+# STC columns: AB merged => A, C, D, E, F
+# OTHER operator columns: IJ merged => I, K, L, M, N
+EQUIPMENT_BLOCKS = (
+	('STC', 'ANTENNA', 198, 15, {'model': 'A', 'dimension': 'C', 'height': 'D', 'azimuth': 'E', 'sector': 'F'}),
+	('STC', 'RADIO', 215, 15, {'model': 'A', 'dimension': 'C', 'height': 'D', 'sector': 'E'}),
+	('STC', 'FPFH', 232, 15, {'model': 'A', 'dimension': 'C', 'height': 'D', 'empty_port': 'E', 'sector': 'F'}),
+	('STC', 'MICROWAVE', 249, 9, {'model': 'A', 'dimension': 'C', 'height': 'D', 'azimuth': 'E', 'sector': 'F'}),
+	('OTHER', 'ANTENNA', 198, 18, {'model': 'I', 'dimension': 'K', 'height': 'L', 'azimuth': 'M', 'sector': 'N'}),
+	('OTHER', 'RADIO', 218, 18, {'model': 'I', 'dimension': 'K', 'height': 'L', 'sector': 'M'}),
+	('OTHER', 'FPFH', 238, 18, {'model': 'I', 'dimension': 'K', 'height': 'L', 'empty_port': 'M', 'sector': 'N'}),
+	('OTHER', 'MICROWAVE', 258, 9, {'model': 'I', 'dimension': 'K', 'height': 'L', 'azimuth': 'M', 'sector': 'N'}),
+)
+EQUIPMENT_FIELDS = ('model', 'dimension', 'height', 'azimuth', 'empty_port', 'sector')
+
+# Form field -> TowerEquipment column
+EQUIPMENT_COLUMNS = {
+	'model': 'model_name',
+	'dimension': 'dimension',
+	'height': 'height',
+	'azimuth': 'azimuth',
+	'empty_port': 'empty_port',
+	'sector': 'sector_or_leg',
+}
+
+# Electrical readings: rows 261-263, columns A, C, D, E, F
+ELECTRICAL_FIELDS = ('voltage', 'current_r', 'current_y', 'current_b', 'remarks')
+ELECTRICAL_FIRST_ROW = 261
+ELECTRICAL_MAX_ROWS = 3
+
+_BLOCK_START_ROWS = {(operator, equip_type): start_row for operator, equip_type, start_row, _max, _cols in EQUIPMENT_BLOCKS}
+
+
+def _text(value) -> str:
+	return "" if value is None else str(value)
+
+
+def parse_equipment_edit(data: dict):
+	"""
+	((operator, type, position_index), columns) for a tower_equipment autosave
+	body, or None if it does not name a known block and position.
+	"""
+	operator = data.get('operator')
+	equip_type = data.get('equipment_type')
+	if (operator, equip_type) not in _BLOCK_START_ROWS:
+		return None
+	equipment_data = data.get('equipment_data') or {}
+	if not isinstance(equipment_data, dict):
+		return None
+	# The client sends position_index in the row data; unique_id ends with it too
+	position = equipment_data.get('position_index') or str(data.get('unique_id') or '').rsplit('_', 1)[-1]
+	try:
+		position = int(position)
+	except (TypeError, ValueError):
+		return None
+	if position < 1:
+		return None
+	columns = {column: _text(equipment_data.get(field)) for field, column in EQUIPMENT_COLUMNS.items()}
+	return (operator, equip_type, position), columns
+
+
+def parse_electrical_edit(data: dict):
+	"""(row_number, columns) for an electrical_data autosave body, or None."""
+	try:
+		row_number = int(data.get('row'))
+	except (TypeError, ValueError):
+		return None
+	electrical_data = data.get('electrical_data') or {}
+	if not isinstance(electrical_data, dict):
+		return None
+	return row_number, {field: _text(electrical_data.get(field)) for field in ELECTRICAL_FIELDS}
+
+
+def _upsert_rows(model, checklist, key_fields, value_fields, edits, extra_fields):
+	"""
+	Apply [(key, columns)] edits in order with one SELECT and at most one
+	INSERT ... ON CONFLICT UPDATE. Returns whether each edit changed anything.
+	"""
+	if not edits:
+		return []
+	lookup = {
+		f"{field}__in": {key[index] for key, _columns in edits}
+		for index, field in enumerate(key_fields)
+	}
+	stored = {
+		tuple(row[field] for field in key_fields): {field: row[field] for field in value_fields}
+		for row in model.objects.filter(checklist=checklist, **lookup).values(*key_fields, *value_fields)
+	}
+	state = dict(stored)
+	changed = []
+	for key, columns in edits:
+		changed.append(state.get(key) != columns)
+		state[key] = columns
+
+	dirty = [key for key, columns in state.items() if stored.get(key) != columns]
+	if dirty:
+		model.objects.bulk_create(
+			[
+				model(checklist=checklist, **dict(zip(key_fields, key)), **extra_fields(key), **state[key])
+				for key in dirty
+			],
+			update_conflicts=True,
+			unique_fields=["checklist", *key_fields],
+			update_fields=list(value_fields),
+		)
+	return changed
+
+
+def upsert_tower_equipment(checklist, edits) -> list:
+	"""Edits are [((operator, type, position_index), columns)] from parse_equipment_edit."""
+	return _upsert_rows(
+		TowerEquipment,
+		checklist,
+		("operator_type", "equipment_type", "position_index"),
+		tuple(EQUIPMENT_COLUMNS.values()),
+		edits,
+		lambda key: {"row_number": _BLOCK_START_ROWS[key[:2]] + key[2] - 1},
+	)
+
+
+def upsert_electrical_data(checklist, edits) -> list:
+	"""Edits are [(row_number, columns)] from parse_electrical_edit."""
+	return _upsert_rows(
+		ElectricalData,
+		checklist,
+		("row_number",),
+		ELECTRICAL_FIELDS,
+		[((row_number,), columns) for row_number, columns in edits],
+		lambda key: {"position_index": key[0] - ELECTRICAL_FIRST_ROW + 1},
+	)
+
+
+def tower_equipment_rows(checklist) -> dict:
+	"""{(operator, type): [form fields + position_index, ...]} ordered by position."""
+	blocks = {}
+	rows = TowerEquipment.objects.filter(checklist=checklist).order_by(
+		"operator_type", "equipment_type", "position_index"
+	).values("operator_type", "equipment_type", "position_index", *EQUIPMENT_COLUMNS.values())
+	for row in rows:
+		item = {field: row[column] for field, column in EQUIPMENT_COLUMNS.items()}
+		item['position_index'] = row['position_index']
+		blocks.setdefault((row['operator_type'], row['equipment_type']), []).append(item)
+	return blocks
+
+
+def electrical_rows(checklist) -> dict:
+	"""{row_number: form fields} for the checklist's electrical readings."""
+	rows = ElectricalData.objects.filter(checklist=checklist).order_by("row_number").values("row_number", *ELECTRICAL_FIELDS)
+	return {row.pop('row_number'): row for row in rows}
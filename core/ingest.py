@@ -0,0 +1,288 @@
+"""
+Ingestion of uploaded checklist photos.
+
+Browsers send whatever they have: PNGs from canvas captures, 12 MP phone
+originals with GPS tags, sideways JPEGs that rely on an EXIF rotation flag.
+Before a photo is stored it is:
+- decoded once and turned upright from its EXIF orientation
+- shrunk so its long edge is at most PHOTO_MAX_EDGE pixels
+- re-encoded as PHOTO_FORMAT (JPEG or WEBP) at PHOTO_QUALITY, keeping only
+  the colour profile; EXIF (GPS, camera serials) and other metadata are dropped
+
+An upright RGB photo that is already in PHOTO_FORMAT and needs no shrinking
+keeps its compressed image data when re-encoding would not make it smaller:
+already-compressed photos only lose quality and grow on a second pass. Its
+metadata is still removed, losslessly, by dropping the EXIF, XMP and other
+application segments (JPEG) or chunks (WebP) around the image data; only the
+colour profile is kept.
+
+Pillow releases the GIL while decoding, resizing and encoding, so the photos
+of one upload are processed in parallel on a small per-process thread pool
+of PHOTO_INGEST_THREADS threads. Files Pillow cannot decode are rejected.
+
+Uploads are hashed as they stream in (the upload handlers below, listed in
+FILE_UPLOAD_HANDLERS) and results while they are encoded, so the
+content-addressed store (core.models.PhotoBlob) never reads a file back to
+name it.
+"""
+import hashlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+from PIL import Image as PilImage
+from PIL import ImageOps
+
+FORMAT_EXTENSIONS = {"JPEG": ".jpg", "WEBP": ".webp"}
+EXIF_ORIENTATION = 0x0112
+
+# JPEG application segments kept when metadata is stripped: JFIF, ICC profile, Adobe colour transform
+_JPEG_KEPT_SEGMENTS = {0xE0, 0xE2, 0xEE}
+_WEBP_METADATA_CHUNKS = {b"EXIF", b"XMP "}
+# VP8X header flags announcing EXIF and XMP chunks
+_WEBP_METADATA_FLAGS = 0x08 | 0x04
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class PhotoRejected(ValueError):
+	"""The upload is not an image that can be decoded."""
+
+
+class IngestedPhoto(NamedTuple):
+	content: bytes
+	sha256: str
+	extension: str
+	original_size: int
+	width: int
+	height: int
+
+	@property
+	def bytes_saved(self) -> int:
+		return max(0, self.original_size - len(self.content))
+
+
+def _max_edge() -> int:
+	return int(getattr(settings, "PHOTO_MAX_EDGE", 2560))
+
+
+def _format() -> str:
+	photo_format = str(getattr(settings, "PHOTO_FORMAT", "JPEG")).upper()
+	if photo_format not in FORMAT_EXTENSIONS:
+		raise ValueError(f"Unsupported PHOTO_FORMAT: {photo_format}")
+	return photo_format
+
+
+def _quality() -> int:
+	return int(getattr(settings, "PHOTO_QUALITY", 82))
+
+
+def _threads() -> int:
+	return max(1, int(getattr(settings, "PHOTO_INGEST_THREADS", 4)))
+
+
+def _executor() -> ThreadPoolExecutor:
+	global _pool
+	with _pool_lock:
+		if _pool is None:
+			_pool = ThreadPoolExecutor(max_workers=_threads(), thread_name_prefix="photo-ingest")
+		return _pool
+
+
+def _flatten(image):
+	"""RGB version of image, with any transparency composited onto white."""
+	if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+		image = image.convert("RGBA")
+		background = PilImage.new("RGB", image.size, (255, 255, 255))
+		background.paste(image, mask=image.getchannel("A"))
+		return background
+	if image.mode != "RGB":
+		return image.convert("RGB")
+	return image
+
+
+def ingest_photo(data: bytes) -> IngestedPhoto:
+	"""Normalise one uploaded photo; raises PhotoRejected if it cannot be decoded."""
+	max_edge = _max_edge()
+	photo_format = _format()
+	try:
+		with PilImage.open(io.BytesIO(data)) as image:
+			icc_profile = image.info.get("icc_profile")
+			# Whether the upload's image data could be kept, with nothing to convert, rotate, shrink or flatten
+			keepable = (
+				image.format == photo_format
+				and image.mode in ("RGB", "L")
+				and getattr(image, "n_frames", 1) == 1
+				and max(image.size) <= max_edge
+				and image.getexif().get(EXIF_ORIENTATION, 1) == 1
+			)
+			# JPEG can decode straight to 1/2, 1/4 or 1/8 scale when that is still big enough
+			image.draft("RGB", (max_edge, max_edge))
+			image = _flatten(ImageOps.exif_transpose(image))
+			image.thumbnail((max_edge, max_edge), PilImage.LANCZOS)
+			output = io.BytesIO()
+			options = {"quality": _quality()}
+			if icc_profile:
+				options["icc_profile"] = icc_profile
+			if photo_format == "JPEG":
+				options["optimize"] = True
+			else:
+				options["method"] = 4
+			image.save(output, format=photo_format, **options)
+	except (OSError, SyntaxError, ValueError, PilImage.DecompressionBombError) as exc:
+		raise PhotoRejected(str(exc) or exc.__class__.__name__) from exc
+	content = output.getvalue()
+	if keepable:
+		stripped = _strip_metadata(data, photo_format)
+		if stripped is not None and len(stripped) <= len(content):
+			content = stripped
+	return IngestedPhoto(
+		content=content,
+		sha256=hashlib.sha256(content).hexdigest(),
+		extension=FORMAT_EXTENSIONS[photo_format],
+		original_size=len(data),
+		width=image.width,
+		height=image.height,
+	)
+
+
+def _strip_jpeg_metadata(data: bytes) -> bytes:
+	"""data without its EXIF, XMP, comment and other application segments, or anything after the image."""
+	if data[:2] != b"\xff\xd8":
+		raise ValueError("Not a JPEG")
+	kept = [data[:2]]
+	position = 2
+	while position + 1 < len(data):
+		if data[position] != 0xFF:
+			raise ValueError("Expected a JPEG marker")
+		marker = data[position + 1]
+		if marker == 0xFF:
+			# Fill byte before a marker
+			position += 1
+			continue
+		if marker == 0xD9:
+			kept.append(b"\xff\xd9")
+			return b"".join(kept)
+		if 0xD0 <= marker <= 0xD7 or marker == 0x01:
+			kept.append(data[position:position + 2])
+			position += 2
+			continue
+		end = position + 2 + int.from_bytes(data[position + 2:position + 4], "big")
+		if end > len(data):
+			raise ValueError("Truncated JPEG segment")
+		segment = data[position:end]
+		if 0xE0 <= marker <= 0xEF or marker == 0xFE:
+			keep = marker in _JPEG_KEPT_SEGMENTS and (marker != 0xE2 or segment[4:16] == b"ICC_PROFILE\x00")
+		else:
+			keep = True
+		if keep:
+			kept.append(segment)
+		position = end
+		if marker == 0xDA:
+			# The entropy-coded scan runs to the first marker that is not a stuffed 0xFF00 or a restart
+			scan_end = position
+			while True:
+				scan_end = data.find(b"\xff", scan_end)
+				if scan_end < 0 or scan_end + 1 >= len(data):
+					raise ValueError("Truncated JPEG scan")
+				following = data[scan_end + 1]
+				if following != 0x00 and not 0xD0 <= following <= 0xD7:
+					break
+				scan_end += 2
+			kept.append(data[position:scan_end])
+			position = scan_end
+	raise ValueError("JPEG has no end of image marker")
+
+
+def _strip_webp_metadata(data: bytes) -> bytes:
+	"""data without its EXIF and XMP chunks."""
+	if data[:4] != b"RIFF" or data[8:12] != b"WEBP":
+		raise ValueError("Not a WebP")
+	chunks = []
+	position = 12
+	while position + 8 <= len(data):
+		fourcc = data[position:position + 4]
+		size = int.from_bytes(data[position + 4:position + 8], "little")
+		end = position + 8 + size + (size & 1)
+		if position + 8 + size > len(data):
+			raise ValueError("Truncated WebP chunk")
+		chunk = data[position:end]
+		if fourcc == b"VP8X":
+			chunk = chunk[:8] + bytes([chunk[8] & ~_WEBP_METADATA_FLAGS & 0xFF]) + chunk[9:]
+		if fourcc not in _WEBP_METADATA_CHUNKS:
+			chunks.append(chunk)
+		position = end
+	body = b"WEBP" + b"".join(chunks)
+	return b"RIFF" + len(body).to_bytes(4, "little") + body
+
+
+def _strip_metadata(data: bytes, photo_format: str):
+	"""
+	A JPEG or WebP file with its metadata removed and its image data and colour
+	profile untouched, or None if the file's structure could not be followed.
+	"""
+	strip = _strip_jpeg_metadata if photo_format == "JPEG" else _strip_webp_metadata
+	try:
+		return strip(data)
+	except (ValueError, IndexError):
+		return None
+
+
+class _HashingUploadHandler:
+	"""Sets `sha256` on each file this handler stores, hashed chunk by chunk as the request streams in."""
+
+	def new_file(self, *args, **kwargs):
+		# Before super(): the memory handler claims the file by raising StopFutureHandlers
+		self.digest = hashlib.sha256()
+		super().new_file(*args, **kwargs)
+
+	def receive_data_chunk(self, raw_data, start):
+		passed_on = super().receive_data_chunk(raw_data, start)
+		if passed_on is None:
+			self.digest.update(raw_data)
+		return passed_on
+
+	def file_complete(self, file_size):
+		upload = super().file_complete(file_size)
+		if upload is not None:
+			upload.sha256 = self.digest.hexdigest()
+		return upload
+
+
+class HashingMemoryFileUploadHandler(_HashingUploadHandler, MemoryFileUploadHandler):
+	pass
+
+
+class HashingTemporaryFileUploadHandler(_HashingUploadHandler, TemporaryFileUploadHandler):
+	pass
+
+
+def read_upload(upload) -> tuple:
+	"""(bytes, SHA-256 hex digest) of an uploaded file, hashing it while reading unless a handler already did."""
+	digest = None if getattr(upload, "sha256", None) else hashlib.sha256()
+	chunks = []
+	upload.seek(0)
+	for chunk in upload.chunks():
+		if digest is not None:
+			digest.update(chunk)
+		chunks.append(chunk)
+	return b"".join(chunks), upload.sha256 if digest is None else digest.hexdigest()
+
+
+def ingest_photos(payloads) -> list:
+	"""
+	ingest_photo() for every payload (see read_upload), in parallel on the shared pool.
+	Results are in payload order, with a PhotoRejected in place of each failure.
+	"""
+	futures = [_executor().submit(ingest_photo, payload) for payload in payloads]
+	results = []
+	for future in futures:
+		try:
+			results.append(future.result())
+		except PhotoRejected as exc:
+			results.append(exc)
+	return results
@@ -0,0 +1,197 @@
+"""
+Small database-backed job queue, run by `manage.py run_workers`.
+
+Jobs live in the Job table, so no broker is needed and the queue survives
+restarts. Enqueueing a (kind, target_id) pair that already has a QUEUED job
+returns that job instead of adding another one. Workbook rebuilds are queued
+on submit, review and status changes only; edits just mark the Excel copy
+stale. DONE jobs are deleted JOB_RETENTION seconds after they finish.
+"""
+import multiprocessing
+import signal
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from .models import Checklist, Job
+
+REGENERATE_CHECKLIST = "regenerate_checklist"
+
+
+def _max_attempts() -> int:
+	return int(getattr(settings, "JOB_MAX_ATTEMPTS", 3))
+
+
+def _retry_delay() -> float:
+	return float(getattr(settings, "JOB_RETRY_DELAY", 10))
+
+
+def _retention() -> float:
+	return float(getattr(settings, "JOB_RETENTION", 7 * 24 * 60 * 60))
+
+
+def _regenerate_checklist(checklist_id: int):
+	from .views import _ensure_excel_copy
+
+	try:
+		checklist = Checklist.objects.select_related("project").get(pk=checklist_id)
+	except Checklist.DoesNotExist:
+		# Deleted while the job was waiting, nothing to build
+		return
+	_ensure_excel_copy(checklist)
+
+
+JOB_HANDLERS = {
+	REGENERATE_CHECKLIST: _regenerate_checklist,
+}
+
+
+def enqueue(kind: str, target_id: int, run_after=None) -> Job:
+	"""Queue a job, or return the one already waiting for the same target."""
+	if kind not in JOB_HANDLERS:
+		raise ValueError(f"Unknown job kind: {kind}")
+	try:
+		with transaction.atomic():
+			return Job.objects.create(
+				kind=kind,
+				target_id=target_id,
+				max_attempts=_max_attempts(),
+				run_after=run_after or timezone.now(),
+			)
+	except IntegrityError:
+		existing = Job.objects.filter(kind=kind, target_id=target_id, status=Job.Status.QUEUED).first()
+		if existing is not None:
+			return existing
+		# The waiting job was claimed between our insert and this lookup
+		return enqueue(kind, target_id, run_after)
+
+
+def enqueue_checklist_rebuild(checklist: Checklist) -> Job:
+	return enqueue(REGENERATE_CHECKLIST, checklist.pk)
+
+
+def claim_next_job():
+	"""
+	Atomically move the oldest due job to RUNNING and return it.
+	Targets that already have a RUNNING job are skipped so two workers never
+	build the same checklist at once.
+	"""
+	running = Job.objects.filter(
+		kind=OuterRef("kind"),
+		target_id=OuterRef("target_id"),
+		status=Job.Status.RUNNING,
+	)
+	candidates = (
+		Job.objects.filter(status=Job.Status.QUEUED, run_after__lte=timezone.now())
+		.exclude(Exists(running))
+		.order_by("run_after", "id")
+		.values_list("id", flat=True)[:10]
+	)
+	for job_id in candidates:
+		claimed = Job.objects.filter(pk=job_id, status=Job.Status.QUEUED).update(
+			status=Job.Status.RUNNING,
+			started_at=timezone.now(),
+			attempts=F("attempts") + 1,
+		)
+		if claimed:
+			return Job.objects.get(pk=job_id)
+	return None
+
+
+def _record_failure(job: Job, error: str):
+	job.last_error = error
+	job.finished_at = timezone.now()
+	if job.attempts < job.max_attempts:
+		delay = _retry_delay() * (2 ** (job.attempts - 1))
+		job.status = Job.Status.QUEUED
+		job.run_after = timezone.now() + timedelta(seconds=delay)
+		try:
+			with transaction.atomic():
+				job.save(update_fields=["status", "run_after", "last_error", "duration_ms", "finished_at"])
+			return
+		except IntegrityError:
+			# A newer job for the same target is already waiting and will do the work
+			job.last_error = f"{error}\nCoalesced into the queued job for the same target."
+	job.status = Job.Status.FAILED
+	job.save(update_fields=["status", "last_error", "duration_ms", "finished_at"])
+
+
+def execute_job(job_id: int) -> Job:
+	"""Run a claimed job and record its outcome and duration."""
+	job = Job.objects.get(pk=job_id)
+	handler = JOB_HANDLERS.get(job.kind)
+	started = time.perf_counter()
+	try:
+		if handler is None:
+			raise ValueError(f"Unknown job kind: {job.kind}")
+		handler(job.target_id)
+	except Exception:
+		job.duration_ms = int((time.perf_counter() - started) * 1000)
+		_record_failure(job, traceback.format_exc())
+		return job
+
+	job.duration_ms = int((time.perf_counter() - started) * 1000)
+	job.status = Job.Status.DONE
+	job.finished_at = timezone.now()
+	job.last_error = ""
+	job.save(update_fields=["status", "duration_ms", "finished_at", "last_error"])
+	return job
+
+
+def purge_finished_jobs() -> int:
+	"""Delete DONE jobs older than JOB_RETENTION; FAILED ones are kept for inspection."""
+	cutoff = timezone.now() - timedelta(seconds=_retention())
+	deleted, _ = Job.objects.filter(status=Job.Status.DONE, finished_at__lt=cutoff).delete()
+	return deleted
+
+
+def requeue_stale_jobs() -> int:
+	"""
+	Put RUNNING jobs back in the queue. Called when the workers start, so jobs
+	interrupted by a crash or restart are picked up again.
+	"""
+	requeued = 0
+	for job in Job.objects.filter(status=Job.Status.RUNNING):
+		job.status = Job.Status.QUEUED
+		job.run_after = timezone.now()
+		try:
+			with transaction.atomic():
+				job.save(update_fields=["status", "run_after"])
+			requeued += 1
+		except IntegrityError:
+			job.status = Job.Status.FAILED
+			job.last_error = "Interrupted; coalesced into the queued job for the same target."
+			job.finished_at = timezone.now()
+			job.save(update_fields=["status", "last_error", "finished_at"])
+	return requeued
+
+
+def _init_worker_process():
+	import django
+	from django.db import connections
+
+	django.setup()
+	# Never share the parent's SQLite handle with a forked child
+	connections.close_all()
+	# The parent handles Ctrl-C / SIGTERM and shuts the pool down cleanly
+	signal.signal(signal.SIGINT, signal.SIG_IGN)
+	signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+
+def worker_pool(processes: int) -> ProcessPoolExecutor:
+	"""
+	Process pool for running builds outside the web workers.
+	Forks explicitly (newer Pythons default to forkserver) so children share
+	the template prototypes the parent preloaded.
+	"""
+	return ProcessPoolExecutor(
+		max_workers=processes,
+		mp_context=multiprocessing.get_context("fork"),
+		initializer=_init_worker_process,
+	)
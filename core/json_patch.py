@@ -0,0 +1,108 @@
+"""
+Key-level updates of JSONField columns.
+
+Autosave changes one key of answer_data or remark_data at a time. Instead of
+reading the whole blob, changing it in Python and writing every column back,
+these helpers patch the one key inside the database:
+
+- SQLite: a single UPDATE with json_set()/json_remove(), so two tabs editing
+  different keys can never overwrite each other, and a WHERE clause that
+  makes the statement a no-op when the stored value is already equal
+- other backends: a row lock (select_for_update) and an update of just that
+  column
+
+Both return True only if the row actually changed.
+"""
+import json
+import re
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+# Keys are row numbers and names like "zip_upload"; other keys take
+# the row-lock path rather than risk JSON path escaping
+_PATH_SAFE_KEY_RE = re.compile(r"^[\w\-]+$")
+
+REMOVE = object()
+
+
+def _extra_assignments(model, increment):
+	"""(sql, params) assignments for counters to bump and auto_now fields to touch."""
+	assignments = []
+	quote = connection.ops.quote_name
+	for field_name in increment:
+		column = quote(model._meta.get_field(field_name).column)
+		assignments.append((f"{column} = {column} + 1", []))
+	for field in model._meta.concrete_fields:
+		if getattr(field, "auto_now", False):
+			value = field.get_db_prep_value(timezone.now(), connection)
+			assignments.append((f"{quote(field.column)} = %s", [value]))
+	return assignments
+
+
+def _patch_sqlite(model, pk, field_name: str, key: str, value, increment) -> bool:
+	quote = connection.ops.quote_name
+	table = quote(model._meta.db_table)
+	column = quote(model._meta.get_field(field_name).column)
+	pk_column = quote(model._meta.pk.column)
+	path = f'$."{key}"'
+
+	if value is REMOVE:
+		set_sql = f"{column} = json_remove({column}, %s)"
+		set_params = [path]
+		where_sql = f"json_type({column}, %s) IS NOT NULL"
+		where_params = [path]
+	else:
+		encoded = json.dumps(value)
+		set_sql = f"{column} = json_set(COALESCE({column}, '{{}}'), %s, json(%s))"
+		set_params = [path, encoded]
+		# Unchanged when both the JSON type and the extracted value match
+		where_sql = (
+			f"(json_type({column}, %s) IS NOT json_type(json(%s))"
+			f" OR json_extract({column}, %s) IS NOT json_extract(json(%s), '$'))"
+		)
+		where_params = [path, encoded, path, encoded]
+
+	assignments = [(set_sql, set_params)] + _extra_assignments(model, increment)
+	sql = (
+		f"UPDATE {table} SET {', '.join(sql for sql, _params in assignments)}"
+		f" WHERE {pk_column} = %s AND {where_sql}"
+	)
+	params = [param for _sql, params in assignments for param in params] + [pk] + where_params
+	with connection.cursor() as cursor:
+		cursor.execute(sql, params)
+		return cursor.rowcount > 0
+
+
+def _patch_locked(model, pk, field_name: str, key: str, value, increment) -> bool:
+	with transaction.atomic():
+		data = model.objects.select_for_update().filter(pk=pk).values_list(field_name, flat=True).first()
+		data = dict(data or {})
+		if value is REMOVE:
+			if key not in data:
+				return False
+			del data[key]
+		else:
+			if key in data and data[key] == value:
+				return False
+			data[key] = value
+		updates = {field_name: data}
+		for counter in increment:
+			updates[counter] = F(counter) + 1
+		for field in model._meta.concrete_fields:
+			if getattr(field, "auto_now", False):
+				updates[field.name] = timezone.now()
+		return model.objects.filter(pk=pk).update(**updates) > 0
+
+
+def patch_json_key(model, pk, field_name: str, key: str, value=REMOVE, increment=()) -> bool:
+	"""
+	Set (or with value=REMOVE, delete) one top-level key of a JSONField.
+	Counters named in `increment` are bumped in the same statement when the
+	row changes. Returns whether it changed.
+	"""
+	key = str(key)
+	if connection.vendor == "sqlite" and _PATH_SAFE_KEY_RE.match(key):
+		return _patch_sqlite(model, pk, field_name, key, value, increment)
+	return _patch_locked(model, pk, field_name, key, value, increment)
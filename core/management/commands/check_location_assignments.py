@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import GeoLocation, WorkAssignment
+
+
+class Command(BaseCommand):
+	help = (
+		"Check GeoLocation.is_assigned against the work assignments and report "
+		"locations where they disagree, e.g. after work was deleted with its "
+		"project or engineer. Use --fix to correct them."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--fix", action="store_true", help="Correct the flags instead of only reporting them.")
+
+	def handle(self, *args, **options):
+		site_ids = WorkAssignment.objects.values("site_id")
+		stale = GeoLocation.objects.filter(is_assigned=True).exclude(name__in=site_ids)
+		missing = GeoLocation.objects.filter(is_assigned=False, name__in=site_ids)
+		mismatched = 0
+		for label, locations in (("flagged assigned but has no work", stale), ("has work but flagged open", missing)):
+			for location_id, name in locations.order_by("id").values_list("id", "name"):
+				self.stdout.write(f"Location {location_id} {name}: {label}")
+				mismatched += 1
+
+		if not mismatched:
+			self.stdout.write(self.style.SUCCESS("All location assignment flags are consistent"))
+			return
+		if not options["fix"]:
+			raise CommandError(f"{mismatched} location(s) inconsistent; run with --fix to correct them")
+		fixed = stale.update(is_assigned=False) + missing.update(is_assigned=True)
+		self.stdout.write(self.style.SUCCESS(f"Fixed {fixed} location(s)"))
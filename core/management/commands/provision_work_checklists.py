@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from core.models import WorkAssignment
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+	help = (
+		"Create the draft checklist of every work assignment that has none, "
+		"e.g. work assigned before checklists were provisioned at assignment "
+		"time. Runs in batches of one transaction each."
+	)
+
+	def handle(self, *args, **options):
+		created = 0
+		while True:
+			works = list(WorkAssignment.objects.filter(checklist__isnull=True).order_by("id")[:BATCH_SIZE])
+			if not works:
+				break
+			created += WorkAssignment.provision_checklists(works)
+			self.stdout.write(f"Provisioned {created} checklist(s)")
+		self.stdout.write(self.style.SUCCESS(f"Done, {created} checklist(s) created"))
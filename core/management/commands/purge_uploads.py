@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import UploadSession
+
+
+class Command(BaseCommand):
+	help = (
+		"Delete resumable uploads that received no chunk for "
+		"UPLOAD_SESSION_MAX_AGE seconds, with their partial files. Run it "
+		"from cron, e.g. hourly."
+	)
+
+	def handle(self, *args, **options):
+		max_age = int(getattr(settings, "UPLOAD_SESSION_MAX_AGE", 2 * 24 * 60 * 60))
+		stale = UploadSession.objects.filter(updated_at__lt=timezone.now() - timedelta(seconds=max_age))
+		purged = 0
+		for session in stale.iterator():
+			session.discard()
+			purged += 1
+		self.stdout.write(self.style.SUCCESS(f"Purged {purged} abandoned upload(s)"))
@@ -0,0 +1,125 @@
+import os
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.jobs import worker_pool
+from core.models import Checklist, Project
+from core.template_cache import preload_template_prototypes
+
+
+def _rebuild_one(checklist_id: int, force: bool):
+	"""Build one checklist's workbook in a pool process; returns (id, site_id, outcome, ms, error)."""
+	from django.db import connections
+
+	from core.views import _create_or_update_excel_copy, _excel_copy_is_current
+
+	started = time.perf_counter()
+	try:
+		checklist = Checklist.objects.select_related("project").get(pk=checklist_id)
+		if not force and _excel_copy_is_current(checklist):
+			return checklist_id, checklist.site_id, "skipped", 0, ""
+		outcome = "built" if _create_or_update_excel_copy(checklist, force=force) else "unchanged"
+		return checklist_id, checklist.site_id, outcome, int((time.perf_counter() - started) * 1000), ""
+	except Checklist.DoesNotExist:
+		return checklist_id, "", "skipped", 0, ""
+	except Exception as exc:
+		return checklist_id, "", "failed", int((time.perf_counter() - started) * 1000), repr(exc)
+	finally:
+		connections.close_all()
+
+
+class Command(BaseCommand):
+	help = (
+		"Rebuild checklist workbooks in parallel, e.g. after a template change. "
+		"Checklists whose workbook is already current are skipped, so an "
+		"interrupted run resumes where it stopped when started again."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--project", help="Project name or id (default: all projects).")
+		parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+		parser.add_argument("--force", action="store_true", help="Rebuild even if the workbook is current or its inputs are unchanged.")
+
+	def handle(self, *args, **options):
+		checklists = Checklist.objects.exclude(project__template_file="").exclude(project__isnull=True)
+		if options["project"]:
+			project = self._get_project(options["project"])
+			checklists = checklists.filter(project=project)
+		checklist_ids = list(checklists.order_by("id").values_list("id", flat=True))
+		total = len(checklist_ids)
+		if not total:
+			self.stdout.write("No checklists to rebuild.")
+			return
+
+		jobs = max(1, options["jobs"])
+		force = options["force"]
+		self._stopping = False
+		previous_handler = signal.signal(signal.SIGINT, self._stop)
+
+		preload_template_prototypes()
+		self.stdout.write(f"Rebuilding {total} checklist(s) with {jobs} process(es)")
+
+		counts = {"built": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+		done_count = 0
+		started = time.perf_counter()
+		pending = iter(checklist_ids)
+		running = set()
+		try:
+			with worker_pool(jobs) as pool:
+				while True:
+					# Keep a few builds queued per process without submitting everything up front
+					while not self._stopping and len(running) < jobs * 2:
+						checklist_id = next(pending, None)
+						if checklist_id is None:
+							break
+						running.add(pool.submit(_rebuild_one, checklist_id, force))
+					if not running:
+						break
+					finished, running = wait(running, return_when=FIRST_COMPLETED)
+					for future in finished:
+						checklist_id, site_id, outcome, duration_ms, error = future.result()
+						counts[outcome] += 1
+						done_count += 1
+						line = f"[{done_count}/{total}] checklist {checklist_id} {site_id} {outcome}"
+						if outcome == "built":
+							self.stdout.write(f"{line} in {duration_ms} ms")
+						elif outcome == "failed":
+							self.stderr.write(f"{line}: {error}")
+						elif options["verbosity"] > 1:
+							self.stdout.write(line)
+		finally:
+			signal.signal(signal.SIGINT, previous_handler)
+
+		elapsed = time.perf_counter() - started
+		rate = done_count / elapsed if elapsed else 0
+		self.stdout.write(
+			f"\n{counts['built']} built, {counts['unchanged']} unchanged, {counts['skipped']} already current, "
+			f"{counts['failed']} failed in {elapsed:.1f} s ({rate:.1f} checklists/s)"
+		)
+		if self._stopping:
+			self.stdout.write(self.style.WARNING(
+				f"Interrupted after {done_count} of {total}; run the command again to resume."
+			))
+		elif counts["failed"]:
+			raise CommandError(f"{counts['failed']} checklist(s) failed to rebuild")
+		else:
+			self.stdout.write(self.style.SUCCESS("Done"))
+
+	def _get_project(self, value: str) -> Project:
+		if value.isdigit():
+			project = Project.objects.filter(pk=int(value)).first()
+		else:
+			project = Project.objects.filter(name__iexact=value).first()
+		if project is None:
+			raise CommandError(f"Project not found: {value}")
+		return project
+
+	def _stop(self, signum, frame):
+		if not self._stopping:
+			self.stdout.write("Stopping after the running builds finish (Ctrl-C again to abort)...")
+			self._stopping = True
+		else:
+			raise KeyboardInterrupt
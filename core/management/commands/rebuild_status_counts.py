@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.models import StatusCount
+
+
+class Command(BaseCommand):
+	help = (
+		"Recount the per-project, per-engineer checklist and work assignment "
+		"status counts the dashboards read. Run after bulk edits that bypass "
+		"model signals (queryset.update(), raw SQL, restored backups)."
+	)
+
+	def handle(self, *args, **options):
+		rows = StatusCount.rebuild()
+		self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} status count row(s)"))
@@ -0,0 +1,100 @@
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
+
+from core.jobs import claim_next_job, execute_job, purge_finished_jobs, requeue_stale_jobs, worker_pool
+from core.models import Job
+from core.template_cache import preload_template_prototypes
+
+
+def _run_job(job_id: int):
+	from django.db import connections
+
+	try:
+		job = execute_job(job_id)
+		return job.pk, job.kind, job.target_id, job.status, job.duration_ms, job.last_error
+	finally:
+		connections.close_all()
+
+
+class Command(BaseCommand):
+	help = "Run queued background jobs (workbook rebuilds) in a local process pool."
+
+	def add_arguments(self, parser):
+		parser.add_argument("--processes", type=int, default=getattr(settings, "JOB_WORKER_PROCESSES", 2))
+		parser.add_argument("--poll-interval", type=float, default=getattr(settings, "JOB_POLL_INTERVAL", 1.0))
+		parser.add_argument("--once", action="store_true", help="Exit once the queue is empty.")
+
+	def handle(self, *args, **options):
+		processes = max(1, options["processes"])
+		poll_interval = options["poll_interval"]
+		self._stopping = False
+		signal.signal(signal.SIGTERM, self._stop)
+		signal.signal(signal.SIGINT, self._stop)
+
+		requeued = requeue_stale_jobs()
+		if requeued:
+			self.stdout.write(f"Requeued {requeued} interrupted job(s)")
+		# Parsed before the pool forks, so every worker process shares them
+		loaded = preload_template_prototypes()
+		self.stdout.write(f"Workers started ({processes} processes, {loaded} template(s) preloaded)")
+
+		running = {}
+		purge_interval = getattr(settings, "JOB_PURGE_INTERVAL", 3600)
+		next_purge = time.monotonic()
+		with worker_pool(processes) as pool:
+			while not self._stopping or running:
+				if time.monotonic() >= next_purge:
+					purged = purge_finished_jobs()
+					if purged:
+						self.stdout.write(f"Deleted {purged} finished job(s)")
+					next_purge = time.monotonic() + purge_interval
+
+				while not self._stopping and len(running) < processes:
+					job = claim_next_job()
+					if job is None:
+						break
+					running[pool.submit(_run_job, job.pk)] = job.pk
+
+				if not running:
+					if options["once"]:
+						break
+					time.sleep(poll_interval)
+					continue
+
+				done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+				for future in done:
+					job_id = running.pop(future)
+					self._report(job_id, future)
+
+		self.stdout.write("Workers stopped")
+
+	def _stop(self, signum, frame):
+		if not self._stopping:
+			self.stdout.write("Stopping after running jobs finish...")
+		self._stopping = True
+
+	def _report(self, job_id, future):
+		try:
+			pk, kind, target_id, status, duration_ms, last_error = future.result()
+		except Exception as exc:
+			# The worker process died; put the job back so it is not stuck in RUNNING
+			try:
+				with transaction.atomic():
+					Job.objects.filter(pk=job_id, status=Job.Status.RUNNING).update(
+						status=Job.Status.QUEUED, last_error=repr(exc)
+					)
+			except IntegrityError:
+				Job.objects.filter(pk=job_id).update(status=Job.Status.FAILED, last_error=repr(exc))
+			self.stderr.write(f"job {job_id} crashed: {exc!r}")
+			return
+		line = f"job {pk} {kind}({target_id}) {status} in {duration_ms} ms"
+		if status == Job.Status.DONE:
+			self.stdout.write(self.style.SUCCESS(line))
+		else:
+			error = last_error.strip().splitlines()[-1] if last_error else ""
+			self.stderr.write(f"{line}: {error}")
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_alter_workassignment_site_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checklist',
+            name='content_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='checklist',
+            name='excel_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checklist',
+            name='excel_fingerprint',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
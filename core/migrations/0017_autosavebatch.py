@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_checklist_excel_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutosaveBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64)),
+                ('results', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('checklist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='autosave_batches', to='core.checklist')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('checklist', 'key'), name='core_autosavebatch_unique_key')],
+            },
+        ),
+    ]
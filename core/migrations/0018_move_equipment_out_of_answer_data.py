@@ -0,0 +1,167 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:40
+
+from django.db import migrations, models
+
+# Layout as of this migration (core.equipment may change later)
+EQUIPMENT_START_ROWS = {
+    ("STC", "ANTENNA"): 198,
+    ("STC", "RADIO"): 215,
+    ("STC", "FPFH"): 232,
+    ("STC", "MICROWAVE"): 249,
+    ("OTHER", "ANTENNA"): 198,
+    ("OTHER", "RADIO"): 218,
+    ("OTHER", "FPFH"): 238,
+    ("OTHER", "MICROWAVE"): 258,
+}
+EQUIPMENT_COLUMNS = {
+    "model": "model_name",
+    "dimension": "dimension",
+    "height": "height",
+    "azimuth": "azimuth",
+    "empty_port": "empty_port",
+    "sector": "sector_or_leg",
+}
+ELECTRICAL_FIELDS = ("voltage", "current_r", "current_y", "current_b", "remarks")
+ELECTRICAL_FIRST_ROW = 261
+CHUNK_SIZE = 200
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def _checklist_chunks(Checklist):
+    ids = list(Checklist.objects.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield Checklist.objects.filter(pk__in=ids[start:start + CHUNK_SIZE]).values_list("pk", "answer_data")
+
+
+def remove_duplicate_rows(apps, schema_editor):
+    """Keep the newest row per slot so the unique constraints can be added."""
+    for model_name, key_fields in (
+        ("TowerEquipment", ("checklist_id", "operator_type", "equipment_type", "position_index")),
+        ("ElectricalData", ("checklist_id", "row_number")),
+    ):
+        model = apps.get_model("core", model_name)
+        seen = set()
+        duplicates = []
+        for row in model.objects.order_by("-id").values("id", *key_fields).iterator():
+            key = tuple(row[field] for field in key_fields)
+            if key in seen:
+                duplicates.append(row["id"])
+            seen.add(key)
+        if duplicates:
+            model.objects.filter(pk__in=duplicates).delete()
+
+
+def move_answer_data_to_rows(apps, schema_editor):
+    Checklist = apps.get_model("core", "Checklist")
+    TowerEquipment = apps.get_model("core", "TowerEquipment")
+    ElectricalData = apps.get_model("core", "ElectricalData")
+
+    for chunk in _checklist_chunks(Checklist):
+        for checklist_id, answers in chunk:
+            answers = dict(answers or {})
+            equipment = {}
+            electrical = {}
+            moved = []
+            for key, value in answers.items():
+                if not isinstance(value, dict):
+                    continue
+                if key.startswith("equipment_"):
+                    operator, equip_type = value.get("operator"), value.get("type")
+                    data = value.get("data") or {}
+                    start_row = EQUIPMENT_START_ROWS.get((operator, equip_type))
+                    try:
+                        position = int(data.get("position_index") or key.rsplit("_", 1)[-1])
+                    except (TypeError, ValueError):
+                        continue
+                    if start_row is None or position < 1:
+                        continue
+                    equipment[(operator, equip_type, position)] = TowerEquipment(
+                        checklist_id=checklist_id,
+                        operator_type=operator,
+                        equipment_type=equip_type,
+                        position_index=position,
+                        row_number=start_row + position - 1,
+                        **{column: _text(data.get(field)) for field, column in EQUIPMENT_COLUMNS.items()},
+                    )
+                    moved.append(key)
+                elif key.startswith("electrical_"):
+                    try:
+                        row_number = int(key[len("electrical_"):])
+                    except ValueError:
+                        continue
+                    electrical[row_number] = ElectricalData(
+                        checklist_id=checklist_id,
+                        row_number=row_number,
+                        position_index=row_number - ELECTRICAL_FIRST_ROW + 1,
+                        **{field: _text(value.get(field)) for field in ELECTRICAL_FIELDS},
+                    )
+                    moved.append(key)
+            if not moved:
+                continue
+
+            # Rows that already exist were written through the models and are newer
+            for key in TowerEquipment.objects.filter(checklist_id=checklist_id).values_list(
+                "operator_type", "equipment_type", "position_index"
+            ):
+                equipment.pop(key, None)
+            for row_number in ElectricalData.objects.filter(checklist_id=checklist_id).values_list("row_number", flat=True):
+                electrical.pop(row_number, None)
+            TowerEquipment.objects.bulk_create(equipment.values())
+            ElectricalData.objects.bulk_create(electrical.values())
+
+            for key in moved:
+                del answers[key]
+            Checklist.objects.filter(pk=checklist_id).update(answer_data=answers)
+
+
+def move_rows_to_answer_data(apps, schema_editor):
+    Checklist = apps.get_model("core", "Checklist")
+    TowerEquipment = apps.get_model("core", "TowerEquipment")
+    ElectricalData = apps.get_model("core", "ElectricalData")
+
+    for chunk in _checklist_chunks(Checklist):
+        for checklist_id, answers in chunk:
+            answers = dict(answers or {})
+            equipment = TowerEquipment.objects.filter(checklist_id=checklist_id)
+            electrical = ElectricalData.objects.filter(checklist_id=checklist_id)
+            if not equipment.exists() and not electrical.exists():
+                continue
+            for row in equipment:
+                unique_id = f"{row.operator_type}_{row.equipment_type}_{row.position_index}"
+                data = {field: getattr(row, column) for field, column in EQUIPMENT_COLUMNS.items()}
+                data["position_index"] = str(row.position_index)
+                answers[f"equipment_{unique_id}"] = {
+                    "operator": row.operator_type,
+                    "type": row.equipment_type,
+                    "data": data,
+                }
+            for row in electrical:
+                data = {field: getattr(row, field) for field in ELECTRICAL_FIELDS}
+                data["row"] = str(row.row_number)
+                answers[f"electrical_{row.row_number}"] = data
+            Checklist.objects.filter(pk=checklist_id).update(answer_data=answers)
+            equipment.delete()
+            electrical.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_autosavebatch'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='towerequipment',
+            constraint=models.UniqueConstraint(fields=('checklist', 'operator_type', 'equipment_type', 'position_index'), name='core_towerequipment_unique_position'),
+        ),
+        migrations.AddConstraint(
+            model_name='electricaldata',
+            constraint=models.UniqueConstraint(fields=('checklist', 'row_number'), name='core_electricaldata_unique_row'),
+        ),
+        migrations.RunPython(move_answer_data_to_rows, move_rows_to_answer_data),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 6.0.1 on 2026-10-17 13:15
+
+import core.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+CHUNK_SIZE = 200
+
+
+def copy_image_data_to_ledger(apps, schema_editor):
+    Checklist = apps.get_model("core", "Checklist")
+    ChecklistImage = apps.get_model("core", "ChecklistImage")
+
+    # Rows attached to a section take that section's row
+    for image in ChecklistImage.objects.filter(section__isnull=False).select_related("section"):
+        image.row_number = image.section.row_number
+        image.save(update_fields=["row_number"])
+
+    ids = list(Checklist.objects.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(ids), CHUNK_SIZE):
+        ledger = []
+        for checklist_id, image_data in Checklist.objects.filter(pk__in=ids[start:start + CHUNK_SIZE]).values_list("pk", "image_data"):
+            rows = []
+            for row, image_names in (image_data or {}).items():
+                try:
+                    rows.append((int(row), image_names or []))
+                except (TypeError, ValueError):
+                    continue
+            for row, image_names in sorted(rows, key=lambda item: item[0]):
+                for image_name in image_names:
+                    ledger.append(ChecklistImage(checklist_id=checklist_id, row_number=row, image=image_name))
+        ChecklistImage.objects.bulk_create(ledger)
+
+
+def copy_ledger_to_image_data(apps, schema_editor):
+    Checklist = apps.get_model("core", "Checklist")
+    ChecklistImage = apps.get_model("core", "ChecklistImage")
+
+    image_data = {}
+    ledger = ChecklistImage.objects.filter(section__isnull=True, row_number__gt=0).order_by("checklist_id", "row_number", "id")
+    for checklist_id, row, image_name in ledger.values_list("checklist_id", "row_number", "image"):
+        image_data.setdefault(checklist_id, {}).setdefault(str(row), []).append(image_name)
+    for checklist_id, rows in image_data.items():
+        Checklist.objects.filter(pk=checklist_id).update(image_data=rows)
+    ledger.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_move_equipment_out_of_answer_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checklistimage',
+            name='row_number',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='checklistimage',
+            name='image',
+            field=models.ImageField(max_length=500, upload_to=core.models.checklist_image_upload_path),
+        ),
+        migrations.AlterField(
+            model_name='checklistimage',
+            name='section',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='images', to='core.checklistsection'),
+        ),
+        migrations.AddIndex(
+            model_name='checklistimage',
+            index=models.Index(fields=['checklist', 'row_number'], name='core_checklistimage_row'),
+        ),
+        migrations.RunPython(copy_image_data_to_ledger, copy_ledger_to_image_data),
+        migrations.RemoveField(
+            model_name='checklist',
+            name='image_data',
+        ),
+    ]
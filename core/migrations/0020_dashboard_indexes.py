@@ -0,0 +1,55 @@
+# Generated by Django 6.0.1 on 2026-10-17 13:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_checklistimage_ledger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='checklist',
+            index=models.Index(fields=['project', 'status', '-updated_at'], name='core_checklist_proj_stat_upd'),
+        ),
+        migrations.AddIndex(
+            model_name='checklist',
+            index=models.Index(fields=['project', '-updated_at'], name='core_checklist_proj_upd'),
+        ),
+        migrations.AddIndex(
+            model_name='checklist',
+            index=models.Index(fields=['user', 'project', '-updated_at'], name='core_checklist_user_proj_upd'),
+        ),
+        migrations.AddIndex(
+            model_name='checklist',
+            index=models.Index(fields=['status', '-updated_at'], name='core_checklist_status_upd'),
+        ),
+        migrations.AddIndex(
+            model_name='checklist',
+            index=models.Index(fields=['-updated_at'], name='core_checklist_updated'),
+        ),
+        migrations.AddIndex(
+            model_name='geolocation',
+            index=models.Index(fields=['project', '-created_at'], name='core_geo_project_created'),
+        ),
+        migrations.AddIndex(
+            model_name='geolocation',
+            index=models.Index(fields=['-created_at'], name='core_geo_created'),
+        ),
+        migrations.AddIndex(
+            model_name='workassignment',
+            index=models.Index(fields=['project', '-created_at'], name='core_work_project_created'),
+        ),
+        migrations.AddIndex(
+            model_name='workassignment',
+            index=models.Index(fields=['assigned_to', '-created_at'], name='core_work_assignee_created'),
+        ),
+        migrations.AddIndex(
+            model_name='workassignment',
+            index=models.Index(fields=['-created_at'], name='core_work_created'),
+        ),
+    ]
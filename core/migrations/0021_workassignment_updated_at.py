@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-17 14:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_created_at(apps, schema_editor):
+    WorkAssignment = apps.get_model("core", "WorkAssignment")
+    WorkAssignment.objects.update(updated_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_dashboard_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workassignment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 6.0.1 on 2026-10-17 15:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def count_statuses(apps, schema_editor):
+    StatusCount = apps.get_model("core", "StatusCount")
+    rows = []
+    for kind, model_name, user_field in (
+        ("CHECKLIST", "Checklist", "user_id"),
+        ("WORK", "WorkAssignment", "assigned_to_id"),
+    ):
+        model = apps.get_model("core", model_name)
+        for row in model.objects.values("project_id", user_field, "status").annotate(total=models.Count("id")).order_by():
+            rows.append(StatusCount(
+                kind=kind, project_id=row["project_id"], user_id=row[user_field],
+                status=row["status"], count=row["total"],
+            ))
+    StatusCount.objects.bulk_create(rows)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_workassignment_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('CHECKLIST', 'Checklist'), ('WORK', 'Work assignment')], max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_counts', to='core.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'project', 'user', 'status'), name='core_statuscount_unique_key')],
+            },
+        ),
+        migrations.RunPython(count_statuses, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.1 on 2026-10-17 15:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def flag_assigned_locations(apps, schema_editor):
+    GeoLocation = apps.get_model("core", "GeoLocation")
+    WorkAssignment = apps.get_model("core", "WorkAssignment")
+    GeoLocation.objects.filter(name__in=WorkAssignment.objects.values("site_id")).update(is_assigned=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_statuscount'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='geolocation',
+            name='core_geo_project_created',
+        ),
+        migrations.RemoveIndex(
+            model_name='geolocation',
+            name='core_geo_created',
+        ),
+        migrations.AddField(
+            model_name='geolocation',
+            name='is_assigned',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(flag_assigned_locations, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='geolocation',
+            name='name',
+            field=models.CharField(db_index=True, help_text='Location name or description', max_length=200),
+        ),
+        migrations.AddIndex(
+            model_name='geolocation',
+            index=models.Index(condition=models.Q(('is_assigned', False)), fields=['project', '-created_at'], name='core_geo_open_project_created'),
+        ),
+        migrations.AddIndex(
+            model_name='geolocation',
+            index=models.Index(condition=models.Q(('is_assigned', False)), fields=['-created_at'], name='core_geo_open_created'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-17 16:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_geolocation_is_assigned'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checklistimage',
+            name='original_size',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='checklistimage',
+            name='stored_size',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,8 +1,14 @@
+import os
+import tempfile
+import uuid
+from collections import Counter
+
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
 from django.dispatch import receiver
+from django.utils import timezone
 
 
 def project_template_upload_path(instance: "Project", filename: str) -> str:
@@ -48,7 +54,24 @@ class Profile(models.Model):
 		return f"{self.user.username} ({self.get_role_display()})"
 
 
-class Checklist(models.Model):
+class StatusCountedMixin:
+	"""
+	For the models StatusCount counts. A save that can move a row between counts
+	reads the stored (project, engineer, status) under a row lock, in the
+	transaction that writes the row, so the count it leaves is the one the row
+	was really in, not the one it was loaded with.
+	"""
+	_counted_key = None
+
+	def save(self, *args, **kwargs):
+		if self._state.adding or not _touches_counted_fields(kwargs.get("update_fields")):
+			return super().save(*args, **kwargs)
+		with transaction.atomic(using=kwargs.get("using")):
+			self._counted_key = _stored_counted_key(type(self), self.pk, lock=True)
+			return super().save(*args, **kwargs)
+
+
+class Checklist(StatusCountedMixin, models.Model):
 	class Status(models.TextChoices):
 		DRAFT = "DRAFT", "Draft"
 		SUBMITTED = "SUBMITTED", "Submitted"
@@ -69,14 +92,86 @@ class Checklist(models.Model):
 	)
 	answer_data = models.JSONField(default=dict, blank=True)
 	remark_data = models.JSONField(default=dict, blank=True)
-	image_data = models.JSONField(default=dict, blank=True)
 	template_copy = models.FileField(upload_to="checklists/", blank=True, null=True)
+	# Bumped by every write that changes workbook content; excel_version records
+	# the content_version template_copy was built from
+	content_version = models.PositiveIntegerField(default=0)
+	excel_version = models.PositiveIntegerField(default=0)
+	# Hash of everything template_copy was built from; equal hash means an identical workbook
+	excel_fingerprint = models.CharField(max_length=64, blank=True)
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
 
+	class Meta:
+		# Dashboard lists: filtered by project / status / user, newest first
+		indexes = [
+			models.Index(fields=['project', 'status', '-updated_at'], name='core_checklist_proj_stat_upd'),
+			models.Index(fields=['project', '-updated_at'], name='core_checklist_proj_upd'),
+			models.Index(fields=['user', 'project', '-updated_at'], name='core_checklist_user_proj_upd'),
+			models.Index(fields=['status', '-updated_at'], name='core_checklist_status_upd'),
+			models.Index(fields=['-updated_at'], name='core_checklist_updated'),
+		]
+
 	def __str__(self) -> str:
 		return f"{self.user.username} - {self.project.name} - {self.site_id or self.id}"
 
+	def mark_content_changed(self):
+		"""Flag the Excel copy as stale; it is rebuilt the next time it is needed."""
+		Checklist.objects.filter(pk=self.pk).update(content_version=models.F("content_version") + 1)
+		self.refresh_from_db(fields=["content_version"])
+
+	def set_data_key(self, field_name: str, key, value, mark_stale: bool = True) -> bool:
+		"""
+		Write one key of answer_data / remark_data in place and, unless
+		mark_stale is False (keys the workbook does not show), mark the Excel
+		copy stale. Returns False (and writes nothing) when the stored value is
+		already equal.
+		"""
+		from .json_patch import patch_json_key
+
+		increment = ("content_version",) if mark_stale else ()
+		return patch_json_key(Checklist, self.pk, field_name, key, value, increment=increment)
+
+	def remove_data_key(self, field_name: str, key) -> bool:
+		from .json_patch import REMOVE, patch_json_key
+
+		return patch_json_key(Checklist, self.pk, field_name, key, REMOVE, increment=("content_version",))
+
+	@property
+	def image_data(self) -> dict:
+		"""
+		{row: [image path, ...]} in upload order, derived from the ChecklistImage
+		ledger. Read-only; photos are added and removed with add_image / remove_image.
+		"""
+		image_data = {}
+		rows = self.images.filter(row_number__gt=0).order_by("row_number", "id").values_list("row_number", "image")
+		for row, image_name in rows:
+			image_data.setdefault(str(row), []).append(image_name)
+		return image_data
+
+	def row_images(self, row) -> list:
+		return list(self.images.filter(row_number=int(row)).order_by("id").values_list("image", flat=True))
+
+	def add_image(self, row, image_name: str, original_size=None, stored_size=None, blob=None) -> "ChecklistImage":
+		"""
+		Append one photo to the ledger. Each upload is its own INSERT, so
+		parallel uploads to the same row never overwrite each other. A blob
+		must have been acquired (PhotoBlob.acquire / store) for this row in the
+		same transaction.
+		"""
+		return ChecklistImage.objects.create(
+			checklist=self, row_number=int(row), image=image_name,
+			original_size=original_size, stored_size=stored_size, blob=blob,
+		)
+
+	def remove_image(self, row, image_name: str) -> bool:
+		deleted, _ = self.images.filter(row_number=int(row), image=image_name).delete()
+		return bool(deleted)
+
+	@property
+	def excel_dirty(self) -> bool:
+		return not self.template_copy or self.excel_version != self.content_version
+
 	@property
 	def has_zip(self) -> bool:
 		zip_info = (self.answer_data or {}).get("zip_upload")
@@ -86,7 +181,7 @@ class Checklist(models.Model):
 
 
 class GeoLocation(models.Model):
-	name = models.CharField(max_length=200, help_text="Location name or description")
+	name = models.CharField(max_length=200, db_index=True, help_text="Location name or description")
 	latitude = models.DecimalField(max_digits=10, decimal_places=7, help_text="Latitude coordinate")
 	longitude = models.DecimalField(max_digits=10, decimal_places=7, help_text="Longitude coordinate")
 	project = models.ForeignKey(
@@ -99,22 +194,45 @@ class GeoLocation(models.Model):
 	created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 	created_at = models.DateTimeField(auto_now_add=True)
 	notes = models.TextField(blank=True)
+	# True while a WorkAssignment has this site_id, kept by the WorkAssignment
+	# signals; lets the dashboards list open locations with a filter instead of
+	# a NOT IN over every assignment
+	is_assigned = models.BooleanField(default=False)
 
 	class Meta:
 		ordering = ['-created_at']
+		# Partial, so they only hold the open locations the dashboards list
+		indexes = [
+			models.Index(fields=['project', '-created_at'], condition=models.Q(is_assigned=False), name='core_geo_open_project_created'),
+			models.Index(fields=['-created_at'], condition=models.Q(is_assigned=False), name='core_geo_open_created'),
+		]
 
 	def __str__(self) -> str:
 		return f"{self.name} ({self.latitude}, {self.longitude})"
 
-
-class WorkAssignment(models.Model):
+	@classmethod
+	def sync_assignment(cls, *site_ids) -> int:
+		"""Set is_assigned on the locations named site_ids from the work assignments; returns rows changed."""
+		site_ids = sorted({site_id for site_id in site_ids if site_id})
+		changed = 0
+		# In chunks so a large location import stays under the database's parameter limit
+		for start in range(0, len(site_ids), 500):
+			chunk = set(site_ids[start:start + 500])
+			assigned = set(WorkAssignment.objects.filter(site_id__in=chunk).values_list("site_id", flat=True))
+			changed += cls.objects.filter(name__in=assigned, is_assigned=False).update(is_assigned=True)
+			changed += cls.objects.filter(name__in=chunk - assigned, is_assigned=True).update(is_assigned=False)
+		return changed
+
+
+class WorkAssignment(StatusCountedMixin, models.Model):
 	class Status(models.TextChoices):
 		PENDING = "PENDING", "Pending"
 		IN_PROGRESS = "IN_PROGRESS", "In Progress"
 		SUBMITTED = "SUBMITTED", "Submitted"
 		COMPLETED = "COMPLETED", "Completed"
 	
-	site_id = models.CharField(max_length=120, help_text="Site identification number")
+	# Unique, so the "already assigned" check and the dashboards' unassigned-location filter are index probes
+	site_id = models.CharField(max_length=120, unique=True, help_text="Site identification number (unique)")
 	latitude = models.DecimalField(max_digits=10, decimal_places=7, help_text="Site latitude")
 	longitude = models.DecimalField(max_digits=10, decimal_places=7, help_text="Site longitude")
 	description = models.TextField(help_text="Work description and requirements")
@@ -141,6 +259,7 @@ class WorkAssignment(models.Model):
 		help_text="Auto-created checklist for this work"
 	)
 	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True)
 	started_at = models.DateTimeField(null=True, blank=True)
 	submitted_at = models.DateTimeField(null=True, blank=True)
 	completed_at = models.DateTimeField(null=True, blank=True)
@@ -149,10 +268,220 @@ class WorkAssignment(models.Model):
 
 	class Meta:
 		ordering = ['-created_at']
+		indexes = [
+			models.Index(fields=['project', '-created_at'], name='core_work_project_created'),
+			models.Index(fields=['assigned_to', '-created_at'], name='core_work_assignee_created'),
+			models.Index(fields=['-created_at'], name='core_work_created'),
+		]
 
 	def __str__(self) -> str:
 		return f"{self.site_id} - {self.assigned_to.username} ({self.get_status_display()})"
 
+	@classmethod
+	def provision_checklists(cls, works) -> int:
+		"""
+		Create the DRAFT checklist (site ID pre-filled in row 12) of every work in
+		works that has none, with one INSERT per table in a single transaction.
+		The workbook is not built here; that happens when it is first needed.
+		Returns the number of checklists created.
+		"""
+		works = [work for work in works if work.checklist_id is None]
+		if not works:
+			return 0
+		now = timezone.now()
+		with transaction.atomic():
+			checklists = Checklist.objects.bulk_create([
+				Checklist(
+					user_id=work.assigned_to_id,
+					project_id=work.project_id,
+					site_id=work.site_id,
+					status=Checklist.Status.DRAFT,
+					answer_data={"12": work.site_id},
+				)
+				for work in works
+			])
+			for work, checklist in zip(works, checklists):
+				work.checklist = checklist
+				work.updated_at = now
+			cls.objects.bulk_update(works, ["checklist", "updated_at"])
+			# bulk_create does not send the post_save signal that keeps StatusCount current
+			drafts = Counter((checklist.project_id, checklist.user_id) for checklist in checklists)
+			for (project_id, user_id), total in drafts.items():
+				StatusCount.adjust(StatusCount.Kind.CHECKLIST, project_id, user_id, Checklist.Status.DRAFT, total)
+		return len(checklists)
+
+
+class Job(models.Model):
+	"""
+	Background job run by `manage.py run_workers`.
+	At most one QUEUED job exists per (kind, target_id); enqueueing again
+	while one is waiting coalesces into it.
+	"""
+	class Status(models.TextChoices):
+		QUEUED = "QUEUED", "Queued"
+		RUNNING = "RUNNING", "Running"
+		DONE = "DONE", "Done"
+		FAILED = "FAILED", "Failed"
+
+	kind = models.CharField(max_length=50)
+	target_id = models.PositiveIntegerField()
+	status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+	attempts = models.PositiveSmallIntegerField(default=0)
+	max_attempts = models.PositiveSmallIntegerField(default=3)
+	run_after = models.DateTimeField(default=timezone.now)
+	last_error = models.TextField(blank=True)
+	duration_ms = models.PositiveIntegerField(null=True, blank=True)
+	created_at = models.DateTimeField(auto_now_add=True)
+	started_at = models.DateTimeField(null=True, blank=True)
+	finished_at = models.DateTimeField(null=True, blank=True)
+
+	class Meta:
+		ordering = ['-created_at']
+		indexes = [
+			models.Index(fields=['status', 'run_after'], name='core_job_status_run_after'),
+		]
+		constraints = [
+			models.UniqueConstraint(
+				fields=['kind', 'target_id'],
+				condition=models.Q(status='QUEUED'),
+				name='core_job_unique_queued',
+			),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.kind}({self.target_id}) - {self.get_status_display()}"
+
+
+class AutosaveBatch(models.Model):
+	"""
+	Receipt for a batch applied by the batched autosave endpoint.
+	A retry carrying the same key gets the stored results back instead of
+	applying the edits a second time.
+	"""
+	checklist = models.ForeignKey(Checklist, on_delete=models.CASCADE, related_name="autosave_batches")
+	key = models.CharField(max_length=64)
+	results = models.JSONField(default=list)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(fields=['checklist', 'key'], name='core_autosavebatch_unique_key'),
+		]
+
+	def __str__(self) -> str:
+		return f"Checklist {self.checklist_id} batch {self.key}"
+
+
+class UploadSession(models.Model):
+	"""
+	A resumable upload in progress (see core.uploads). `path` is the file the
+	chunks are written to and `received` how many bytes of it have arrived.
+	"""
+	class Kind(models.TextChoices):
+		ZIP = "zip", "Site ZIP archive"
+		PHOTO = "photo", "Checklist photo"
+
+	id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+	checklist = models.ForeignKey(Checklist, on_delete=models.CASCADE, related_name="upload_sessions")
+	user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="upload_sessions")
+	kind = models.CharField(max_length=10, choices=Kind.choices)
+	row_number = models.IntegerField(null=True, blank=True)
+	filename = models.CharField(max_length=255)
+	size = models.BigIntegerField()
+	received = models.BigIntegerField(default=0)
+	path = models.CharField(max_length=500)
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	def __str__(self) -> str:
+		return f"{self.filename} ({self.received}/{self.size} bytes)"
+
+	@property
+	def complete(self) -> bool:
+		return self.received >= self.size
+
+	def discard(self):
+		"""Delete the session and the partial file."""
+		from .uploads import discard
+
+		self.delete()
+		discard(self.path)
+
+
+class StatusCount(models.Model):
+	"""
+	Number of checklists or work assignments per (project, engineer, status).
+	Kept current by StatusCountedMixin and the signals below so the dashboards read counts instead of
+	aggregating the checklist and work tables on every load.
+	Rebuild with `manage.py rebuild_status_counts`.
+	"""
+	class Kind(models.TextChoices):
+		CHECKLIST = "CHECKLIST", "Checklist"
+		WORK = "WORK", "Work assignment"
+
+	kind = models.CharField(max_length=20, choices=Kind.choices)
+	project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="status_counts")
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="status_counts")
+	status = models.CharField(max_length=20)
+	count = models.IntegerField(default=0)
+
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(fields=['kind', 'project', 'user', 'status'], name='core_statuscount_unique_key'),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.kind} {self.status} project={self.project_id} user={self.user_id}: {self.count}"
+
+	@classmethod
+	def adjust(cls, kind: str, project_id: int, user_id: int, status: str, delta: int):
+		key = {"kind": kind, "project_id": project_id, "user_id": user_id, "status": status}
+		if cls.objects.filter(**key).update(count=models.F("count") + delta) or delta < 0:
+			# Nothing to take away from means the project or user is being deleted with its rows
+			return
+		try:
+			with transaction.atomic():
+				cls.objects.create(count=delta, **key)
+		except IntegrityError:
+			# Another request created the row first
+			cls.objects.filter(**key).update(count=models.F("count") + delta)
+
+	@classmethod
+	def rebuild(cls) -> int:
+		"""Recount everything from the checklist and work tables; returns the number of rows written."""
+		rows = []
+		for kind, model, user_field in COUNTED_MODELS:
+			totals = model.objects.values("project_id", user_field, "status").annotate(total=models.Count("id")).order_by()
+			rows.extend(
+				cls(kind=kind, project_id=row["project_id"], user_id=row[user_field], status=row["status"], count=row["total"])
+				for row in totals
+			)
+		with transaction.atomic():
+			cls.objects.all().delete()
+			cls.objects.bulk_create(rows)
+		return len(rows)
+
+	@classmethod
+	def per_user(cls, kind: str, status: str, **scope):
+		"""Rows of user__username and total within scope (e.g. project=...), largest first."""
+		counts = cls.objects.filter(kind=kind, status=status, count__gt=0, **scope)
+		return counts.values("user__username").annotate(total=models.Sum("count")).order_by("-total", "user__username")
+
+	@classmethod
+	def breakdown(cls, kind: str, **scope) -> list:
+		"""(label, total) for every status of kind within scope, in the model's status order."""
+		counts = cls.objects.filter(kind=kind, **scope)
+		totals = dict(counts.values_list("status").annotate(total=models.Sum("count")).order_by())
+		model = next(model for counted_kind, model, _user_field in COUNTED_MODELS if counted_kind == kind)
+		return [(label, totals.get(value) or 0) for value, label in model.Status.choices]
+
+
+# (kind, model, field holding the engineer) for every table StatusCount counts
+COUNTED_MODELS = (
+	(StatusCount.Kind.CHECKLIST, Checklist, "user_id"),
+	(StatusCount.Kind.WORK, WorkAssignment, "assigned_to_id"),
+)
+
 
 @receiver(post_save, sender=User)
 def create_profile_for_user(sender, instance, created, **kwargs):
@@ -160,11 +489,209 @@ def create_profile_for_user(sender, instance, created, **kwargs):
 		Profile.objects.get_or_create(user=instance, defaults={"role": Profile.Roles.ENGINEER})
 
 
+@receiver(post_save, sender=Project)
+def warm_template_layout_cache(sender, instance, **kwargs):
+	if not instance.template_file:
+		return
+	from .template_cache import warm_template_cache
+	try:
+		warm_template_cache(instance.template_file.path)
+	except Exception:
+		# A bad upload must not break saving the project; the view will report it
+		pass
+
+
+def _counted_key(instance):
+	"""(project_id, user_id, status) of a counted row, or None if any of them was not loaded."""
+	user_field = "user_id" if isinstance(instance, Checklist) else "assigned_to_id"
+	key = tuple(instance.__dict__.get(field) for field in ("project_id", user_field, "status"))
+	return None if None in key else key
+
+
+def _stored_counted_key(sender, pk, lock: bool = False):
+	rows = sender.objects.select_for_update() if lock else sender.objects
+	user_field = "user_id" if sender is Checklist else "assigned_to_id"
+	return rows.filter(pk=pk).values_list("project_id", user_field, "status").first()
+
+
+def _touches_counted_fields(update_fields) -> bool:
+	return update_fields is None or bool({"project", "user", "assigned_to", "status"} & set(update_fields))
+
+
+@receiver(post_save, sender=Checklist)
+@receiver(post_save, sender=WorkAssignment)
+def update_status_counts(sender, instance, created, update_fields=None, **kwargs):
+	if not created and not _touches_counted_fields(update_fields):
+		return
+	# StatusCountedMixin.save() read the stored key of an existing row before writing it
+	old_key = None if created else instance._counted_key
+	new_key = _counted_key(instance) or _stored_counted_key(sender, instance.pk)
+	if old_key == new_key:
+		return
+	kind = StatusCount.Kind.CHECKLIST if sender is Checklist else StatusCount.Kind.WORK
+	if old_key is not None:
+		StatusCount.adjust(kind, *old_key, -1)
+	StatusCount.adjust(kind, *new_key, 1)
+
+
+@receiver(pre_delete, sender=Checklist)
+@receiver(pre_delete, sender=WorkAssignment)
+def load_counted_key_before_delete(sender, instance, **kwargs):
+	# Sent inside the delete's transaction; the loaded values may be stale
+	instance._counted_key = _stored_counted_key(sender, instance.pk, lock=True)
+
+
+@receiver(post_delete, sender=Checklist)
+@receiver(post_delete, sender=WorkAssignment)
+def remove_from_status_counts(sender, instance, **kwargs):
+	if instance._counted_key is not None:
+		kind = StatusCount.Kind.CHECKLIST if sender is Checklist else StatusCount.Kind.WORK
+		StatusCount.adjust(kind, *instance._counted_key, -1)
+
+
+@receiver(post_init, sender=WorkAssignment)
+def remember_assigned_site(sender, instance, **kwargs):
+	instance._assigned_site_id = instance.__dict__.get("site_id")
+
+
+@receiver(post_save, sender=WorkAssignment)
+def sync_location_on_save(sender, instance, created, update_fields=None, **kwargs):
+	if not created and update_fields is not None and "site_id" not in update_fields:
+		return
+	# sync_assignment() recounts from the table, so a stale loaded site_id only costs a no-op
+	site_ids = (instance._assigned_site_id, instance.site_id)
+	instance._assigned_site_id = instance.site_id
+	transaction.on_commit(lambda: GeoLocation.sync_assignment(*site_ids))
+
+
+@receiver(post_delete, sender=WorkAssignment)
+def sync_location_on_delete(sender, instance, **kwargs):
+	# Also sent for assignments deleted with their engineer or project
+	transaction.on_commit(lambda: GeoLocation.sync_assignment(instance.site_id))
+
+
 # ===== NEW DETAILED CHECKLIST MODELS =====
 
 def checklist_image_upload_path(instance, filename):
 	"""Upload path for checklist images"""
-	return f"checklist_images/{instance.checklist.id}/{instance.section}/{filename}"
+	return f"checklist_images/{instance.checklist.id}/{instance.row_number}/{filename}"
+
+
+def photo_blob_name(sha256: str, extension: str) -> str:
+	"""Storage name of a content-addressed photo, fanned out over two directory levels."""
+	return f"photos/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+def _write_photo_file(name: str, content: bytes):
+	from django.core.files.storage import default_storage
+
+	path = default_storage.path(name)
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	# Same name means same bytes, so a concurrent writer of this file is harmless
+	fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+	try:
+		with os.fdopen(fd, "wb") as handle:
+			handle.write(content)
+		os.replace(tmp_path, path)
+	except BaseException:
+		if os.path.exists(tmp_path):
+			os.remove(tmp_path)
+		raise
+
+
+def _delete_photo_file(image_name: str):
+	from django.core.files.storage import default_storage
+
+	from .renditions import delete_renditions
+
+	if default_storage.exists(image_name):
+		default_storage.delete(image_name)
+	delete_renditions(image_name)
+
+
+class PhotoBlob(models.Model):
+	"""
+	One stored photo file, named by the SHA-256 of its bytes, so a photo
+	uploaded to several rows or sent twice is stored once. ref_count is the
+	number of ChecklistImage rows showing it: acquire() / store() take a
+	reference in the transaction that creates the ledger row, and the
+	post_delete signal below releases it. The file is deleted with the blob
+	once the last reference is gone.
+	"""
+	sha256 = models.CharField(max_length=64, unique=True)
+	file = models.CharField(max_length=200)
+	size = models.PositiveIntegerField()
+	# SHA-256 of the upload this blob was ingested from; the same upload sent again reuses the blob
+	source_sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+	ref_count = models.IntegerField(default=0)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	def __str__(self) -> str:
+		return f"{self.file} ({self.ref_count} references)"
+
+	@classmethod
+	def acquire(cls, sha256: str):
+		"""
+		Take a reference on the blob holding these bytes and return it, or None
+		if there is none. The increment is a write, so once it is done
+		delete_if_unused() can no longer remove the blob.
+		"""
+		if not cls.objects.filter(sha256=sha256).update(ref_count=models.F("ref_count") + 1):
+			return None
+		return cls.objects.get(sha256=sha256)
+
+	@classmethod
+	def store(cls, content: bytes, extension: str, sha256: str, source_sha256: str = ""):
+		"""
+		(blob, created) for content, whose SHA-256 the caller computed while
+		producing it, with a reference taken as by acquire(). Call inside the
+		transaction that creates the ChecklistImage. The file is only written
+		if no blob has these bytes yet, after its row is inserted, so a
+		concurrent delete of the same bytes either finishes first or sees the
+		new row.
+		"""
+		blob = cls.acquire(sha256)
+		if blob is not None:
+			return blob, False
+		name = photo_blob_name(sha256, extension)
+		try:
+			with transaction.atomic():
+				blob = cls.objects.create(
+					sha256=sha256, file=name, size=len(content), source_sha256=source_sha256, ref_count=1,
+				)
+		except IntegrityError:
+			# Stored by a concurrent upload since acquire() above
+			return cls.store(content, extension, sha256, source_sha256)
+		_write_photo_file(name, content)
+		return blob, True
+
+	@classmethod
+	def by_source(cls, source_sha256s) -> dict:
+		"""{upload SHA-256: blob} for the uploads that were ingested before."""
+		blobs = cls.objects.filter(source_sha256__in=[digest for digest in source_sha256s if digest])
+		return {blob.source_sha256: blob for blob in blobs}
+
+	@classmethod
+	def delete_if_unused(cls, blob_id: int):
+		"""Delete the blob and its file if nothing references it any more."""
+		name = cls.objects.filter(pk=blob_id).values_list("file", flat=True).first()
+		if name is None:
+			return
+		quote = connection.ops.quote_name
+		with transaction.atomic(), connection.cursor() as cursor:
+			# One conditional DELETE, the transaction's first write: an acquire() or
+			# store() of these bytes either pinned the blob before it or waits for
+			# this transaction, file deletion included, to finish
+			cursor.execute(
+				f"DELETE FROM {quote(cls._meta.db_table)} WHERE {quote(cls._meta.pk.column)} = %s AND ref_count <= 0"
+				f" AND NOT EXISTS (SELECT 1 FROM {quote(ChecklistImage._meta.db_table)}"
+				f" WHERE {quote(ChecklistImage._meta.get_field('blob').column)} = %s)",
+				[blob_id, blob_id],
+			)
+			if not cursor.rowcount:
+				return
+			if not cls.objects.filter(file=name).exists():
+				_delete_photo_file(name)
 
 
 class ChecklistSection(models.Model):
@@ -191,18 +718,50 @@ class ChecklistSection(models.Model):
 
 
 class ChecklistImage(models.Model):
-	"""Stores images for checklist sections"""
-	section = models.ForeignKey(ChecklistSection, on_delete=models.CASCADE, related_name="images")
+	"""
+	Stores images for checklist sections
+	
+	One row per photo, appended on upload and deleted on removal; the
+	Checklist.image_data view is derived from these rows.
+	"""
+	section = models.ForeignKey(ChecklistSection, on_delete=models.CASCADE, related_name="images", null=True, blank=True)
 	checklist = models.ForeignKey(Checklist, on_delete=models.CASCADE, related_name="images")
-	image = models.ImageField(upload_to=checklist_image_upload_path)
+	row_number = models.IntegerField(default=0)  # Excel row number
+	image = models.ImageField(upload_to=checklist_image_upload_path, max_length=500)
+	# The content-addressed file `image` names; empty for photos stored before PhotoBlob
+	blob = models.ForeignKey(PhotoBlob, on_delete=models.PROTECT, related_name="references", null=True, blank=True)
 	column_position = models.CharField(max_length=5, default='F')  # F, G, H, etc.
+	# Bytes received and bytes stored after ingestion (core.ingest); empty for older photos
+	original_size = models.PositiveIntegerField(null=True, blank=True)
+	stored_size = models.PositiveIntegerField(null=True, blank=True)
 	uploaded_at = models.DateTimeField(auto_now_add=True)
 	
 	class Meta:
 		ordering = ['column_position', 'uploaded_at']
+		indexes = [
+			models.Index(fields=['checklist', 'row_number'], name='core_checklistimage_row'),
+		]
 	
 	def __str__(self):
-		return f"Image for Row {self.section.row_number} - Col {self.column_position}"
+		return f"Image for Row {self.row_number} - Col {self.column_position}"
+
+
+@receiver(post_delete, sender=ChecklistImage)
+def release_photo_file(sender, instance, **kwargs):
+	"""Drop the photo's reference; the file goes once nothing shows it any more."""
+	blob_id = instance.blob_id
+	if blob_id:
+		PhotoBlob.objects.filter(pk=blob_id).update(ref_count=models.F("ref_count") - 1)
+		transaction.on_commit(lambda: PhotoBlob.delete_if_unused(blob_id))
+		return
+	# Photos stored before PhotoBlob have a file of their own, unless the ledger lists it twice
+	image_name = instance.image.name
+
+	def delete_if_unreferenced():
+		if not ChecklistImage.objects.filter(image=image_name).exists():
+			_delete_photo_file(image_name)
+
+	transaction.on_commit(delete_if_unreferenced)
 
 
 class DCPowerSystemData(models.Model):
@@ -268,6 +827,13 @@ class TowerEquipment(models.Model):
 	
 	class Meta:
 		ordering = ['operator_type', 'equipment_type', 'position_index']
+		constraints = [
+			# One row per slot of an equipment block; also the index autosave looks rows up by
+			models.UniqueConstraint(
+				fields=['checklist', 'operator_type', 'equipment_type', 'position_index'],
+				name='core_towerequipment_unique_position',
+			),
+		]
 	
 	def __str__(self):
 		return f"{self.operator_type} - {self.equipment_type} - Row {self.row_number}"
@@ -289,6 +855,9 @@ class ElectricalData(models.Model):
 	
 	class Meta:
 		ordering = ['position_index']
+		constraints = [
+			models.UniqueConstraint(fields=['checklist', 'row_number'], name='core_electricaldata_unique_row'),
+		]
 	
 	def __str__(self):
 		return f"Electrical Data - Row {self.row_number}"
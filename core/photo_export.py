@@ -0,0 +1,89 @@
+"""
+Streamed ZIP archive of a checklist's photos.
+
+The archive is produced while it is sent: ZipFile writes into a sink that
+the generator empties after every 64 KiB of photo data, so neither the
+archive nor a whole photo is ever held in memory or written to disk. As the
+sink cannot seek, each entry's CRC and sizes follow its data in a data
+descriptor, the standard layout for streamed ZIPs.
+
+JPEGs (and WebPs) are already compressed, so they are stored as they are;
+anything else is deflated. Entries are named by section and row:
+`03-power-supply/row-088-02.jpg` is the second photo of row 88.
+"""
+import posixpath
+import zipfile
+
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .template_cache import IMAGE_SECTION_ROWS, IMAGE_SECTION_TITLES
+
+COPY_BUFFER_SIZE = 64 * 1024
+STORED_EXTENSIONS = {".jpg", ".jpeg", ".webp"}
+
+
+class _Sink:
+	"""Write-only file ZipFile writes into; take() hands over what was written since the last call."""
+
+	def __init__(self):
+		self._chunks = []
+
+	def write(self, data) -> int:
+		self._chunks.append(bytes(data))
+		return len(data)
+
+	def flush(self):
+		pass
+
+	def take(self) -> bytes:
+		data = b"".join(self._chunks)
+		self._chunks.clear()
+		return data
+
+
+def section_folder(row: int) -> str:
+	for index, ((start, stop), title) in enumerate(zip(IMAGE_SECTION_ROWS, IMAGE_SECTION_TITLES), start=1):
+		if start <= row < stop:
+			return f"{index:02d}-{slugify(title)}"
+	return "other"
+
+
+def photo_entries(image_data: dict) -> list:
+	"""(archive name, storage name) of every photo in a Checklist.image_data dict, in section and row order."""
+	entries = []
+	for row, image_names in sorted(image_data.items(), key=lambda item: int(item[0])):
+		for number, image_name in enumerate(image_names, start=1):
+			extension = posixpath.splitext(image_name)[1].lower() or ".jpg"
+			entries.append((f"{section_folder(int(row))}/row-{int(row):03d}-{number:02d}{extension}", image_name))
+	return entries
+
+
+def _entry_info(archive_name: str, image_name: str) -> zipfile.ZipInfo:
+	modified = default_storage.get_modified_time(image_name)
+	if timezone.is_aware(modified):
+		modified = timezone.localtime(modified)
+	info = zipfile.ZipInfo(archive_name, date_time=modified.timetuple()[:6])
+	info.external_attr = 0o644 << 16  # rw-r--r-- when extracted
+	info.file_size = default_storage.size(image_name)  # lets ZipFile pick ZIP64 up front when needed
+	extension = posixpath.splitext(image_name)[1].lower()
+	info.compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+	return info
+
+
+def iter_photo_zip(entries):
+	"""Yield the bytes of a ZIP archive of (archive name, storage name) entries; missing files are left out."""
+	sink = _Sink()
+	with zipfile.ZipFile(sink, "w", allowZip64=True) as archive:
+		for archive_name, image_name in entries:
+			if not default_storage.exists(image_name):
+				continue
+			with default_storage.open(image_name, "rb") as source, archive.open(_entry_info(archive_name, image_name), "w") as entry:
+				for data in iter(lambda: source.read(COPY_BUFFER_SIZE), b""):
+					entry.write(data)
+					chunk = sink.take()
+					if chunk:
+						yield chunk
+	# The rest of the last entry and the central directory
+	yield sink.take()
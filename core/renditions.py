@@ -0,0 +1,213 @@
+"""
+Derived sizes of checklist photos.
+
+Every uploaded photo gets:
+- excel: the JPEG embedded in the checklist workbook, sized for the 240x192
+  px photo cells (at 2x so it stays sharp when zoomed or printed)
+- original: the uploaded file itself, untouched
+
+Renditions are stored next to the original, in a `renditions/` folder beside
+it (`.../images/renditions/<name>.excel.jpg`), and are regenerated whenever
+the original is newer than the rendition.
+
+Gallery thumbnails are made on first request and kept in
+THUMBNAIL_CACHE_DIR, keyed on (image, size, mtime) so their URLs never
+change meaning and can be cached by browsers for good. The least recently
+used ones are deleted once the folder grows past THUMBNAIL_CACHE_MAX_BYTES.
+"""
+import hashlib
+import os
+import posixpath
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from PIL import Image as PilImage
+from PIL import ImageOps
+
+ORIGINAL = "original"
+
+RENDITION_SPECS = {
+	"excel": {"size": (480, 384), "quality": 82},
+}
+
+RENDITION_DIR = "renditions"
+
+THUMBNAIL_SIZES = (160, 320, 640)
+THUMBNAIL_QUALITY = 75
+# Seconds between eviction sweeps of the thumbnail cache, per process
+THUMBNAIL_EVICT_INTERVAL = 60
+
+_last_eviction = 0.0
+
+
+def rendition_name(image_name: str, kind: str) -> str:
+	"""Storage name of a rendition of `image_name`."""
+	if kind == ORIGINAL:
+		return image_name
+	if kind not in RENDITION_SPECS:
+		raise ValueError(f"Unknown rendition: {kind}")
+	directory, filename = posixpath.split(image_name)
+	return posixpath.join(directory, RENDITION_DIR, f"{filename}.{kind}.jpg")
+
+
+def _is_current(source_path: str, target_path: str) -> bool:
+	try:
+		return os.path.getmtime(target_path) >= os.path.getmtime(source_path)
+	except OSError:
+		return False
+
+
+def _decode(image, largest: int):
+	"""Upright RGB copy of an opened photo, decoded no larger than needed for `largest` px."""
+	# Shrink while decoding; JPEG can skip most of the work at 1/2, 1/4 or 1/8 scale
+	image.draft("RGB", (largest, largest))
+	image = ImageOps.exif_transpose(image)
+	if image.mode != "RGB":
+		image = image.convert("RGB")
+	return image
+
+
+def _render(image, size, quality: int, target_path: str):
+	rendition = image.copy()
+	rendition.thumbnail(size, PilImage.LANCZOS)
+	target_dir = os.path.dirname(target_path)
+	os.makedirs(target_dir, exist_ok=True)
+	# Write to a temp file and rename so a concurrent build never reads half a JPEG
+	fd, tmp_path = tempfile.mkstemp(dir=target_dir, suffix=".tmp")
+	try:
+		with os.fdopen(fd, "wb") as handle:
+			rendition.save(handle, format="JPEG", quality=quality, optimize=True)
+		os.replace(tmp_path, target_path)
+	except BaseException:
+		if os.path.exists(tmp_path):
+			os.remove(tmp_path)
+		raise
+
+
+def generate_renditions(image_name: str, kinds=None):
+	"""
+	Create any missing or stale renditions of a stored photo.
+	The original is decoded at most once for all of them.
+	"""
+	source_path = default_storage.path(image_name)
+	pending = []
+	for kind in kinds or RENDITION_SPECS:
+		target_path = default_storage.path(rendition_name(image_name, kind))
+		if not _is_current(source_path, target_path):
+			pending.append((kind, target_path))
+	if not pending:
+		return
+
+	with PilImage.open(source_path) as image:
+		image = _decode(image, max(max(RENDITION_SPECS[kind]["size"]) for kind, _path in pending))
+		for kind, target_path in pending:
+			spec = RENDITION_SPECS[kind]
+			_render(image, spec["size"], spec["quality"], target_path)
+
+
+def rendition_path(image_name: str, kind: str) -> str:
+	"""
+	Absolute path of a rendition, generating it if needed.
+	Falls back to the original when the photo cannot be decoded.
+	"""
+	if kind == ORIGINAL:
+		return default_storage.path(image_name)
+	try:
+		generate_renditions(image_name, [kind])
+	except (OSError, ValueError, PilImage.DecompressionBombError):
+		return default_storage.path(image_name)
+	return default_storage.path(rendition_name(image_name, kind))
+
+
+def delete_renditions(image_name: str):
+	for kind in RENDITION_SPECS:
+		name = rendition_name(image_name, kind)
+		if default_storage.exists(name):
+			default_storage.delete(name)
+
+
+def _thumbnail_cache_dir() -> str:
+	return str(getattr(settings, "THUMBNAIL_CACHE_DIR", settings.BASE_DIR / "cache" / "thumbnails"))
+
+
+def _thumbnail_cache_limit() -> int:
+	return int(getattr(settings, "THUMBNAIL_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+
+def thumbnail_version(image_name: str):
+	"""Version token of a stored photo (its mtime), or None if the file is missing."""
+	try:
+		return format(os.stat(default_storage.path(image_name)).st_mtime_ns, "x")
+	except OSError:
+		return None
+
+
+def thumbnail_cache_path(image_name: str, size: int, version: str) -> str:
+	key = hashlib.sha1(f"{image_name}|{size}|{version}".encode("utf-8")).hexdigest()
+	return os.path.join(_thumbnail_cache_dir(), key[:2], f"{key}.jpg")
+
+
+def thumbnail_path(image_name: str, size: int, version: str) -> str:
+	"""
+	Absolute path of the `size` px thumbnail of a photo at `version`,
+	generating it on first request.
+	"""
+	if size not in THUMBNAIL_SIZES:
+		raise ValueError(f"Unsupported thumbnail size: {size}")
+	target_path = thumbnail_cache_path(image_name, size, version)
+	if os.path.exists(target_path):
+		try:
+			# The mtime records the last use, for eviction
+			os.utime(target_path)
+		except OSError:
+			pass
+		return target_path
+
+	with PilImage.open(default_storage.path(image_name)) as image:
+		_render(_decode(image, size), (size, size), THUMBNAIL_QUALITY, target_path)
+	_maybe_evict_thumbnails()
+	return target_path
+
+
+def _maybe_evict_thumbnails():
+	global _last_eviction
+	now = time.monotonic()
+	if now - _last_eviction >= THUMBNAIL_EVICT_INTERVAL:
+		_last_eviction = now
+		evict_thumbnails()
+
+
+def evict_thumbnails(max_bytes: int | None = None) -> int:
+	"""
+	Delete the least recently used thumbnails until the cache is back under
+	90% of max_bytes (THUMBNAIL_CACHE_MAX_BYTES by default) once it is over it.
+	Returns the number of files deleted.
+	"""
+	limit = _thumbnail_cache_limit() if max_bytes is None else max_bytes
+	entries = []
+	total = 0
+	for directory, _dirs, filenames in os.walk(_thumbnail_cache_dir()):
+		for filename in filenames:
+			path = os.path.join(directory, filename)
+			try:
+				stat = os.stat(path)
+			except OSError:
+				continue
+			entries.append((stat.st_mtime, stat.st_size, path))
+			total += stat.st_size
+	if total <= limit:
+		return 0
+
+	removed = 0
+	for _mtime, size, path in sorted(entries):
+		if total <= limit * 0.9:
+			break
+		try:
+			os.remove(path)
+		except OSError:
+			continue
+		total -= size
+		removed += 1
+	return removed
@@ -0,0 +1,417 @@
+"""
+Cache of parsed template layouts (question texts per section).
+
+Entries are keyed on the template's identity: absolute path, mtime and size.
+Uploading a new template (or editing it in place) changes the identity, so
+stale layouts are never returned.
+
+Two tiers:
+- an in-process LRU (per gunicorn worker)
+- a shared on-disk tier of small JSON files that every worker can read, so
+  only the first worker to see a template pays the parse
+
+The same identity keys the in-process cache of TemplatePrototype objects used
+to build checklist workbooks. preload_template_prototypes() fills both before
+gunicorn forks its workers, so the parsed templates sit in copy-on-write
+memory shared by all of them.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+from xml.etree import ElementTree
+
+from django.conf import settings
+from openpyxl import load_workbook
+
+from .xlsx_writer import (
+	TemplatePrototype, active_sheet_part, merged_anchor_index, shared_strings_part, split_coordinate,
+)
+
+# Bump when the parsed layout format changes so old disk entries are ignored
+LAYOUT_VERSION = 2
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+# Row ranges of the photo sections (questions in column B)
+IMAGE_SECTION_ROWS = (
+	(22, 71),    # CIVIL & SITE GENERAL
+	(73, 85),    # ELECTROMECHANICAL
+	(87, 97),    # Power Supply
+	(98, 115),   # DG/SG Set
+	(116, 126),  # Hybrid AC/DC
+	(127, 134),  # Solar
+	(135, 143),  # Transformer
+	(144, 152),  # Service Disconnect
+	(153, 161),  # SHAREABLE MDB/LDB
+	(163, 182),  # SHELTER/ODU
+	(184, 186),  # Extra
+)
+# Names of the IMAGE_SECTION_ROWS sections, in the same order
+IMAGE_SECTION_TITLES = (
+	"Civil & Site General", "Electromechanical", "Power Supply", "DG-SG Set", "Hybrid AC-DC", "Solar",
+	"Transformer", "Service Disconnect", "Shareable MDB-LDB", "Shelter-ODU", "Extra",
+)
+GENERAL_ROWS = (4, 19)
+DC_POWER_ROWS = (187, 194)
+
+_lock = threading.Lock()
+_memory = OrderedDict()
+_prototypes = OrderedDict()
+_stats = {
+	"memory_hits": 0, "disk_hits": 0, "misses": 0, "disk_writes": 0,
+	"prototype_hits": 0, "prototype_loads": 0,
+}
+
+
+def _cache_dir() -> str:
+	return str(getattr(settings, "TEMPLATE_CACHE_DIR", settings.BASE_DIR / "cache" / "templates"))
+
+
+def _memory_limit() -> int:
+	return int(getattr(settings, "TEMPLATE_CACHE_SIZE", 16))
+
+
+def template_identity(template_path: str):
+	"""Return the (path, mtime_ns, size) tuple the cache is keyed on."""
+	abs_path = os.path.abspath(template_path)
+	stat = os.stat(abs_path)
+	return abs_path, stat.st_mtime_ns, stat.st_size
+
+
+def _path_prefix(abs_path: str) -> str:
+	return hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:16]
+
+
+def _disk_entry_path(identity) -> str:
+	abs_path, mtime_ns, size = identity
+	filename = f"{_path_prefix(abs_path)}-{mtime_ns}-{size}-v{LAYOUT_VERSION}.json"
+	return os.path.join(_cache_dir(), filename)
+
+
+def _layout_from_values(value_at):
+	"""Build the (general, image, dc_power, site_id) tuple from a cell lookup."""
+	def _text(coordinate):
+		value = value_at(coordinate) or ""
+		return str(value).strip()
+
+	# General section: rows 4-18, Questions in AB (merged), Answers in CDEF (merged)
+	general_questions = []
+	for row in range(*GENERAL_ROWS):
+		text = _text(f"A{row}")
+		if text:
+			general_questions.append({"row": row, "text": text})
+
+	# All photo sections: Questions in B, Remarks in DE (merged), Images in F, G, H...
+	image_questions = []
+	for start, stop in IMAGE_SECTION_ROWS:
+		for row in range(start, stop):
+			text = _text(f"B{row}")
+			if text:
+				image_questions.append({"row": row, "text": text})
+
+	# DC Power System Data (rows 187-193): Labels in AB (merged), Values in DEF (merged)
+	dc_power_questions = []
+	for row in range(*DC_POWER_ROWS):
+		text = _text(f"A{row}")
+		if text:
+			dc_power_questions.append({"row": row, "text": text})
+
+	site_id = value_at("B12") or value_at("A12") or ""
+	return general_questions, image_questions, dc_power_questions, str(site_id).strip()
+
+
+def _wanted_cells():
+	wanted = {f"A{row}" for row in range(*GENERAL_ROWS)}
+	wanted.update(f"B{row}" for start, stop in IMAGE_SECTION_ROWS for row in range(start, stop))
+	wanted.update(f"A{row}" for row in range(*DC_POWER_ROWS))
+	wanted.update(("A12", "B12"))
+	return wanted
+
+
+def _number(text: str):
+	"""Numeric cell value the way openpyxl reads it."""
+	try:
+		if "." in text or "E" in text or "e" in text:
+			return float(text)
+		return int(text)
+	except ValueError:
+		return text
+
+
+def _stream_sheet_cells(archive, sheet_part: str, wanted):
+	"""
+	Iterparse the sheet and return ({coordinate: (type, raw)}, merged ranges)
+	for the wanted cells only. Elements are cleared as soon as they are read,
+	so memory does not grow with the size of the sheet.
+	"""
+	cells = {}
+	merges = []
+	cell_tag = f"{{{NS_MAIN}}}c"
+	row_tag = f"{{{NS_MAIN}}}row"
+	merge_tag = f"{{{NS_MAIN}}}mergeCell"
+	parent = None
+	with archive.open(sheet_part) as handle:
+		for event, element in ElementTree.iterparse(handle, events=("start", "end")):
+			tag = element.tag
+			if event == "start":
+				if tag == f"{{{NS_MAIN}}}sheetData" or tag == f"{{{NS_MAIN}}}mergeCells":
+					parent = element
+				continue
+			if tag == cell_tag:
+				coordinate = element.get("r")
+				if coordinate in wanted:
+					cell_type = element.get("t", "n")
+					formula = element.find(f"{{{NS_MAIN}}}f")
+					if formula is not None and formula.text:
+						cells[coordinate] = ("f", formula.text)
+					elif cell_type == "inlineStr":
+						cells[coordinate] = ("inlineStr", "".join(
+							node.text or "" for node in element.iter(f"{{{NS_MAIN}}}t")
+						))
+					else:
+						value = element.find(f"{{{NS_MAIN}}}v")
+						if value is not None and value.text is not None:
+							cells[coordinate] = (cell_type, value.text)
+			elif tag == row_tag or tag == merge_tag:
+				if tag == merge_tag:
+					merges.append(element.get("ref", ""))
+				# Drop the finished element from its parent too, not just its contents
+				element.clear()
+				if parent is not None:
+					parent.remove(element)
+	return cells, merges
+
+
+def _stream_shared_strings(archive, part: str, indexes) -> dict:
+	"""Return {index: text} for the given shared string indexes only."""
+	strings = {}
+	if not part or not indexes:
+		return strings
+	item_tag = f"{{{NS_MAIN}}}si"
+	text_tag = f"{{{NS_MAIN}}}t"
+	phonetic_tag = f"{{{NS_MAIN}}}rPh"
+	last_index = max(indexes)
+	position = 0
+	root = None
+	with archive.open(part) as handle:
+		for event, element in ElementTree.iterparse(handle, events=("start", "end")):
+			if root is None:
+				root = element
+			if event == "start" or element.tag != item_tag:
+				continue
+			if position in indexes:
+				# Rich text runs are concatenated; phonetic hints are not part of the value
+				phonetic = {id(node) for ph in element.iter(phonetic_tag) for node in ph.iter(text_tag)}
+				strings[position] = "".join(
+					node.text or "" for node in element.iter(text_tag) if id(node) not in phonetic
+				)
+			element.clear()
+			root.remove(element)
+			position += 1
+			if position > last_index:
+				break
+	return strings
+
+
+def parse_template_questions(template_path: str):
+	"""
+	Stream the question texts out of the template (uncached).
+	Only the cells in the question columns are kept; styles, drawings and
+	images are never read.
+	"""
+	wanted = _wanted_cells()
+	with zipfile.ZipFile(template_path) as archive:
+		cells, merges = _stream_sheet_cells(archive, active_sheet_part(archive), wanted)
+
+		# Like openpyxl, cells hidden under a merged range (not its top-left) have no value
+		covered = merged_anchor_index(tuple(ref.split(":", 1)) for ref in merges if ":" in ref)
+		for coordinate in list(cells):
+			key = split_coordinate(coordinate)
+			if covered.get(key, key) != key:
+				del cells[coordinate]
+
+		string_indexes = {int(raw) for cell_type, raw in cells.values() if cell_type == "s" and raw.isdigit()}
+		shared = _stream_shared_strings(archive, shared_strings_part(archive), string_indexes)
+
+	def value_at(coordinate):
+		if coordinate not in cells:
+			return None
+		cell_type, raw = cells[coordinate]
+		if cell_type == "s":
+			return shared.get(int(raw)) if raw.isdigit() else None
+		if cell_type == "inlineStr":
+			return raw
+		if cell_type == "f":
+			return f"={raw}"
+		if cell_type == "b":
+			return raw == "1"
+		if cell_type == "n":
+			return _number(raw)
+		return raw
+
+	return _layout_from_values(value_at)
+
+
+def parse_template_questions_openpyxl(template_path: str):
+	"""The original full-workbook parse; kept as the reference for the benchmark."""
+	workbook = load_workbook(template_path)
+	worksheet = workbook.active
+	return _layout_from_values(lambda coordinate: worksheet[coordinate].value)
+
+
+def _copy_layout(layout):
+	"""Callers annotate question dicts in place, so never hand out cached ones."""
+	general, image, dc_power, site_id = layout
+	return (
+		[dict(q) for q in general],
+		[dict(q) for q in image],
+		[dict(q) for q in dc_power],
+		site_id,
+	)
+
+
+def _remember(identity, layout):
+	with _lock:
+		_memory[identity] = layout
+		_memory.move_to_end(identity)
+		while len(_memory) > _memory_limit():
+			_memory.popitem(last=False)
+
+
+def _read_disk(identity):
+	try:
+		with open(_disk_entry_path(identity), "r", encoding="utf-8") as handle:
+			payload = json.load(handle)
+		return (
+			payload["general"],
+			payload["image"],
+			payload["dc_power"],
+			payload["site_id"],
+		)
+	except (OSError, ValueError, KeyError):
+		return None
+
+
+def _write_disk(identity, layout):
+	cache_dir = _cache_dir()
+	entry_path = _disk_entry_path(identity)
+	general, image, dc_power, site_id = layout
+	payload = {
+		"template": identity[0],
+		"general": general,
+		"image": image,
+		"dc_power": dc_power,
+		"site_id": site_id,
+	}
+	try:
+		os.makedirs(cache_dir, exist_ok=True)
+		# Write to a temp file and rename so other workers never read a partial entry
+		fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+		with os.fdopen(fd, "w", encoding="utf-8") as handle:
+			json.dump(payload, handle)
+		os.replace(tmp_path, entry_path)
+	except OSError:
+		return
+
+	# Drop entries for older versions of the same template
+	prefix = _path_prefix(identity[0]) + "-"
+	entry_name = os.path.basename(entry_path)
+	for name in os.listdir(cache_dir):
+		if name.startswith(prefix) and name != entry_name:
+			try:
+				os.remove(os.path.join(cache_dir, name))
+			except OSError:
+				pass
+	with _lock:
+		_stats["disk_writes"] += 1
+
+
+def read_template_questions(template_path: str):
+	"""
+	Return (general, image, dc_power, site_id) for a template, using the cache.
+	Same shape as parse_template_questions().
+	"""
+	identity = template_identity(template_path)
+
+	with _lock:
+		layout = _memory.get(identity)
+		if layout is not None:
+			_memory.move_to_end(identity)
+			_stats["memory_hits"] += 1
+	if layout is not None:
+		return _copy_layout(layout)
+
+	layout = _read_disk(identity)
+	if layout is not None:
+		with _lock:
+			_stats["disk_hits"] += 1
+		_remember(identity, layout)
+		return _copy_layout(layout)
+
+	layout = parse_template_questions(template_path)
+	with _lock:
+		_stats["misses"] += 1
+	_remember(identity, layout)
+	_write_disk(identity, layout)
+	return _copy_layout(layout)
+
+
+def warm_template_cache(template_path: str):
+	"""Parse a freshly uploaded template so the first page view is a cache hit."""
+	read_template_questions(template_path)
+	get_template_prototype(template_path)
+
+
+def get_template_prototype(template_path: str) -> TemplatePrototype:
+	"""Return the parsed prototype for a template, loading it on first use."""
+	identity = template_identity(template_path)
+	with _lock:
+		prototype = _prototypes.get(identity)
+		if prototype is not None:
+			_prototypes.move_to_end(identity)
+			_stats["prototype_hits"] += 1
+			return prototype
+
+	prototype = TemplatePrototype(identity[0])
+	with _lock:
+		_stats["prototype_loads"] += 1
+		# Older versions of the same file are never asked for again
+		for key in [key for key in _prototypes if key[0] == identity[0]]:
+			del _prototypes[key]
+		_prototypes[identity] = prototype
+		while len(_prototypes) > _memory_limit():
+			_prototypes.popitem(last=False)
+	return prototype
+
+
+def preload_template_prototypes() -> int:
+	"""
+	Load layouts and prototypes for every project template.
+	Call in the parent process before forking workers.
+	"""
+	from .models import Project
+
+	loaded = 0
+	for project in Project.objects.exclude(template_file="").exclude(template_file__isnull=True):
+		try:
+			template_path = project.template_file.path
+			read_template_questions(template_path)
+			get_template_prototype(template_path)
+			loaded += 1
+		except Exception:
+			# A missing or broken template should not stop the server starting
+			continue
+	return loaded
+
+
+def cache_stats() -> dict:
+	with _lock:
+		stats = dict(_stats)
+		stats["memory_entries"] = len(_memory)
+		stats["prototype_entries"] = len(_prototypes)
+	stats["pid"] = os.getpid()
+	return stats
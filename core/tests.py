@@ -1,3 +1,572 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+from openpyxl import Workbook
+from PIL import Image as PilImage
+from PIL import ImageCms
+
+from . import jobs, uploads
+from .ingest import EXIF_ORIENTATION, ingest_photo
+from .renditions import RENDITION_DIR, rendition_name
+from .template_cache import parse_template_questions, parse_template_questions_openpyxl
+from .models import Checklist, GeoLocation, Job, PhotoBlob, Profile, Project, StatusCount, WorkAssignment
+
+
+def make_user(username: str, role: str, project=None, path: str = "") -> User:
+	user = User.objects.create_user(username, password="pw")
+	Profile.objects.filter(user=user).update(role=role, project=project, path=path)
+	user.refresh_from_db()
+	return user
+
+
+def logged_in(user: User) -> Client:
+	client = Client()
+	client.force_login(user)
+	return client
+
+
+class ChecklistFixture(TestCase):
+	"""A project with a team lead and an engineer owning one draft checklist."""
+
+	def setUp(self):
+		self.project = Project.objects.create(name="P1")
+		self.other_project = Project.objects.create(name="P2")
+		self.team_lead = make_user("tl", Profile.Roles.TEAM_LEAD, self.project, "TL1")
+		self.engineer = make_user("eng", Profile.Roles.ENGINEER, self.project, "Eng1")
+		self.checklist = Checklist.objects.create(user=self.engineer, project=self.project, site_id="S1")
+
+
+class AutosaveBatchPermissionTests(ChecklistFixture):
+	def post_batch(self, client: Client, answer: str = "edited"):
+		return client.post(
+			f"/checklist/{self.checklist.id}/autosave/batch/",
+			json.dumps({"key": "", "ops": [{"row": "5", "answer": answer}]}),
+			content_type="application/json",
+		)
+
+	def answers(self) -> dict:
+		self.checklist.refresh_from_db()
+		return self.checklist.answer_data or {}
+
+	def test_anonymous_is_refused(self):
+		self.assertEqual(self.post_batch(Client()).status_code, 403)
+		self.assertNotIn("5", self.answers())
+
+	def test_other_engineer_and_other_team_lead_are_refused(self):
+		outsiders = (
+			make_user("eng2", Profile.Roles.ENGINEER, self.project, "Eng2"),
+			make_user("tl2", Profile.Roles.TEAM_LEAD, self.other_project, "TL2"),
+		)
+		for user in outsiders:
+			self.assertEqual(self.post_batch(logged_in(user)).status_code, 403)
+		self.assertNotIn("5", self.answers())
+
+	def test_owner_team_lead_and_dev_admin_may_save(self):
+		admin = Client()
+		session = admin.session
+		session["is_dev_admin"] = True
+		session.save()
+		for client, answer in ((logged_in(self.engineer), "a"), (logged_in(self.team_lead), "b"), (admin, "c")):
+			response = self.post_batch(client, answer)
+			self.assertEqual(response.status_code, 200)
+			self.assertEqual(self.answers()["5"], answer)
+
+	def test_engineer_cannot_change_final_checklist(self):
+		Checklist.objects.filter(pk=self.checklist.pk).update(status=Checklist.Status.FINAL)
+		self.assertEqual(self.post_batch(logged_in(self.engineer)).status_code, 403)
+		self.assertEqual(self.post_batch(logged_in(self.team_lead)).status_code, 200)
+
+
+def _fail(target_id):
+	raise RuntimeError(f"cannot build {target_id}")
+
+
+@override_settings(JOB_MAX_ATTEMPTS=3, JOB_RETRY_DELAY=10, JOB_RETENTION=3600)
+@mock.patch.dict(jobs.JOB_HANDLERS, {"noop": lambda target_id: None, "fail": _fail})
+class JobQueueTests(TestCase):
+	def test_enqueue_coalesces_while_queued(self):
+		first = jobs.enqueue("noop", 1)
+		self.assertEqual(jobs.enqueue("noop", 1).pk, first.pk)
+		self.assertNotEqual(jobs.enqueue("noop", 2).pk, first.pk)
+		self.assertEqual(Job.objects.count(), 2)
+
+	def test_enqueue_adds_a_job_once_the_waiting_one_is_claimed(self):
+		first = jobs.enqueue("noop", 1)
+		self.assertEqual(jobs.claim_next_job().pk, first.pk)
+		second = jobs.enqueue("noop", 1)
+		self.assertNotEqual(second.pk, first.pk)
+		self.assertEqual(second.status, Job.Status.QUEUED)
+
+	def test_enqueue_rejects_unknown_kinds(self):
+		with self.assertRaises(ValueError):
+			jobs.enqueue("unknown", 1)
+
+	def test_claim_takes_oldest_due_job(self):
+		now = timezone.now()
+		later = jobs.enqueue("noop", 1, run_after=now - timedelta(seconds=10))
+		oldest = jobs.enqueue("noop", 2, run_after=now - timedelta(seconds=60))
+		jobs.enqueue("noop", 3, run_after=now + timedelta(hours=1))
+		claimed = jobs.claim_next_job()
+		self.assertEqual(claimed.pk, oldest.pk)
+		self.assertEqual((claimed.status, claimed.attempts), (Job.Status.RUNNING, 1))
+		self.assertEqual(jobs.claim_next_job().pk, later.pk)
+		self.assertIsNone(jobs.claim_next_job())
+
+	def test_claim_skips_targets_that_are_already_running(self):
+		jobs.enqueue("noop", 1)
+		jobs.claim_next_job()
+		jobs.enqueue("noop", 1)
+		self.assertIsNone(jobs.claim_next_job())
+
+	def test_failures_are_retried_with_backoff_then_fail(self):
+		job = jobs.enqueue("fail", 1)
+		for attempt, delay in ((1, 10), (2, 20)):
+			self.assertEqual(jobs.claim_next_job().pk, job.pk)
+			before = timezone.now()
+			job = jobs.execute_job(job.pk)
+			self.assertEqual((job.status, job.attempts), (Job.Status.QUEUED, attempt))
+			self.assertIn("cannot build 1", job.last_error)
+			self.assertGreaterEqual(job.run_after, before + timedelta(seconds=delay))
+			self.assertLess(job.run_after, before + timedelta(seconds=delay + 5))
+			self.assertIsNone(jobs.claim_next_job())
+			Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+		jobs.claim_next_job()
+		job = jobs.execute_job(job.pk)
+		self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 3))
+
+	def test_successful_job_is_done(self):
+		job = jobs.enqueue("noop", 1)
+		jobs.claim_next_job()
+		job = jobs.execute_job(job.pk)
+		self.assertEqual(job.status, Job.Status.DONE)
+		self.assertIsNotNone(job.duration_ms)
+
+	def test_purge_deletes_only_old_done_jobs(self):
+		old_done = jobs.enqueue("noop", 1)
+		new_done = jobs.enqueue("noop", 2)
+		old_failed = jobs.enqueue("noop", 3)
+		queued = jobs.enqueue("noop", 4)
+		long_ago = timezone.now() - timedelta(hours=2)
+		Job.objects.filter(pk=old_done.pk).update(status=Job.Status.DONE, finished_at=long_ago)
+		Job.objects.filter(pk=new_done.pk).update(status=Job.Status.DONE, finished_at=timezone.now())
+		Job.objects.filter(pk=old_failed.pk).update(status=Job.Status.FAILED, finished_at=long_ago)
+		self.assertEqual(jobs.purge_finished_jobs(), 1)
+		self.assertEqual(
+			set(Job.objects.values_list("pk", flat=True)), {new_done.pk, old_failed.pk, queued.pk},
+		)
+
+
+class ContentChangeTests(ChecklistFixture):
+	def test_autosave_marks_stale_without_queueing_a_rebuild(self):
+		client = logged_in(self.engineer)
+		for answer in ("a", "b", "c"):
+			client.post(
+				f"/checklist/{self.checklist.id}/autosave/",
+				json.dumps({"row": "5", "answer": answer}),
+				content_type="application/json",
+			)
+		self.checklist.refresh_from_db()
+		self.assertEqual(self.checklist.content_version, 3)
+		self.assertFalse(Job.objects.exists())
+
+
+class MediaFixture(ChecklistFixture):
+	"""ChecklistFixture with MEDIA_ROOT in a throwaway folder."""
+
+	def setUp(self):
+		media_root = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+		media = override_settings(MEDIA_ROOT=media_root)
+		media.enable()
+		self.addCleanup(media.disable)
+		super().setUp()
+
+
+@override_settings(UPLOAD_CHUNK_SIZE=1024)
+class ResumableZipUploadTests(MediaFixture):
+	def upload_zip(self, client: Client, data: bytes, during_hash=None) -> dict:
+		session = client.post(
+			f"/checklist/{self.checklist.id}/uploads/",
+			json.dumps({"kind": "zip", "filename": "Site.zip", "size": len(data)}),
+			content_type="application/json",
+		).json()
+		for first in range(0, len(data), 1024):
+			last = min(first + 1024, len(data)) - 1
+			response = client.put(
+				session["url"], data[first:last + 1], content_type="application/octet-stream",
+				HTTP_CONTENT_RANGE=f"bytes {first}-{last}/{len(data)}",
+			)
+			self.assertEqual(response.status_code, 200)
+
+		file_sha256 = uploads.file_sha256
+
+		def slow_hash(name):
+			if during_hash:
+				during_hash()
+			return file_sha256(name)
+
+		with mock.patch.object(uploads, "file_sha256", slow_hash):
+			response = client.post(
+				session["finish_url"], json.dumps({"sha256": hashlib.sha256(data).hexdigest()}),
+				content_type="application/json",
+			)
+		self.assertEqual(response.status_code, 200)
+		return response.json()["zip"]
+
+	def test_answers_saved_while_hashing_are_kept(self):
+		client = logged_in(self.engineer)
+
+		def autosave():
+			client.post(
+				f"/checklist/{self.checklist.id}/autosave/",
+				json.dumps({"row": "5", "answer": "saved meanwhile"}), content_type="application/json",
+			)
+
+		zip_info = self.upload_zip(client, os.urandom(3000), during_hash=autosave)
+		self.checklist.refresh_from_db()
+		self.assertEqual(self.checklist.answer_data["5"], "saved meanwhile")
+		self.assertEqual(self.checklist.answer_data["zip_upload"]["path"], zip_info["path"])
+		# The autosave marks the workbook stale; the archive does not
+		self.assertEqual(self.checklist.content_version, 1)
+
+	def test_new_archive_replaces_the_old_one(self):
+		client = logged_in(self.engineer)
+		first = self.upload_zip(client, os.urandom(2000))
+		data = os.urandom(2500)
+		second = self.upload_zip(client, data)
+		self.assertNotEqual(first["path"], second["path"])
+		self.assertFalse(default_storage.exists(first["path"]))
+		with default_storage.open(second["path"], "rb") as handle:
+			self.assertEqual(handle.read(), data)
+
+
+def jpeg_bytes(width: int = 640, height: int = 480, quality: int = 95, **options) -> bytes:
+	output = io.BytesIO()
+	PilImage.effect_noise((width, height), 40).convert("RGB").save(output, format="JPEG", quality=quality, **options)
+	return output.getvalue()
+
+
+class PhotoBlobTests(MediaFixture):
+	def setUp(self):
+		super().setUp()
+		self.client = logged_in(self.engineer)
+		self.photo = jpeg_bytes()
+
+	def upload(self, row: int, checklist=None, data=None) -> dict:
+		checklist = checklist or self.checklist
+		response = self.client.post(
+			f"/checklist/{checklist.id}/upload-image/",
+			{"row": str(row), "images": [SimpleUploadedFile("photo.jpg", data or self.photo)]},
+		)
+		self.assertEqual(response.status_code, 200)
+		return response.json()
+
+	def remove(self, row: int, image_name: str, checklist=None):
+		checklist = checklist or self.checklist
+		self.assertTrue(checklist.remove_image(row, image_name))
+
+	def blob(self) -> PhotoBlob:
+		return PhotoBlob.objects.get()
+
+	def test_same_photo_in_two_rows_is_stored_once(self):
+		first = self.upload(23)["new_images"]
+		second = self.upload(24)["new_images"]
+		self.assertEqual(first, second)
+		blob = self.blob()
+		self.assertEqual(blob.ref_count, 2)
+		self.assertEqual(blob.source_sha256, hashlib.sha256(self.photo).hexdigest())
+		self.assertTrue(blob.file.startswith(f"photos/{blob.sha256[:2]}/{blob.sha256[2:4]}/"))
+
+	def test_photo_sent_again_to_the_same_row_is_not_added(self):
+		self.upload(23)
+		response = self.upload(23)
+		self.assertEqual(response["images"], response["new_images"])
+		self.assertEqual(self.checklist.images.count(), 1)
+		self.assertEqual(self.blob().ref_count, 1)
+
+	def test_file_is_deleted_with_the_last_reference(self):
+		image_name = self.upload(23)["new_images"][0]
+		self.upload(24)
+		with self.captureOnCommitCallbacks(execute=True):
+			self.remove(23, image_name)
+		self.assertEqual(self.blob().ref_count, 1)
+		self.assertTrue(default_storage.exists(image_name))
+		with self.captureOnCommitCallbacks(execute=True):
+			self.remove(24, image_name)
+		self.assertFalse(PhotoBlob.objects.exists())
+		self.assertFalse(default_storage.exists(image_name))
+
+	def test_deleting_a_checklist_releases_its_references(self):
+		other = Checklist.objects.create(user=self.engineer, project=self.project, site_id="S2")
+		image_name = self.upload(23)["new_images"][0]
+		self.upload(23, checklist=other)
+		with self.captureOnCommitCallbacks(execute=True):
+			self.checklist.delete()
+		self.assertEqual(self.blob().ref_count, 1)
+		self.assertTrue(default_storage.exists(image_name))
+
+	def test_upload_during_a_pending_delete_keeps_the_blob(self):
+		image_name = self.upload(23)["new_images"][0]
+		# The delete commits, but its cleanup has not run yet when the same photo comes in again
+		with self.captureOnCommitCallbacks() as cleanups:
+			self.remove(23, image_name)
+		self.assertEqual(self.blob().ref_count, 0)
+		self.assertEqual(self.upload(24)["new_images"], [image_name])
+		for cleanup in cleanups:
+			cleanup()
+		self.assertEqual(self.blob().ref_count, 1)
+		self.assertTrue(default_storage.exists(image_name))
+
+	def test_photo_is_stored_again_after_its_blob_was_deleted(self):
+		image_name = self.upload(23)["new_images"][0]
+		with self.captureOnCommitCallbacks(execute=True):
+			self.remove(23, image_name)
+		self.assertFalse(default_storage.exists(image_name))
+		self.assertEqual(self.upload(23)["new_images"], [image_name])
+		self.assertEqual(self.blob().ref_count, 1)
+		self.assertTrue(default_storage.exists(image_name))
+
+	def test_upload_builds_only_the_excel_rendition(self):
+		image_name = self.upload(23)["new_images"][0]
+		renditions = os.path.join(os.path.dirname(default_storage.path(image_name)), RENDITION_DIR)
+		self.assertEqual(os.listdir(renditions), [os.path.basename(rendition_name(image_name, "excel"))])
+
+	def test_delete_if_unused_keeps_referenced_blobs(self):
+		self.upload(23)
+		blob = self.blob()
+		PhotoBlob.objects.filter(pk=blob.pk).update(ref_count=0)
+		PhotoBlob.delete_if_unused(blob.pk)
+		self.assertTrue(PhotoBlob.objects.filter(pk=blob.pk).exists())
+		self.assertTrue(default_storage.exists(blob.file))
+
+
+def camera_exif() -> bytes:
+	"""EXIF as a phone writes it: camera make, body serial number and a GPS position."""
+	exif = PilImage.Exif()
+	exif[0x010F] = "Camera"
+	exif[0x8769] = {0xA431: "SN123"}
+	exif[0x8825] = {1: "N", 2: (24.0, 42.0, 0.0)}
+	return exif.tobytes()
+
+
+def webp_bytes(width: int = 640, height: int = 480, quality: int = 95, **options) -> bytes:
+	output = io.BytesIO()
+	PilImage.effect_noise((width, height), 40).convert("RGB").save(output, format="WEBP", quality=quality, **options)
+	return output.getvalue()
+
+
+@override_settings(PHOTO_MAX_EDGE=800, PHOTO_FORMAT="JPEG", PHOTO_QUALITY=82)
+class IngestPhotoTests(TestCase):
+	def assertNoMetadata(self, content: bytes):
+		with PilImage.open(io.BytesIO(content)) as image:
+			self.assertEqual(dict(image.getexif()), {})
+			self.assertNotIn("xmp", image.info)
+		self.assertNotIn(b"SN123", content)
+
+	def assertSamePixels(self, first: bytes, second: bytes):
+		with PilImage.open(io.BytesIO(first)) as image, PilImage.open(io.BytesIO(second)) as other:
+			self.assertEqual(image.tobytes(), other.tobytes())
+
+	def test_upload_that_would_grow_is_kept_as_is(self):
+		data = jpeg_bytes(quality=30)
+		photo = ingest_photo(data)
+		self.assertEqual(photo.content, data)
+		self.assertEqual(photo.sha256, hashlib.sha256(data).hexdigest())
+		self.assertEqual(photo.extension, ".jpg")
+		self.assertEqual(photo.bytes_saved, 0)
+
+	def test_kept_upload_loses_its_metadata_but_not_its_pixels_or_profile(self):
+		icc_profile = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+		data = jpeg_bytes(quality=30, exif=camera_exif(), icc_profile=icc_profile)
+		photo = ingest_photo(data)
+		self.assertLess(len(photo.content), len(data))
+		self.assertNoMetadata(photo.content)
+		self.assertSamePixels(photo.content, data)
+		with PilImage.open(io.BytesIO(photo.content)) as image:
+			self.assertEqual(image.info.get("icc_profile"), icc_profile)
+		self.assertEqual(photo.sha256, hashlib.sha256(photo.content).hexdigest())
+
+	def test_reencoded_upload_loses_its_metadata(self):
+		data = jpeg_bytes(exif=camera_exif())
+		photo = ingest_photo(data)
+		self.assertLess(len(photo.content), len(data))
+		self.assertNoMetadata(photo.content)
+
+	@override_settings(PHOTO_FORMAT="WEBP")
+	def test_kept_webp_loses_its_metadata(self):
+		data = webp_bytes(quality=30, exif=camera_exif())
+		photo = ingest_photo(data)
+		self.assertEqual(photo.extension, ".webp")
+		self.assertNoMetadata(photo.content)
+		self.assertSamePixels(photo.content, data)
+
+	def test_upload_in_another_format_is_converted_to_photo_format(self):
+		photo = ingest_photo(webp_bytes(quality=30, exif=camera_exif()))
+		self.assertEqual(photo.extension, ".jpg")
+		self.assertTrue(photo.content.startswith(b"\xff\xd8"))
+		self.assertNoMetadata(photo.content)
+
+	def test_large_upload_is_reencoded(self):
+		data = jpeg_bytes()
+		photo = ingest_photo(data)
+		self.assertLess(len(photo.content), len(data))
+		self.assertEqual(photo.bytes_saved, len(data) - len(photo.content))
+
+	def test_upload_larger_than_the_max_edge_is_shrunk(self):
+		photo = ingest_photo(jpeg_bytes(1600, 1200, quality=30))
+		self.assertEqual((photo.width, photo.height), (800, 600))
+		self.assertGreaterEqual(photo.bytes_saved, 0)
+
+	def test_rotated_upload_is_turned_upright(self):
+		exif = PilImage.Exif()
+		exif[EXIF_ORIENTATION] = 6
+		data = jpeg_bytes(quality=30, exif=exif.tobytes())
+		photo = ingest_photo(data)
+		self.assertNotEqual(photo.content, data)
+		self.assertEqual((photo.width, photo.height), (480, 640))
+		self.assertGreaterEqual(photo.bytes_saved, 0)
+
+	def test_png_is_always_reencoded(self):
+		output = io.BytesIO()
+		PilImage.new("RGB", (64, 64), (200, 30, 30)).save(output, format="PNG")
+		photo = ingest_photo(output.getvalue())
+		self.assertEqual(photo.extension, ".jpg")
+		self.assertTrue(photo.content.startswith(b"\xff\xd8"))
+		self.assertGreaterEqual(photo.bytes_saved, 0)
+
+
+class TemplateParserTests(TestCase):
+	def setUp(self):
+		directory = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+		self.path = os.path.join(directory, "template.xlsx")
+
+	def write_template(self, inline_rows: dict):
+		"""A template of shared-string questions, plus inline-string questions in column B of inline_rows."""
+		workbook = Workbook()
+		worksheet = workbook.active
+		for row in range(4, 19):
+			worksheet[f"A{row}"] = f"General {row}"
+		for row in range(22, 40):
+			worksheet[f"B{row}"] = f"Photo {row}"
+		workbook.save(self.path)
+
+		with zipfile.ZipFile(self.path) as archive:
+			parts = {name: archive.read(name) for name in archive.namelist()}
+		# openpyxl only writes shared strings, so the inline cells are added to the XML
+		inline = "".join(
+			f'<row r="{row}"><c r="B{row}" t="inlineStr"><is><t>{text}</t></is></c></row>'
+			for row, text in sorted(inline_rows.items())
+		)
+		sheet = parts["xl/worksheets/sheet1.xml"].decode()
+		parts["xl/worksheets/sheet1.xml"] = sheet.replace("</sheetData>", inline + "</sheetData>").encode()
+		with zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED) as archive:
+			for name, data in parts.items():
+				archive.writestr(name, data)
+
+	def test_inline_digit_strings_are_not_shared_string_indexes(self):
+		self.write_template({45: "12", 46: "Inline question"})
+		layout = parse_template_questions(self.path)
+		self.assertEqual(layout, parse_template_questions_openpyxl(self.path))
+		image_questions = {question["row"]: question["text"] for question in layout[1]}
+		self.assertEqual(image_questions[45], "12")
+		self.assertEqual(image_questions[46], "Inline question")
+
+
+class StatusCountTests(ChecklistFixture):
+	def counts(self) -> dict:
+		rows = StatusCount.objects.exclude(count=0).values_list("kind", "project_id", "user_id", "status", "count")
+		return {row[:4]: row[4] for row in rows}
+
+	def assertMatchesRebuild(self):
+		counts = self.counts()
+		StatusCount.rebuild()
+		self.assertEqual(counts, self.counts())
+
+	def test_counts_follow_create_status_change_reassign_and_delete(self):
+		other_engineer = make_user("eng2", Profile.Roles.ENGINEER, self.project, "Eng2")
+		work = WorkAssignment.objects.create(
+			site_id="W1", latitude=1, longitude=1, description="", project=self.project,
+			assigned_to=self.engineer, assigned_by=self.team_lead,
+		)
+		self.assertMatchesRebuild()
+		self.checklist.status = Checklist.Status.SUBMITTED
+		self.checklist.save()
+		work.status = WorkAssignment.Status.IN_PROGRESS
+		work.save(update_fields=["status"])
+		self.assertMatchesRebuild()
+		self.checklist.user = other_engineer
+		self.checklist.project = self.other_project
+		self.checklist.save(update_fields=["user", "project"])
+		work.assigned_to = other_engineer
+		work.save()
+		self.assertMatchesRebuild()
+		self.checklist.delete()
+		work.delete()
+		self.assertMatchesRebuild()
+		self.assertEqual(self.counts(), {})
+
+	def test_transitions_from_a_stale_copy_count_the_stored_status(self):
+		Checklist.objects.filter(pk=self.checklist.pk).update(status=Checklist.Status.SUBMITTED)
+		StatusCount.rebuild()
+		# The engineer's submit and the team lead's review both loaded SUBMITTED
+		submitted, reviewed = Checklist.objects.get(pk=self.checklist.pk), Checklist.objects.get(pk=self.checklist.pk)
+		submitted.status = Checklist.Status.REVIEW
+		submitted.save(update_fields=["status"])
+		reviewed.status = Checklist.Status.FINAL
+		reviewed.save(update_fields=["status"])
+		self.assertMatchesRebuild()
+		stale = Checklist.objects.only("id", "project_id", "user_id", "status").get(pk=self.checklist.pk)
+		Checklist.objects.filter(pk=self.checklist.pk).update(status=Checklist.Status.DRAFT)
+		StatusCount.rebuild()
+		stale.delete()
+		self.assertEqual(self.counts(), {})
+
+
+class LocationAssignmentTests(ChecklistFixture):
+	def setUp(self):
+		super().setUp()
+		for name in ("W1", "W2"):
+			GeoLocation.objects.create(name=name, latitude=1, longitude=1, project=self.project, created_by=self.team_lead)
+		with self.captureOnCommitCallbacks(execute=True):
+			self.work = WorkAssignment.objects.create(
+				site_id="W1", latitude=1, longitude=1, description="", project=self.project,
+				assigned_to=self.engineer, assigned_by=self.team_lead,
+			)
+
+	def assigned(self) -> set:
+		return set(GeoLocation.objects.filter(is_assigned=True).values_list("name", flat=True))
+
+	def test_assigning_work_takes_the_location(self):
+		self.assertEqual(self.assigned(), {"W1"})
+
+	def test_moving_work_to_another_site_frees_the_old_location(self):
+		work = WorkAssignment.objects.get(pk=self.work.pk)
+		work.site_id = "W2"
+		with self.captureOnCommitCallbacks(execute=True):
+			work.save()
+		self.assertEqual(self.assigned(), {"W2"})
+
+	def test_deleting_the_assignee_frees_the_location(self):
+		with self.captureOnCommitCallbacks(execute=True):
+			self.engineer.delete()
+		self.assertFalse(WorkAssignment.objects.exists())
+		self.assertEqual(self.assigned(), set())
+
+	def test_deleting_the_project_frees_the_location(self):
+		GeoLocation.objects.update(project=None)
+		with self.captureOnCommitCallbacks(execute=True):
+			self.project.delete()
+		self.assertEqual(self.assigned(), set())
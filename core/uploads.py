@@ -0,0 +1,86 @@
+"""
+Resumable, chunked uploads of site ZIP archives and photos.
+
+A dropped connection on a cellular link used to restart a 100 MB archive
+from zero. Instead, the client:
+1. POSTs the file's name, size and kind to checklist_upload_start, which
+   reserves the file's storage name and returns an UploadSession
+2. PUTs the file in chunks of at most UPLOAD_CHUNK_SIZE bytes, each with a
+   `Content-Range: bytes <first>-<last>/<size>` header; after a drop it GETs
+   the session to learn how many bytes arrived and continues from there
+3. POSTs the SHA-256 of the whole file to checklist_upload_finish, which
+   checks it against the stored bytes before the file is used
+
+Each chunk is streamed from the request straight into the reserved file at
+its offset: a ZIP is assembled at its final name in checklist_zips/, with
+no temp file and no copy. A photo is assembled under uploads/ and handed to
+the photo ingestion (core.ingest) on finish, so it ends up in the
+content-addressed store like any other upload.
+"""
+import hashlib
+import os
+import re
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+COPY_BUFFER_SIZE = 64 * 1024
+
+_CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class IncompleteChunk(ValueError):
+	"""The request body ended before the bytes its Content-Range announced."""
+
+
+def chunk_size() -> int:
+	"""Chunk size clients are told to use; also the largest chunk accepted."""
+	return int(getattr(settings, "UPLOAD_CHUNK_SIZE", 4 * 1024 * 1024))
+
+
+def max_bytes(kind: str) -> int:
+	limits = getattr(settings, "UPLOAD_MAX_BYTES", {})
+	return int(limits.get(kind, 100 * 1024 * 1024))
+
+
+def parse_content_range(header: str) -> tuple:
+	"""(first, last, total) byte positions of a `bytes first-last/total` header."""
+	match = _CONTENT_RANGE.match(header.strip())
+	if not match:
+		raise ValueError("Content-Range must be 'bytes <first>-<last>/<size>'")
+	first, last, total = (int(value) for value in match.groups())
+	if last < first or last >= total:
+		raise ValueError("Content-Range is out of bounds")
+	return first, last, total
+
+
+def reserve(name: str) -> str:
+	"""Create an empty file at name, or at a free variant of it; returns the name used."""
+	return default_storage.save(name, ContentFile(b""))
+
+
+def write_chunk(name: str, offset: int, stream, length: int):
+	"""Copy length bytes from stream into the stored file name, starting at offset."""
+	remaining = length
+	with open(default_storage.path(name), "r+b") as handle:
+		handle.seek(offset)
+		while remaining:
+			data = stream.read(min(COPY_BUFFER_SIZE, remaining))
+			if not data:
+				raise IncompleteChunk(f"Chunk ended {remaining} bytes early")
+			handle.write(data)
+			remaining -= len(data)
+
+
+def file_sha256(name: str) -> str:
+	digest = hashlib.sha256()
+	with open(default_storage.path(name), "rb") as handle:
+		for data in iter(lambda: handle.read(COPY_BUFFER_SIZE), b""):
+			digest.update(data)
+	return digest.hexdigest()
+
+
+def discard(name: str):
+	if name and os.path.exists(default_storage.path(name)):
+		default_storage.delete(name)
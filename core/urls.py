@@ -7,9 +7,14 @@ urlpatterns = [
     path("login/", views.login_view, name="login"),
     path("logout/", views.logout_view, name="logout"),
     path("devadmin/", views.dev_admin_view, name="dev_admin"),
+    path("devadmin/cache-stats/", views.admin_cache_stats, name="admin_cache_stats"),
     path("devadmin/users/<int:user_id>/edit/", views.admin_user_edit, name="admin_user_edit"),
     path("devadmin/users/<int:user_id>/delete/", views.admin_user_delete, name="admin_user_delete"),
     path("devadmin/locked/<int:profile_id>/unlock/", views.admin_user_unlock, name="admin_user_unlock"),
+    path("dashboard/rows/<str:table>/", views.dashboard_rows, name="dashboard_rows"),
+    path("dashboard/tabs/<str:tab>/", views.dashboard_tab, name="dashboard_tab"),
+    path("dashboard/checklists/<int:checklist_id>/modal/", views.dashboard_checklist_modal, name="dashboard_checklist_modal"),
+    path("dashboard/work/<int:work_id>/<str:kind>/", views.dashboard_work_modal, name="dashboard_work_modal"),
     path("<str:path>/", views.user_dashboard, name="user_dashboard"),
     path("<str:path>/checklists/new/", views.engineer_checklist_new, name="engineer_checklist_new"),
     path("<str:path>/checklists/<int:checklist_id>/", views.engineer_checklist_edit, name="engineer_checklist_edit"),
@@ -40,6 +45,7 @@ urlpatterns = [
     ),
     path("locations/add/", views.location_add, name="location_add"),
     path("locations/import/", views.location_import, name="location_import"),
+    path("locations/options/", views.location_options, name="location_options"),
     path("locations/delete-all/", views.location_delete_all, name="location_delete_all"),
     path("locations/<int:location_id>/delete/", views.location_delete, name="location_delete"),
     path("work/assign/", views.assign_work, name="assign_work"),
@@ -53,11 +59,21 @@ urlpatterns = [
     path("checklist/<int:checklist_id>/detail/", views.checklist_detail_view, name="checklist_detail"),
     path("checklist/<int:checklist_id>/data/", views.checklist_data_api, name="checklist_data_api"),
     path("checklist/<int:checklist_id>/autosave/", views.checklist_autosave_api, name="checklist_autosave_api"),
+    path("checklist/<int:checklist_id>/autosave/batch/", views.checklist_autosave_batch_api, name="checklist_autosave_batch_api"),
     path("checklist/<int:checklist_id>/submit/", views.checklist_submit, name="checklist_submit"),
     path("checklist/<int:checklist_id>/upload-image/", views.checklist_upload_image, name="checklist_upload_image"),
     path("checklist/<int:checklist_id>/upload-zip/", views.checklist_upload_zip, name="checklist_upload_zip"),
+    path("checklist/<int:checklist_id>/uploads/", views.checklist_upload_start, name="checklist_upload_start"),
+    path("uploads/<uuid:upload_id>/", views.checklist_upload_chunk, name="checklist_upload_chunk"),
+    path("uploads/<uuid:upload_id>/finish/", views.checklist_upload_finish, name="checklist_upload_finish"),
+    path(
+        "checklist/<int:checklist_id>/photos/<int:size>/<str:version>/<path:image_name>",
+        views.checklist_photo_thumbnail,
+        name="checklist_photo_thumbnail",
+    ),
     path("checklist/image/delete/", views.checklist_delete_image, name="checklist_delete_image"),
     path("checklist/<int:checklist_id>/download-zip/", views.checklist_download_zip, name="checklist_download_zip"),
+    path("checklist/<int:checklist_id>/download-photos/", views.checklist_download_photos, name="checklist_download_photos"),
     path("checklist/equipment/<int:equipment_id>/delete/", views.checklist_delete_equipment, name="checklist_delete_equipment"),
     path("checklist/electrical/<int:electrical_id>/delete/", views.checklist_delete_electrical, name="checklist_delete_electrical"),
 ]
\ No newline at end of file
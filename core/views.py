@@ -1,24 +1,52 @@
+import hashlib
+import json
 import os
-import zipfile
-from io import BytesIO
+import re
+import uuid
+from datetime import timedelta
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
+from django.core.files import File
 from django.core.files.storage import default_storage
-from django.db import models, IntegrityError
-from django.http import FileResponse, Http404, JsonResponse
+from django.db import models, IntegrityError, transaction
+from django.db.models.functions import Greatest
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.shortcuts import redirect, render
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, quote_etag
 from django.utils.text import slugify
 from django.views.decorators.http import require_http_methods
 from openpyxl import load_workbook
 from openpyxl.drawing.image import Image as ExcelImage
 from openpyxl.utils import get_column_letter
-from PIL import Image as PilImage
 
-from .models import Checklist, Profile, Project, GeoLocation, WorkAssignment
+from . import uploads
+from .equipment import (
+	ELECTRICAL_FIRST_ROW, ELECTRICAL_MAX_ROWS, EQUIPMENT_BLOCKS, EQUIPMENT_FIELDS, electrical_rows,
+	parse_electrical_edit, parse_equipment_edit, tower_equipment_rows, upsert_electrical_data, upsert_tower_equipment,
+)
+from .ingest import PhotoRejected, ingest_photo, ingest_photos, read_upload
+from .jobs import enqueue_checklist_rebuild
+from .models import (
+	AutosaveBatch, Checklist, Profile, Project, GeoLocation, PhotoBlob, StatusCount, UploadSession, WorkAssignment,
+)
+from .pagination import keyset_page, page_size
+from .photo_export import iter_photo_zip, photo_entries
+from .renditions import (
+	generate_renditions, rendition_path, thumbnail_path, thumbnail_version,
+)
+from .template_cache import (
+	IMAGE_SECTION_ROWS, cache_stats, get_template_prototype, read_template_questions, template_identity,
+)
+from .xlsx_writer import (
+	SheetPatch, XlsxPatchError, split_coordinate, worksheet_merged_anchor_index, write_patched_workbook,
+)
 
 
 def home_view(request):
@@ -242,17 +270,8 @@ def dev_admin_view(request):
 	users = User.objects.select_related("profile", "profile__project").filter(is_superuser=False).order_by("username")
 	projects = Project.objects.order_by("name")
 	
-	checklists = Checklist.objects.select_related("user", "user__profile", "project")
-	
-	# Apply filters
-	if status_filter:
-		checklists = checklists.filter(status=status_filter)
-	if user_filter:
-		checklists = checklists.filter(user_id=user_filter)
-	if search_query:
-		checklists = checklists.filter(site_id__icontains=search_query)
-	
-	checklists = checklists.order_by("-updated_at")
+	# First page of each table; "Load more" fetches the rest from dashboard_rows
+	checklists = keyset_page(_checklist_table(request), "updated_at", "", page_size(request))
 	
 	# Get all engineers for filter dropdown
 	engineers = User.objects.filter(
@@ -260,24 +279,13 @@ def dev_admin_view(request):
 	).order_by("username")
 	
 	locked_profiles = Profile.objects.select_related("user", "project").filter(is_locked=True).order_by("user__username")
-	user_stats = (
-		Checklist.objects.values("user__username")
-		.filter(status=Checklist.Status.FINAL)
-		.annotate(total=models.Count("id"))
-		.order_by("-total")
-	)
-	
-	# Get all locations that are NOT already assigned
-	assigned_site_ids = WorkAssignment.objects.values_list('site_id', flat=True)
-	locations = GeoLocation.objects.select_related("project", "created_by").exclude(
-		name__in=assigned_site_ids
-	).order_by("-created_at")
-	
-	# Get all work assignments
-	work_assignments = WorkAssignment.objects.select_related(
-		"assigned_to", "assigned_to__profile", "assigned_by", "project"
-	).order_by("-created_at")
+	user_stats = StatusCount.per_user(StatusCount.Kind.CHECKLIST, Checklist.Status.FINAL)
+	status_counts = {
+		"checklists": StatusCount.breakdown(StatusCount.Kind.CHECKLIST),
+		"work": StatusCount.breakdown(StatusCount.Kind.WORK),
+	}
 	
+	# The assign-work and geolocation tabs are loaded from dashboard_tab when opened
 	return render(
 		request,
 		"dashboards/dev_admin.html",
@@ -287,16 +295,23 @@ def dev_admin_view(request):
 			"checklists": checklists,
 			"locked_profiles": locked_profiles,
 			"user_stats": user_stats,
+			"status_counts": status_counts,
 			"engineers": engineers,
 			"status_filter": status_filter,
 			"user_filter": user_filter,
 			"search_query": search_query,
-			"locations": locations,
-			"work_assignments": work_assignments,
 		},
 	)
 
 
+@require_http_methods(["GET"])
+def admin_cache_stats(request):
+	"""Hit/miss counters of this worker's caches (admin only)."""
+	if not request.session.get("is_dev_admin"):
+		return JsonResponse({"status": "error", "message": "Permission denied"}, status=403)
+	return JsonResponse({"template_layouts": cache_stats(), "excel_builds": dict(_excel_build_stats)})
+
+
 @require_http_methods(["GET", "POST"])
 def admin_user_edit(request, user_id: int):
 	if not request.session.get("is_dev_admin"):
@@ -421,17 +436,7 @@ def _team_lead_dashboard(request, profile, path):
 	user_filter = request.GET.get("user", "")
 	search_query = request.GET.get("q", "").strip()
 	
-	checklists = Checklist.objects.select_related("user", "user__profile", "project").filter(project=profile.project)
-	
-	# Apply filters
-	if status_filter:
-		checklists = checklists.filter(status=status_filter)
-	if user_filter:
-		checklists = checklists.filter(user_id=user_filter)
-	if search_query:
-		checklists = checklists.filter(site_id__icontains=search_query)
-	
-	checklists = checklists.order_by("-updated_at")
+	checklists = keyset_page(_checklist_table(request, profile), "updated_at", "", page_size(request))
 	
 	# Get users in this project for filter dropdown
 	project_users = User.objects.filter(
@@ -439,32 +444,13 @@ def _team_lead_dashboard(request, profile, path):
 		profile__role=Profile.Roles.ENGINEER
 	).order_by("username")
 	
-	user_stats = (
-		Checklist.objects.values("user__username")
-		.filter(project=profile.project, status=Checklist.Status.FINAL)
-		.annotate(total=models.Count("id"))
-		.order_by("-total")
-	)
-	
-	# Get locations for team lead's project that are NOT already assigned
-	assigned_site_ids = WorkAssignment.objects.values_list('site_id', flat=True)
-	locations = GeoLocation.objects.select_related("project", "created_by").filter(
-		models.Q(project=profile.project) | models.Q(project__isnull=True)
-	).exclude(
-		name__in=assigned_site_ids
-	).order_by("-created_at")
-	
-	# Get work assignments for team lead's project
-	work_assignments = WorkAssignment.objects.select_related(
-		"assigned_to", "assigned_to__profile", "assigned_by", "project"
-	).filter(project=profile.project).order_by("-created_at")
+	user_stats = StatusCount.per_user(StatusCount.Kind.CHECKLIST, Checklist.Status.FINAL, project=profile.project)
+	status_counts = {
+		"checklists": StatusCount.breakdown(StatusCount.Kind.CHECKLIST, project=profile.project),
+		"work": StatusCount.breakdown(StatusCount.Kind.WORK, project=profile.project),
+	}
 	
-	# Get engineers in this project for assignment form
-	engineers = User.objects.filter(
-		profile__project=profile.project,
-		profile__role=Profile.Roles.ENGINEER
-	).order_by("username")
-
+	# The assign-work and geolocation tabs are loaded from dashboard_tab when opened
 	return render(
 		request,
 		"dashboards/team_lead.html",
@@ -473,13 +459,11 @@ def _team_lead_dashboard(request, profile, path):
 			"project": profile.project,
 			"checklists": checklists,
 			"user_stats": user_stats,
+			"status_counts": status_counts,
 			"project_users": project_users,
 			"status_filter": status_filter,
 			"user_filter": user_filter,
 			"search_query": search_query,
-			"locations": locations,
-			"work_assignments": work_assignments,
-			"engineers": engineers,
 		},
 	)
 
@@ -487,32 +471,15 @@ def _team_lead_dashboard(request, profile, path):
 def _engineer_dashboard(request, profile, path):
 	"""Engineer dashboard logic"""
 	query = request.GET.get("q", "").strip()
-	checklists = (
-		Checklist.objects.filter(user=request.user, project=profile.project)
-		.order_by("-updated_at")
-	)
-	if query:
-		checklists = checklists.filter(site_id__icontains=query)
 	
-	# Get work assignments for this engineer
+	# Checklists are provisioned when work is assigned, so this page only reads
 	my_work = WorkAssignment.objects.select_related(
-		"assigned_by", "project"
+		"assigned_by", "project", "checklist"
 	).filter(assigned_to=request.user).order_by("-created_at")
 
-	# Auto-create draft checklist for any assigned work without one
-	for work in my_work:
-		if not work.checklist:
-			answer_data = {"12": work.site_id}
-			checklist = Checklist.objects.create(
-				user=request.user,
-				project=work.project,
-				site_id=work.site_id,
-				status=Checklist.Status.DRAFT,
-				answer_data=answer_data,
-			)
-			work.checklist = checklist
-			work.save(update_fields=["checklist"])
-			_create_or_update_excel_copy(checklist)
+	checklists = keyset_page(
+		_checklist_table(request, profile), "updated_at", "", page_size(request)
+	)
 
 	return render(
 		request,
@@ -539,13 +506,12 @@ def team_lead_view(request, idx: int):
 		messages.error(request, "Access denied.")
 		return redirect("login")
 
-	checklists = Checklist.objects.select_related("user", "project").filter(project=profile.project).order_by("-updated_at")
-	user_stats = (
-		Checklist.objects.values("user__username")
-		.filter(project=profile.project, status=Checklist.Status.FINAL)
-		.annotate(total=models.Count("id"))
-		.order_by("-total")
-	)
+	checklists = keyset_page(_checklist_table(request, profile), "updated_at", "", page_size(request))
+	user_stats = StatusCount.per_user(StatusCount.Kind.CHECKLIST, Checklist.Status.FINAL, project=profile.project)
+	status_counts = {
+		"checklists": StatusCount.breakdown(StatusCount.Kind.CHECKLIST, project=profile.project),
+		"work": StatusCount.breakdown(StatusCount.Kind.WORK, project=profile.project),
+	}
 
 	projects = Project.objects.order_by("name")
 	return render(
@@ -556,6 +522,7 @@ def team_lead_view(request, idx: int):
 			"project": profile.project,
 			"checklists": checklists,
 			"user_stats": user_stats,
+			"status_counts": status_counts,
 			"projects": projects,
 		},
 	)
@@ -567,12 +534,9 @@ def engineer_view(request, idx: int):
 		return redirect_response
 
 	query = request.GET.get("q", "").strip()
-	checklists = (
-		Checklist.objects.filter(user=request.user, project=profile.project)
-		.order_by("-updated_at")
+	checklists = keyset_page(
+		_checklist_table(request, profile), "updated_at", "", page_size(request)
 	)
-	if query:
-		checklists = checklists.filter(site_id__icontains=query)
 
 	return render(
 		request,
@@ -587,6 +551,229 @@ def engineer_view(request, idx: int):
 	)
 
 
+def _checklist_table(request, profile=None):
+	"""
+	Checklists of a dashboard table with the status / user / q filters of the
+	request applied. profile is None for admins; a team lead sees their
+	project, an engineer their own checklists in it.
+	"""
+	checklists = Checklist.objects.select_related("user", "user__profile", "project", "comment_by")
+	if profile is not None:
+		checklists = checklists.filter(project=profile.project)
+		if profile.role == Profile.Roles.ENGINEER:
+			checklists = checklists.filter(user=profile.user)
+
+	status_filter = request.GET.get("status", "")
+	user_filter = request.GET.get("user", "")
+	search_query = request.GET.get("q", "").strip()
+	if status_filter:
+		checklists = checklists.filter(status=status_filter)
+	if user_filter:
+		try:
+			checklists = checklists.filter(user_id=int(user_filter))
+		except ValueError:
+			checklists = checklists.none()
+	if search_query:
+		checklists = checklists.filter(site_id__icontains=search_query)
+	return checklists
+
+
+def _work_assignment_table(profile=None):
+	work_assignments = WorkAssignment.objects.select_related(
+		"assigned_to", "assigned_to__profile", "assigned_by", "project", "checklist"
+	)
+	if profile is not None:
+		work_assignments = work_assignments.filter(project=profile.project)
+	return work_assignments
+
+
+def _location_table(request, profile=None):
+	"""Locations not assigned yet (for a team lead: their project's and shared ones), searched by ?location_q=."""
+	locations = GeoLocation.objects.select_related("project", "created_by").filter(is_assigned=False)
+	if profile is not None:
+		locations = locations.filter(models.Q(project=profile.project) | models.Q(project__isnull=True))
+	location_query = request.GET.get("location_q", "").strip()
+	if location_query:
+		locations = locations.filter(name__icontains=location_query)
+	return locations
+
+
+def _dashboard_access(request, roles=(Profile.Roles.TEAM_LEAD, Profile.Roles.ENGINEER)):
+	"""
+	(profile, None) when the request may see dashboard data, profile being
+	None for admins; (None, error response) otherwise.
+	"""
+	if request.session.get("is_dev_admin"):
+		return None, None
+	profile = getattr(request.user, "profile", None) if request.user.is_authenticated else None
+	if not profile or profile.role not in roles:
+		return None, JsonResponse({"status": "error", "message": "Permission denied"}, status=403)
+	return profile, None
+
+
+def _fragment_response(request, template: str, context: dict, version) -> HttpResponse:
+	"""
+	Render a dashboard fragment unless the browser already holds it. The ETag
+	combines version (ids and updated_at of what the fragment shows) with who
+	asks, as fragments carry the viewer's permissions and CSRF token. "no-cache"
+	makes the browser revalidate every time, so a 304 costs the version query
+	and nothing else.
+	"""
+	viewer = (request.user.pk, request.session.get("is_dev_admin"), request.META.get("CSRF_COOKIE"))
+	etag = quote_etag(hashlib.sha256(repr((viewer, version)).encode()).hexdigest()[:32])
+	response = get_conditional_response(request, etag=etag)
+	if response is None:
+		response = render(request, template, context)
+	response["ETag"] = etag
+	patch_cache_control(response, private=True, no_cache=True)
+	return response
+
+
+def _page_version(page, field: str):
+	return [(row.pk, getattr(row, field)) for row in page], page.next_cursor
+
+
+@require_http_methods(["GET"])
+def dashboard_rows(request, table: str):
+	"""
+	The page of a dashboard table after ?cursor=, as HTML rows, with the same
+	filters as the dashboard itself. The "Load more" buttons append these
+	without reloading the page.
+	"""
+	profile, denied = _dashboard_access(request)
+	if denied:
+		return denied
+	is_engineer = profile is not None and profile.role == Profile.Roles.ENGINEER
+	cursor = request.GET.get("cursor", "")
+	size = page_size(request)
+	context = {}
+
+	if table == "checklists":
+		page = keyset_page(_checklist_table(request, profile), "updated_at", cursor, size)
+		context["checklists"] = page
+		if is_engineer:
+			context.update(path=profile.path, rows_template="dashboards/_engineer_checklist_rows.html")
+		else:
+			context.update(show_project=profile is None, rows_template="dashboards/_checklist_rows.html")
+	elif table == "work" and not is_engineer:
+		page = keyset_page(_work_assignment_table(profile), "created_at", cursor, size)
+		context.update(work_assignments=page, rows_template="dashboards/_work_rows.html")
+	elif table == "locations" and not is_engineer:
+		page = keyset_page(_location_table(request, profile), "created_at", cursor, size)
+		context.update(locations=page, rows_template="dashboards/_location_rows.html")
+	else:
+		raise Http404("Unknown table")
+
+	context["page"] = page
+	return render(request, "dashboards/_table_page.html", context)
+
+
+@require_http_methods(["GET"])
+def dashboard_tab(request, tab: str):
+	"""
+	Body of the assign-work or geolocation tab, fetched the first time the tab
+	is opened instead of being rendered with every dashboard page.
+	"""
+	profile, denied = _dashboard_access(request, roles=(Profile.Roles.TEAM_LEAD,))
+	if denied:
+		return denied
+	size = page_size(request)
+	projects = Project.objects.order_by("name")
+	context = {"project": profile.project if profile else None, "projects": projects}
+
+	if tab == "assign-work":
+		engineers = User.objects.select_related("profile").filter(profile__role=Profile.Roles.ENGINEER)
+		if profile is not None:
+			engineers = engineers.filter(profile__project=profile.project)
+		engineers = list(engineers.order_by("username"))
+		work_assignments = keyset_page(_work_assignment_table(profile), "created_at", "", size)
+		context.update(engineers=engineers, work_assignments=work_assignments)
+		version = (
+			tab,
+			_page_version(work_assignments, "updated_at"),
+			[(work.checklist_id, work.checklist and work.checklist.updated_at) for work in work_assignments],
+			[(engineer.pk, engineer.username, engineer.profile.path) for engineer in engineers],
+			list(projects.values_list("pk", "name")),
+		)
+		template = "dashboards/_assign_work_tab.html"
+	elif tab == "geolocation":
+		locations = keyset_page(_location_table(request, profile), "created_at", "", size)
+		context.update(locations=locations, location_query=request.GET.get("location_q", "").strip())
+		version = (tab, _page_version(locations, "created_at"), list(projects.values_list("pk", "name")))
+		template = "dashboards/_geolocation_tab.html"
+	else:
+		raise Http404("Unknown tab")
+	return _fragment_response(request, template, context, version)
+
+
+@require_http_methods(["GET"])
+def dashboard_checklist_modal(request, checklist_id: int):
+	"""Review modal of one checklist, fetched when its Action button is clicked."""
+	profile, denied = _dashboard_access(request, roles=(Profile.Roles.TEAM_LEAD,))
+	if denied:
+		return denied
+	checklists = Checklist.objects.select_related("user", "project")
+	if profile is not None:
+		checklists = checklists.filter(project=profile.project)
+	checklist = get_object_or_404(checklists, pk=checklist_id)
+	return _fragment_response(
+		request,
+		"dashboards/_checklist_modal.html",
+		{"checklist": checklist, "show_project": profile is None},
+		("checklist", checklist.pk, checklist.updated_at),
+	)
+
+
+@require_http_methods(["GET"])
+def dashboard_work_modal(request, work_id: int, kind: str):
+	"""Detail or edit modal of one work assignment, fetched when its button is clicked."""
+	profile, denied = _dashboard_access(request, roles=(Profile.Roles.TEAM_LEAD,))
+	if denied:
+		return denied
+	work = get_object_or_404(_work_assignment_table(profile), pk=work_id)
+	if kind == "detail":
+		return _fragment_response(
+			request, "dashboards/_work_detail_modal.html", {"work": work}, ("work", work.pk, work.updated_at)
+		)
+	if kind != "edit":
+		raise Http404("Unknown modal")
+	engineers = User.objects.select_related("profile").filter(profile__role=Profile.Roles.ENGINEER)
+	if profile is not None:
+		engineers = engineers.filter(profile__project=profile.project)
+	engineers = list(engineers.order_by("username"))
+	return _fragment_response(
+		request,
+		"dashboards/_work_edit_modal.html",
+		{"work": work, "engineers": engineers},
+		("work-edit", work.pk, work.updated_at, [(engineer.pk, engineer.username, engineer.profile.path) for engineer in engineers]),
+	)
+
+
+@require_http_methods(["GET"])
+def location_options(request):
+	"""Unassigned sites matching ?q= for the assign-work Site ID picker, a page at a time."""
+	profile, denied = _dashboard_access(request, roles=(Profile.Roles.TEAM_LEAD,))
+	if denied:
+		return denied
+	locations = _location_table(request, profile).select_related(None).only("id", "name", "latitude", "longitude", "created_at")
+	query = request.GET.get("q", "").strip()
+	if query:
+		locations = locations.filter(name__icontains=query)
+	page = keyset_page(locations, "created_at", request.GET.get("cursor", ""), 30)
+	return JsonResponse({
+		"results": [
+			{
+				"id": location.name,
+				"text": f"{location.name} ({location.latitude}, {location.longitude})",
+				"lat": str(location.latitude),
+				"lng": str(location.longitude),
+			}
+			for location in page
+		],
+		"next_cursor": page.next_cursor,
+	})
+
+
 def engineer_checklist_new(request, path: str):
 	profile, redirect_response = _ensure_engineer_access(request, path)
 	if redirect_response:
@@ -597,9 +784,7 @@ def engineer_checklist_new(request, path: str):
 		messages.error(request, "Your project does not have a template file yet.")
 		return redirect("user_dashboard", path=path)
 
-	general_questions, image_questions, dc_power_questions, _site_id = _read_template_questions(project.template_file.path)
 	checklist = Checklist.objects.create(user=request.user, project=project)
-	_create_or_update_excel_copy(checklist)
 
 	return redirect("checklist_detail", checklist_id=checklist.id)
 
@@ -612,40 +797,11 @@ def engineer_checklist_edit(request, path: str, checklist_id: int):
 	profile = access.get("profile")
 	checklist = access["checklist"]
 	project = profile.project
-	
-	# Use checklist's own template copy if it exists, otherwise use project template
-	if checklist.template_copy:
-		template_path = checklist.template_copy.path
-	elif project.template_file:
-		template_path = project.template_file.path
-	else:
+
+	if not checklist.template_copy and not project.template_file:
 		messages.error(request, "Your project does not have a template file yet.")
 		return redirect("user_dashboard", path=path)
 
-	general_questions, image_questions, dc_power_questions, _site_id = _read_template_questions(template_path)
-
-	answers = checklist.answer_data or {}
-	remarks = checklist.remark_data or {}
-	images = checklist.image_data or {}
-
-	questions = [
-		{"row": q["row"], "text": q["text"], "value": answers.get(str(q["row"]), "")}
-		for q in general_questions
-	]
-	questions.extend([
-		{"row": q["row"], "text": q["text"], "value": answers.get(str(q["row"]), "")}
-		for q in dc_power_questions
-	])
-	image_questions = [
-		{
-			"row": q["row"],
-			"text": q["text"],
-			"remark": remarks.get(str(q["row"]), ""),
-			"images": images.get(str(q["row"]), []),
-		}
-		for q in image_questions
-	]
-
 	# Redirect to checklist_detail_view instead of using engineer_checklist_edit template
 	return redirect("checklist_detail", checklist_id=checklist_id)
 
@@ -661,7 +817,6 @@ def engineer_checklist_autosave(request, path: str, checklist_id: int):
 
 	answers = checklist.answer_data or {}
 	remarks = checklist.remark_data or {}
-	images = checklist.image_data or {}
 
 	for row in range(4, 19):
 		answers[str(row)] = request.POST.get(f"answer_{row}", "").strip()
@@ -674,21 +829,15 @@ def engineer_checklist_autosave(request, path: str, checklist_id: int):
 		remarks[str(row)] = request.POST.get(f"remark_{row}", "").strip()
 		upload_key = f"images_{row}"
 		if upload_key in request.FILES:
-			uploads = request.FILES.getlist(upload_key)
-			row_images = images.get(str(row), [])
-			for upload in uploads:
-				file_name = default_storage.save(_build_image_path(checklist, upload.name), upload)
-				row_images.append(file_name)
-			images[str(row)] = row_images
+			_store_photos(checklist, row, request.FILES.getlist(upload_key))
 
 	checklist.answer_data = answers
 	checklist.remark_data = remarks
-	checklist.image_data = images
-	update_fields = ["answer_data", "remark_data", "image_data", "updated_at"]
+	update_fields = ["answer_data", "remark_data", "updated_at"]
 	if site_id_value:
 		update_fields.append("site_id")
 	checklist.save(update_fields=update_fields)
-	_create_or_update_excel_copy(checklist)
+	checklist.mark_content_changed()
 
 	return JsonResponse({"status": "ok", "updated": True})
 
@@ -706,11 +855,7 @@ def engineer_checklist_delete(request, path: str, checklist_id: int):
 	if checklist.template_copy and default_storage.exists(checklist.template_copy.name):
 		default_storage.delete(checklist.template_copy.name)
 
-	for image_list in (checklist.image_data or {}).values():
-		for image_path in image_list:
-			if default_storage.exists(image_path):
-				default_storage.delete(image_path)
-
+	# Photo files are released with their ledger rows (see core.models.release_photo_file)
 	checklist.delete()
 	messages.success(request, "Checklist deleted.")
 	if access.get("back_path"):
@@ -732,6 +877,7 @@ def engineer_checklist_submit(request, path: str, checklist_id: int):
 
 	checklist.status = Checklist.Status.SUBMITTED
 	checklist.save(update_fields=["status", "updated_at"])
+	enqueue_checklist_rebuild(checklist)
 	
 	# Update linked work assignment status to SUBMITTED
 	try:
@@ -773,7 +919,7 @@ def checklist_review_update(request, checklist_id: int):
 				work_assignment = WorkAssignment.objects.get(checklist=checklist)
 				work_assignment.status = WorkAssignment.Status.COMPLETED
 				work_assignment.completed_at = timezone.now()
-				work_assignment.save(update_fields=["status", "completed_at"])
+				work_assignment.save(update_fields=["status", "completed_at", "updated_at"])
 			except WorkAssignment.DoesNotExist:
 				pass
 
@@ -784,6 +930,7 @@ def checklist_review_update(request, checklist_id: int):
 		checklist.save(update_fields=["status", "comment", "comment_by", "updated_at"])
 	else:
 		checklist.save(update_fields=["status", "updated_at"])
+	enqueue_checklist_rebuild(checklist)
 	messages.success(request, "Checklist updated.")
 	if access.get("back_path"):
 		return redirect(access["back_url"], path=access["back_path"])
@@ -795,8 +942,7 @@ def engineer_checklist_download(request, path: str, checklist_id: int):
 	if access["redirect"]:
 		return access["redirect"]
 	checklist = access["checklist"]
-	if not checklist.template_copy:
-		_create_or_update_excel_copy(checklist)
+	_ensure_excel_copy(checklist)
 
 	if not checklist.template_copy or not default_storage.exists(checklist.template_copy.name):
 		raise Http404("Checklist file not found.")
@@ -879,357 +1025,149 @@ def _get_checklist_access(request, checklist_id: int, path: str | None = None):
 
 
 def _read_template_questions(template_path: str):
-	workbook = load_workbook(template_path)
-	worksheet = workbook.active
+	"""Question layout of a template workbook, served from the template cache."""
+	return read_template_questions(template_path)
 
-	# General section: rows 4-18, Questions in AB (merged), Answers in CDEF (merged)
-	general_questions = []
-	for row in range(4, 19):
-		text = worksheet[f"A{row}"].value or ""
-		if text and str(text).strip():
-			general_questions.append({"row": row, "text": str(text).strip()})
-
-	# All photo sections: Questions in B, Remarks in DE (merged), Images in F, G, H...
-	image_questions = []
-	# CIVIL & SITE GENERAL (rows 22-70)
-	for row in range(22, 71):
-		text = worksheet[f"B{row}"].value or ""
-		if text and str(text).strip():
-			image_questions.append({"row": row, "text": str(text).strip()})
-	
-	# ELECTROMECHANICAL (rows 73-84)
-	for row in range(73, 85):
-		text = worksheet[f"B{row}"].value or ""
-		if text and str(text).strip():
-			image_questions.append({"row": row, "text": str(text).strip()})
-	
-	# Power Supply (rows 87-96)
-	for row in range(87, 97):
-		text = worksheet[f"B{row}"].value or ""
-		if text and str(text).strip():
-			image_questions.append({"row": row, "text": str(text).strip()})
-	
-	# DG/SG Set (rows 98-114)
-	for row in range(98, 115):
-		text = worksheet[f"B{row}"].value or ""
-		if text and str(text).strip():
-			image_questions.append({"row": row, "text": str(text).strip()})
-	
-	# Hybrid AC/DC (rows 116-125)
-	for row in range(116, 126):
-		text = worksheet[f"B{row}"].value or ""
-		if text and str(text).strip():
-			image_questions.append({"row": row, "text": str(text).strip()})
-	
-	# Solar (rows 127-133)
-	for row in range(127, 134):
-		text = worksheet[f"B{row}"].value or ""
-		if text and str(text).strip():
-			image_questions.append({"row": row, "text": str(text).strip()})
-	
-	# Transformer (rows 135-142)
-	for row in range(135, 143):
-		text = worksheet[f"B{row}"].value or ""
-		if text and str(text).strip():
-			image_questions.append({"row": row, "text": str(text).strip()})
-	
-	# Service Disconnect (rows 144-151)
-	for row in range(144, 152):
-		text = worksheet[f"B{row}"].value or ""
-		if text and str(text).strip():
-			image_questions.append({"row": row, "text": str(text).strip()})
-	
-	# SHAREABLE MDB/LDB (rows 153-160)
-	for row in range(153, 161):
-		text = worksheet[f"B{row}"].value or ""
-		if text and str(text).strip():
-			image_questions.append({"row": row, "text": str(text).strip()})
-	
-	# SHELTER/ODU (rows 163-181)
-	for row in range(163, 182):
-		text = worksheet[f"B{row}"].value or ""
-		if text and str(text).strip():
-			image_questions.append({"row": row, "text": str(text).strip()})
-	
-	# Extra (rows 184-185)
-	for row in range(184, 186):
-		text = worksheet[f"B{row}"].value or ""
-		if text and str(text).strip():
-			image_questions.append({"row": row, "text": str(text).strip()})
-
-	# DC Power System Data (rows 187-193): Labels in AB (merged), Values in DEF (merged)
-	dc_power_questions = []
-	for row in range(187, 194):
-		text = worksheet[f"A{row}"].value or ""
-		if text and str(text).strip():
-			dc_power_questions.append({"row": row, "text": str(text).strip()})
-
-	site_id = worksheet["B12"].value or worksheet["A12"].value or ""
-	return general_questions, image_questions, dc_power_questions, str(site_id).strip()
-
-
-def _create_or_update_excel_copy(checklist: Checklist):
-	"""
-	Create or update Excel copy for checklist.
-	ALWAYS uses the current project template for new checklists.
-	"""
-	project = checklist.project
-	if not project or not project.template_file:
-		return
 
-	# ALWAYS start from the project template to avoid duplicate images
-	# This ensures we have a clean slate each time
-	template_path = project.template_file.path
-	
-	workbook = load_workbook(template_path)
-	worksheet = workbook.active
-	# Add template images (logos, headers, etc.) from the original template
-	_add_template_images(worksheet, template_path)
-
-	def write_to_cell(ws, cell_ref, value):
-		"""Safely write to a cell, handling merged cells"""
-		from openpyxl.cell.cell import MergedCell
-		cell = ws[cell_ref]
-		if isinstance(cell, MergedCell):
-			# Find the top-left cell of the merged range
-			for merged_range in ws.merged_cells.ranges:
-				if cell.coordinate in merged_range:
-					top_left = merged_range.start_cell
-					ws[top_left.coordinate] = value
-					return
-		else:
-			ws[cell_ref] = value
+# Photos are embedded at 2.5" x 2" (240x192 pixels at 96 DPI)
+EXCEL_PHOTO_WIDTH_PX = 240
+EXCEL_PHOTO_HEIGHT_PX = 192
 
-	def copy_row_format(ws, source_row, target_row):
-		"""Copy formatting and merged cells from source row to target row"""
-		from copy import copy
-		from openpyxl.utils import get_column_letter
-		
-		# Copy cell formatting
-		for col in range(1, ws.max_column + 1):
-			source_cell = ws.cell(row=source_row, column=col)
-			target_cell = ws.cell(row=target_row, column=col)
-			
-			if source_cell.has_style:
-				target_cell.font = copy(source_cell.font)
-				target_cell.border = copy(source_cell.border)
-				target_cell.fill = copy(source_cell.fill)
-				target_cell.number_format = copy(source_cell.number_format)
-				target_cell.protection = copy(source_cell.protection)
-				target_cell.alignment = copy(source_cell.alignment)
-		
-		# Copy merged cells - check if source row has any merged cells
-		merged_cells_to_copy = []
-		for merged_range in list(ws.merged_cells.ranges):
-			if merged_range.min_row == source_row and merged_range.max_row == source_row:
-				# This is a merged cell in the source row
-				merged_cells_to_copy.append((merged_range.min_col, merged_range.max_col))
-		
-		# Apply merged cells to target row
-		for min_col, max_col in merged_cells_to_copy:
-			start_cell = f"{get_column_letter(min_col)}{target_row}"
-			end_cell = f"{get_column_letter(max_col)}{target_row}"
-			ws.merge_cells(f"{start_cell}:{end_cell}")
-	
-	def clear_row_style(ws, row):
-		"""Remove all formatting from row (fixes openpyxl auto-copy issue)"""
-		from openpyxl.styles import PatternFill
-		
-		for col in range(1, ws.max_column + 1):
-			cell = ws.cell(row=row, column=col)
-			cell.font = None
-			cell.border = None
-			cell.fill = PatternFill()  # Remove background color
-			cell.number_format = 'General'
-			cell.alignment = None
-			cell.protection = None
-	
-	def insert_clean_row(ws, template_row, insert_at):
-		"""Insert row like Excel and apply template format"""
-		# Step 1: Insert row
-		ws.insert_rows(insert_at)
-		# Step 2: Remove any merged ranges that shifted onto this row
-		template_merges = set()
-		for merged_range in list(ws.merged_cells.ranges):
-			if merged_range.min_row == template_row and merged_range.max_row == template_row:
-				template_merges.add((merged_range.min_col, merged_range.max_col))
-			elif merged_range.min_row <= insert_at <= merged_range.max_row:
-				try:
-					ws.unmerge_cells(str(merged_range))
-				except KeyError:
-					# Some cells may already be missing in openpyxl's internal map
-					pass
-		# Step 3: Clear auto-copied formatting
-		clear_row_style(ws, insert_at)
-		# Step 4: Copy correct format from template
-		copy_row_format(ws, template_row, insert_at)
 
+def _build_excel_patch(checklist: Checklist) -> SheetPatch:
+	"""Collect every cell, photo and dimension change a checklist makes to the template."""
+	patch = SheetPatch()
 	answers = checklist.answer_data or {}
+
 	# General section: Write answers to CDEF merged cells (rows 4-18)
 	for row in range(4, 19):
 		value = answers.get(str(row), "")
 		if value:
 			# CDEF is merged, so write to C (first column of merge)
-			write_to_cell(worksheet, f"C{row}", value)
+			patch.write(f"C{row}", value)
 
 	# DC Power System: Write values to DEF merged cells (rows 187-193)
 	for row in range(187, 194):
 		value = answers.get(str(row), "")
 		if value:
 			# DEF is merged, so write to D (first column of merge)
-			write_to_cell(worksheet, f"D{row}", value)
-
-	# Write tower equipment data to Excel
-	# Extract equipment data from answer_data
-	equipment_data = {}
-	electrical_data = {}
-	
-	# Debug: Print what we're extracting
-	import sys
-	print(f"\n=== DEBUG: Processing checklist {checklist.id} ===", file=sys.stderr)
-	print(f"Total answer_data keys: {len(answers)}", file=sys.stderr)
-	
-	for key, value in answers.items():
-		if key.startswith('equipment_'):
-			print(f"Found equipment key: {key}", file=sys.stderr)
-			print(f"Value: {value}", file=sys.stderr)
-			
-			operator = value.get('operator', '')
-			equip_type = value.get('type', '')
-			equip_info = value.get('data', {})
-			
-			if operator not in equipment_data:
-				equipment_data[operator] = {}
-			if equip_type not in equipment_data[operator]:
-				equipment_data[operator][equip_type] = []
-			equipment_data[operator][equip_type].append(equip_info)
-			
-		elif key.startswith('electrical_'):
-			row_num = int(key.replace('electrical_', ''))
-			electrical_data[row_num] = value
-	
-	print(f"Extracted equipment_data: {equipment_data}", file=sys.stderr)
-	print(f"Extracted electrical_data: {electrical_data}", file=sys.stderr)
-	
-	# Write equipment data to Excel (STATIC rows, no insert)
-	def _sorted_equipment_list(items):
-		return sorted(items, key=lambda x: int(x.get('position_index', 0) or 0))
-	
-	def _write_equipment_block(operator, equip_type, start_row, max_rows, col_map):
-		if operator not in equipment_data:
-			return
-		if equip_type not in equipment_data[operator]:
-			return
-		items = _sorted_equipment_list(equipment_data[operator][equip_type])[:max_rows]
-		for idx, equip in enumerate(items):
+			patch.write(f"D{row}", value)
+
+	# Write equipment data (STATIC rows, no insert); rows come ordered by position
+	equipment_data = tower_equipment_rows(checklist)
+	for operator, equip_type, start_row, max_rows, col_map in EQUIPMENT_BLOCKS:
+		items = equipment_data.get((operator, equip_type))
+		if not items:
+			continue
+		for idx, equip in enumerate(items[:max_rows]):
 			row = start_row + idx
-			if 'model' in col_map:
-				write_to_cell(worksheet, f"{col_map['model']}{row}", equip.get('model', ''))
-			if 'dimension' in col_map:
-				write_to_cell(worksheet, f"{col_map['dimension']}{row}", equip.get('dimension', ''))
-			if 'height' in col_map:
-				write_to_cell(worksheet, f"{col_map['height']}{row}", equip.get('height', ''))
-			if 'azimuth' in col_map:
-				write_to_cell(worksheet, f"{col_map['azimuth']}{row}", equip.get('azimuth', ''))
-			if 'empty_port' in col_map:
-				write_to_cell(worksheet, f"{col_map['empty_port']}{row}", equip.get('empty_port', ''))
-			if 'sector' in col_map:
-				write_to_cell(worksheet, f"{col_map['sector']}{row}", equip.get('sector', ''))
-
-	# STC columns: AB merged => A, C, D, E, F
-	_write_equipment_block('STC', 'ANTENNA', 198, 15, {
-		'model': 'A', 'dimension': 'C', 'height': 'D', 'azimuth': 'E', 'sector': 'F'
-	})
-	_write_equipment_block('STC', 'RADIO', 215, 15, {
-		'model': 'A', 'dimension': 'C', 'height': 'D', 'sector': 'E'
-	})
-	_write_equipment_block('STC', 'FPFH', 232, 15, {
-		'model': 'A', 'dimension': 'C', 'height': 'D', 'empty_port': 'E', 'sector': 'F'
-	})
-	_write_equipment_block('STC', 'MICROWAVE', 249, 9, {
-		'model': 'A', 'dimension': 'C', 'height': 'D', 'azimuth': 'E', 'sector': 'F'
-	})
-
-	# OTHER operator columns: IJ merged => I, K, L, M, N
-	_write_equipment_block('OTHER', 'ANTENNA', 198, 18, {
-		'model': 'I', 'dimension': 'K', 'height': 'L', 'azimuth': 'M', 'sector': 'N'
-	})
-	_write_equipment_block('OTHER', 'RADIO', 218, 18, {
-		'model': 'I', 'dimension': 'K', 'height': 'L', 'sector': 'M'
-	})
-	_write_equipment_block('OTHER', 'FPFH', 238, 18, {
-		'model': 'I', 'dimension': 'K', 'height': 'L', 'empty_port': 'M', 'sector': 'N'
-	})
-	_write_equipment_block('OTHER', 'MICROWAVE', 258, 9, {
-		'model': 'I', 'dimension': 'K', 'height': 'L', 'azimuth': 'M', 'sector': 'N'
-	})
+			for field in EQUIPMENT_FIELDS:
+				if field in col_map:
+					patch.write(f"{col_map[field]}{row}", equip.get(field, ''))
 
 	# Write electrical data (rows 261-263)
-	for row_num, elec in electrical_data.items():
-		if 261 <= row_num <= 263:
-			write_to_cell(worksheet, f"A{row_num}", elec.get('voltage', ''))
-			write_to_cell(worksheet, f"C{row_num}", elec.get('current_r', ''))
-			write_to_cell(worksheet, f"D{row_num}", elec.get('current_y', ''))
-			write_to_cell(worksheet, f"E{row_num}", elec.get('current_b', ''))
-			write_to_cell(worksheet, f"F{row_num}", elec.get('remarks', ''))
-	
+	for row_num, elec in electrical_rows(checklist).items():
+		if ELECTRICAL_FIRST_ROW <= row_num < ELECTRICAL_FIRST_ROW + ELECTRICAL_MAX_ROWS:
+			patch.write(f"A{row_num}", elec.get('voltage', ''))
+			patch.write(f"C{row_num}", elec.get('current_r', ''))
+			patch.write(f"D{row_num}", elec.get('current_y', ''))
+			patch.write(f"E{row_num}", elec.get('current_b', ''))
+			patch.write(f"F{row_num}", elec.get('remarks', ''))
+
 	remarks = checklist.remark_data or {}
 	images = checklist.image_data or {}
 	# Photo sections: Write remarks to DE merged cells and images starting from F
-	all_photo_rows = (list(range(22, 71)) + list(range(73, 85)) + list(range(87, 97)) + 
-	                  list(range(98, 115)) + list(range(116, 126)) + list(range(127, 134)) + 
-	                  list(range(135, 143)) + list(range(144, 152)) + list(range(153, 161)) + 
-	                  list(range(163, 182)) + list(range(184, 186)))
-	
-	for row in all_photo_rows:
-		remark = remarks.get(str(row), "")
-		if remark:
-			# DE is merged, so write to D (first column of merge)
-			write_to_cell(worksheet, f"D{row}", remark)
-
-		# Helper to fit image to cell size
-		def _cell_pixel_size(ws, row_idx, col_idx):
-			# Column width: approx pixels = width * 7 (Excel default)
-			col_letter = get_column_letter(col_idx)
-			col_dim = ws.column_dimensions.get(col_letter)
-			col_width = col_dim.width if col_dim and col_dim.width else 8.43
-			cell_width_px = int(col_width * 7)
-
-			# Row height: points to pixels (1 pt = 1.333 px)
-			row_dim = ws.row_dimensions.get(row_idx)
-			row_height = row_dim.height if row_dim and row_dim.height else 15
-			cell_height_px = int(row_height * 1.333)
-			return cell_width_px, cell_height_px
-
-		row_images = images.get(str(row), [])
-		column_index = 6  # Start from F column (column 6)
-		max_row_height_px = 0
-		for image_path in row_images:
-			if not default_storage.exists(image_path):
-				continue
-			abs_path = default_storage.path(image_path)
-			image = ExcelImage(abs_path)
-			# Set image size to exactly 2.5" x 2" (240x192 pixels at 96 DPI)
-			image.width = 2.5 * 96  # 2.5 inches = 240 pixels
-			image.height = 2 * 96    # 2 inches = 192 pixels
-			
-			img_w = image.width
-			img_h = image.height
-			
-			# Adjust column width to fit image
-			if img_w > 0:
-				col_letter = get_column_letter(column_index)
-				worksheet.column_dimensions[col_letter].width = max(
-					worksheet.column_dimensions[col_letter].width or 0,
-					img_w / 7,
-				)
-			if img_h > 0:
-				max_row_height_px = max(max_row_height_px, img_h)
-			cell = f"{get_column_letter(column_index)}{row}"
-			worksheet.add_image(image, cell)
-			column_index += 1
-		if max_row_height_px > 0:
-			worksheet.row_dimensions[row].height = max_row_height_px / 1.333
+	for start, stop in IMAGE_SECTION_ROWS:
+		for row in range(start, stop):
+			remark = remarks.get(str(row), "")
+			if remark:
+				# DE is merged, so write to D (first column of merge)
+				patch.write(f"D{row}", remark)
+
+			column_index = 6  # Start from F column (column 6)
+			has_images = False
+			for image_path in images.get(str(row), []):
+				if not default_storage.exists(image_path):
+					continue
+				cell = f"{get_column_letter(column_index)}{row}"
+				# Embed the Excel-sized rendition, not the full-resolution original
+				patch.add_image(cell, rendition_path(image_path, "excel"), EXCEL_PHOTO_WIDTH_PX, EXCEL_PHOTO_HEIGHT_PX)
+				# Widen the column to fit the image (approx 7 pixels per width unit)
+				patch.column_min_widths[column_index] = EXCEL_PHOTO_WIDTH_PX / 7
+				column_index += 1
+				has_images = True
+			if has_images:
+				# Pixels to points (1 pt = 1.333 px)
+				patch.row_heights[row] = EXCEL_PHOTO_HEIGHT_PX / 1.333
+
+	return patch
+
+
+# Bump when the workbook layout written by _build_excel_patch changes, so old fingerprints no longer match
+EXCEL_BUILD_FORMAT = 1
+
+# Builds done and skipped (fingerprint unchanged) by this process
+_excel_build_stats = {"built": 0, "skipped": 0}
+
+
+def _write_excel_copy_openpyxl(template_path: str, copy_path: str, patch: SheetPatch):
+	"""Full openpyxl round-trip; used when the template cannot be patched at zip level."""
+	# openpyxl keeps the template's own images (logos, headers) on load
+	workbook = load_workbook(template_path)
+	worksheet = workbook.active
+
+	# Writes into a merged range land on its top-left cell
+	anchors = worksheet_merged_anchor_index(worksheet)
+	for cell_ref, value in patch.cells.items():
+		key = split_coordinate(cell_ref)
+		row, column = anchors.get(key, key)
+		worksheet.cell(row=row, column=column).value = value
+
+	for column_index, min_width in patch.column_min_widths.items():
+		dimension = worksheet.column_dimensions[get_column_letter(column_index)]
+		dimension.width = max(dimension.width or 0, min_width)
+	for row, height in patch.row_heights.items():
+		worksheet.row_dimensions[row].height = height
+	for cell_ref, abs_path, width, height in patch.images:
+		image = ExcelImage(abs_path)
+		image.width = width
+		image.height = height
+		worksheet.add_image(image, cell_ref)
+
+	os.makedirs(os.path.dirname(copy_path), exist_ok=True)
+	workbook.save(copy_path)
+
+
+def _create_or_update_excel_copy(checklist: Checklist, force: bool = False):
+	"""
+	Create or update Excel copy for checklist.
+	ALWAYS uses the current project template for new checklists.
+	Returns False when the inputs are unchanged and the build was skipped.
+	"""
+	project = checklist.project
+	if not project or not project.template_file:
+		return
+
+	# ALWAYS start from the project template to avoid duplicate images
+	# This ensures we have a clean slate each time
+	template_path = project.template_file.path
+	# The content this build reflects; writes that land meanwhile keep it dirty
+	built_version = checklist.content_version
+
+	# Same inputs as the last build: the existing file is already what we would write
+	fingerprint = _excel_fingerprint(checklist, template_path)
+	if (
+		not force
+		and checklist.template_copy
+		and fingerprint == checklist.excel_fingerprint
+		and default_storage.exists(checklist.template_copy.name)
+	):
+		Checklist.objects.filter(pk=checklist.pk).update(excel_version=built_version)
+		checklist.excel_version = built_version
+		_excel_build_stats["skipped"] += 1
+		return False
+
+	patch = _build_excel_patch(checklist)
 
 	# Generate filename with site_id
 	site_id_slug = _safe_slug(checklist.site_id, f"site_{checklist.id}")
@@ -1241,134 +1179,72 @@ def _create_or_update_excel_copy(checklist: Checklist):
 		else _build_checklist_path(checklist, filename)
 	)
 	copy_path = default_storage.path(copy_name)
-	os.makedirs(os.path.dirname(copy_path), exist_ok=True)
-	workbook.save(copy_path)
+	try:
+		write_patched_workbook(get_template_prototype(template_path), copy_path, patch)
+	except XlsxPatchError:
+		_write_excel_copy_openpyxl(template_path, copy_path, patch)
 
+	Checklist.objects.filter(pk=checklist.pk).update(excel_version=built_version, excel_fingerprint=fingerprint)
+	checklist.excel_version = built_version
+	checklist.excel_fingerprint = fingerprint
 	if not checklist.template_copy:
 		checklist.template_copy.name = copy_name
 		checklist.save(update_fields=["template_copy", "updated_at"])
+	_excel_build_stats["built"] += 1
+	return True
 
 
-def _add_template_images(worksheet, template_path: str):
-	drawing_path = _get_first_sheet_drawing_path(template_path)
-	if not drawing_path:
-		return
-
-	with zipfile.ZipFile(template_path) as archive:
-		if drawing_path not in archive.namelist():
-			return
-
-		rels_path = drawing_path.replace("xl/drawings/", "xl/drawings/_rels/") + ".rels"
-		rels_map = {}
-		if rels_path in archive.namelist():
-			rels_xml = archive.read(rels_path)
-			rels_tree = _safe_parse_xml(rels_xml)
-			if rels_tree is not None:
-				for rel in rels_tree.findall("{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"):
-					rels_map[rel.get("Id")] = rel.get("Target")
-
-		drawing_xml = archive.read(drawing_path)
-		drawing_tree = _safe_parse_xml(drawing_xml)
-		if drawing_tree is None:
-			return
-
-		for anchor in drawing_tree.findall("{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}twoCellAnchor"):
-			from_node = anchor.find("{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}from")
-			pic = anchor.find("{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}pic")
-			if from_node is None or pic is None:
-				continue
-
-			col_node = from_node.find("{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}col")
-			row_node = from_node.find("{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}row")
-			if col_node is None or row_node is None:
-				continue
-
-			col = int(col_node.text or 0) + 1
-			row = int(row_node.text or 0) + 1
-			cell = f"{get_column_letter(col)}{row}"
-
-			blip = pic.find(
-				"{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}blipFill/"
-				"{http://schemas.openxmlformats.org/drawingml/2006/main}blip"
-			)
-			if blip is None:
-				continue
-
-			rid = blip.get("{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed")
-			target = rels_map.get(rid)
-			if not target:
-				continue
-
-			image_path = target.lstrip("/")
-			if not image_path.startswith("xl/"):
-				image_path = f"xl/{image_path}"
-			if image_path not in archive.namelist():
-				continue
-
-			width, height = _read_anchor_size(pic)
-			image_bytes = archive.read(image_path)
+def _excel_fingerprint(checklist: Checklist, template_path: str) -> str:
+	"""
+	SHA-256 over every input of the workbook: checklist data, the template's
+	identity and each photo file's identity.
+	"""
+	image_data = checklist.image_data
+	image_files = []
+	for row, image_paths in sorted(image_data.items()):
+		for image_path in image_paths:
 			try:
-				pil = PilImage.open(BytesIO(image_bytes))
-				image = ExcelImage(pil)
-				if width and height:
-					image.width = width
-					image.height = height
-				worksheet.add_image(image, cell)
-			except Exception:
-				continue
-
-
-def _get_first_sheet_drawing_path(template_path: str):
-	with zipfile.ZipFile(template_path) as archive:
-		worksheet_path = "xl/worksheets/sheet1.xml"
-		rels_path = "xl/worksheets/_rels/sheet1.xml.rels"
-		if worksheet_path not in archive.namelist() or rels_path not in archive.namelist():
-			projects = Project.objects.order_by("name")
-			return render(
-				request,
-				"dashboards/team_lead.html",
-				{
-					"path": path,
-					"project": profile.project,
-					"checklists": checklists,
-					"user_stats": user_stats,
-					"project_users": project_users,
-					"status_filter": status_filter,
-					"user_filter": user_filter,
-					"search_query": search_query,
-					"locations": locations,
-					"work_assignments": work_assignments,
-					"engineers": engineers,
-					"projects": projects,
-				},
-			)
-	return None
+				stat = os.stat(default_storage.path(image_path))
+				image_files.append([image_path, stat.st_mtime_ns, stat.st_size])
+			except OSError:
+				image_files.append([image_path, None, None])
+	equipment = [
+		[operator, equip_type, items]
+		for (operator, equip_type), items in sorted(tower_equipment_rows(checklist).items())
+	]
+	payload = json.dumps(
+		{
+			"format": EXCEL_BUILD_FORMAT,
+			"answers": checklist.answer_data or {},
+			"equipment": equipment,
+			"electrical": sorted(electrical_rows(checklist).items()),
+			"remarks": checklist.remark_data or {},
+			"images": image_data,
+			"template": list(template_identity(template_path)),
+			"image_files": image_files,
+		},
+		sort_keys=True,
+		default=str,
+	)
+	return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
-def _read_anchor_size(pic_node):
-	try:
-		ext = pic_node.find(
-			"{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}spPr/"
-			"{http://schemas.openxmlformats.org/drawingml/2006/main}xfrm/"
-			"{http://schemas.openxmlformats.org/drawingml/2006/main}ext"
-		)
-		if ext is None:
-			return None, None
-		cx = int(ext.get("cx", "0"))
-		cy = int(ext.get("cy", "0"))
-		if not cx or not cy:
-			return None, None
-		return cx // 9525, cy // 9525
-	except Exception:
-		return None, None
+def _excel_copy_is_current(checklist: Checklist) -> bool:
+	if checklist.excel_dirty or not default_storage.exists(checklist.template_copy.name):
+		return False
+	# A template uploaded after the last build makes the copy stale too
+	template_file = checklist.project.template_file
+	if template_file and os.path.exists(template_file.path):
+		copy_mtime = os.path.getmtime(default_storage.path(checklist.template_copy.name))
+		if copy_mtime < os.path.getmtime(template_file.path):
+			return False
+	return True
 
 
-def _safe_parse_xml(raw: bytes):
-	try:
-		import xml.etree.ElementTree as ET
-		return ET.fromstring(raw)
-	except Exception:
-		return None
+def _ensure_excel_copy(checklist: Checklist):
+	"""Build the Excel copy only if it is missing or older than the checklist content."""
+	if not _excel_copy_is_current(checklist):
+		_create_or_update_excel_copy(checklist)
 
 
 def _safe_slug(value: str, fallback: str):
@@ -1394,15 +1270,73 @@ def _build_checklist_path(checklist: Checklist, filename: str):
 	)
 
 
-def _build_image_path(checklist: Checklist, filename: str):
-	project_slug = _safe_slug(checklist.project.name, f"project_{checklist.project.id}")
-	team_lead_slug = _get_team_lead_name(checklist.project)
-	engineer_slug = _safe_slug(checklist.user.username, f"engineer_{checklist.user.id}")
-	site_id_slug = _safe_slug(checklist.site_id, f"site_{checklist.id}")
-	return (
-		f"projects/{project_slug}/team_leads/{team_lead_slug}/"
-		f"engineers/{engineer_slug}/sites/{site_id_slug}/images/{filename}"
-	)
+def _generate_photo_renditions(image_name: str):
+	"""Create the Excel rendition right after an upload; gallery thumbnails are made on request."""
+	try:
+		generate_renditions(image_name)
+	except Exception as exc:
+		# The workbook builder retries lazily and falls back to the original
+		print(f"⚠️ Could not create renditions for {image_name}: {exc}")
+
+
+# Gallery tiles are 100px; 320 keeps them sharp on 2x and 3x screens
+GALLERY_THUMBNAIL_SIZE = 320
+
+
+def _photo_thumbnail_url(checklist_id: int, image_name: str, size: int = GALLERY_THUMBNAIL_SIZE) -> str:
+	"""Cacheable thumbnail URL of a checklist photo; the original's URL if the file is missing."""
+	version = thumbnail_version(image_name)
+	if version is None:
+		return settings.MEDIA_URL + image_name
+	return reverse("checklist_photo_thumbnail", args=[checklist_id, size, version, image_name])
+
+
+def _store_photos(checklist: Checklist, row: int, uploads) -> tuple:
+	"""
+	Ingest uploaded photos (see core.ingest) and append them to a checklist row.
+	Photos are stored once per content (PhotoBlob); an upload seen before skips
+	ingestion, and one already shown in this row is not added again.
+	Returns (stored image names, bytes saved, names of rejected files).
+	"""
+	payloads = [read_upload(upload) for upload in uploads]
+	known = PhotoBlob.by_source(digest for _data, digest in payloads)
+	pending = {digest: data for data, digest in payloads if digest not in known}
+	ingested = dict(zip(pending, ingest_photos(list(pending.values()))))
+
+	stored = []
+	rejected = []
+	bytes_saved = 0
+	for upload, (data, digest) in zip(uploads, payloads):
+		photo = ingested.get(digest)
+		if isinstance(photo, PhotoRejected):
+			print(f"⚠️ Rejected {upload.name}: {photo}")
+			rejected.append(upload.name)
+			continue
+		sha256 = photo.sha256 if photo else known[digest].sha256
+		shown = checklist.images.filter(row_number=int(row), blob__sha256=sha256).values_list("image", flat=True).first()
+		if shown:
+			print(f"↩️ {upload.name} is already in row {row} as {shown}")
+			stored.append(shown)
+			bytes_saved += len(data)
+			continue
+		# The reference is taken in the transaction that adds the ledger row, so a
+		# concurrent delete of the last other reference cannot remove the blob in between
+		with transaction.atomic():
+			blob, created = PhotoBlob.acquire(sha256), False
+			if blob is None:
+				if photo is None:
+					# The blob this upload was ingested into before has just been deleted
+					photo = ingest_photo(data)
+				blob, created = PhotoBlob.store(photo.content, photo.extension, photo.sha256, source_sha256=digest)
+			# Append to the photo ledger; parallel uploads each add their own row
+			checklist.add_image(row, blob.file, original_size=len(data), stored_size=blob.size, blob=blob)
+		known[digest] = blob
+		if created:
+			_generate_photo_renditions(blob.file)
+		bytes_saved += max(0, len(data) - blob.size) if created else len(data)
+		stored.append(blob.file)
+		print(f"✅ Saved {upload.name} as {blob.file} ({len(data)} -> {blob.size} bytes{'' if created else ', deduplicated'})")
+	return stored, bytes_saved, rejected
 
 
 @require_http_methods(["POST"])
@@ -1435,7 +1369,8 @@ def location_add(request):
 				longitude=lon,
 				project_id=project_id if project_id else None,
 				created_by=request.user if request.user.is_authenticated else User.objects.first(),
-				notes=notes
+				notes=notes,
+				is_assigned=WorkAssignment.objects.filter(site_id=name).exists(),
 			)
 			messages.success(request, f"Location '{name}' added successfully!")
 		except ValueError:
@@ -1472,6 +1407,7 @@ def location_import(request):
 		ws = wb.active
 
 		created = 0
+		site_ids = set()
 		for row in ws.iter_rows(min_row=1, values_only=True):
 			if not row or len(row) < 3:
 				continue
@@ -1493,7 +1429,10 @@ def location_import(request):
 				created_by=request.user if request.user.is_authenticated else User.objects.first(),
 				notes="",
 			)
+			site_ids.add(str(site_id).strip())
 			created += 1
+		# Pins for sites that already have work start out assigned
+		GeoLocation.sync_assignment(*site_ids)
 
 		messages.success(request, f"Imported {created} locations.")
 	except Exception as e:
@@ -1578,7 +1517,7 @@ def assign_work(request):
 		project = get_object_or_404(Project, id=project_id)
 		
 		# Check if this site is already assigned to anyone
-		existing_assignment = WorkAssignment.objects.filter(site_id=site_id).first()
+		existing_assignment = WorkAssignment.objects.select_related("assigned_to").filter(site_id=site_id).first()
 		if existing_assignment:
 			messages.error(
 				request, 
@@ -1595,32 +1534,20 @@ def assign_work(request):
 		else:
 			assigned_by = request.user
 		
-		# Create work assignment (checklist will be created by engineer)
+		# Create the work and its draft checklist together so team lead/admin see it at once
 		try:
-			work = WorkAssignment.objects.create(
-				site_id=site_id,
-				latitude=lat,
-				longitude=lng,
-				description=description,
-				assigned_to=engineer,
-				assigned_by=assigned_by,
-				project=project,
-				status=WorkAssignment.Status.PENDING
-			)
-
-			# Create checklist immediately so team lead/admin can see it
-			answer_data = {"12": site_id}
-			checklist = Checklist.objects.create(
-				user=engineer,
-				project=project,
-				site_id=site_id,
-				status=Checklist.Status.DRAFT,
-				answer_data=answer_data,
-			)
-			work.checklist = checklist
-			work.save(update_fields=["checklist"])
-			if project.template_file:
-				_create_or_update_excel_copy(checklist)
+			with transaction.atomic():
+				work = WorkAssignment.objects.create(
+					site_id=site_id,
+					latitude=lat,
+					longitude=lng,
+					description=description,
+					assigned_to=engineer,
+					assigned_by=assigned_by,
+					project=project,
+					status=WorkAssignment.Status.PENDING
+				)
+				WorkAssignment.provision_checklists([work])
 			
 			messages.success(request, f"Work assigned to {engineer.username} successfully!")
 		except IntegrityError:
@@ -1695,7 +1622,7 @@ def work_edit(request, work_id: int):
 		work.checklist.site_id = site_id
 		work.checklist.answer_data = answers
 		work.checklist.save(update_fields=["site_id", "answer_data", "updated_at"])
-		_create_or_update_excel_copy(work.checklist)
+		work.checklist.mark_content_changed()
 
 	messages.success(request, "Work updated.")
 	if request.session.get("is_dev_admin"):
@@ -1800,9 +1727,6 @@ def create_checklist_from_work(request, work_id: int):
 		comment=f"Created from work assignment: {work.description[:100]}"
 	)
 	
-	# Create Excel copy from project template
-	_create_or_update_excel_copy(checklist)
-	
 	# Link checklist to work assignment
 	work.checklist = checklist
 	work.save()
@@ -1830,11 +1754,12 @@ def checklist_detail_view(request, checklist_id):
 	# Determine if user can edit (engineers can't edit FINAL checklists, but team leads and admins can)
 	can_edit = is_admin or is_team_lead or (is_engineer and checklist.status != Checklist.Status.FINAL)
 	
-	# Get template path
-	if checklist.template_copy:
-		template_path = checklist.template_copy.path
-	elif checklist.project.template_file:
+	# Get template path. Question texts are identical in the project template
+	# and the checklist copy, and the project template is stable enough to cache.
+	if checklist.project.template_file:
 		template_path = checklist.project.template_file.path
+	elif checklist.template_copy:
+		template_path = checklist.template_copy.path
 	else:
 		messages.error(request, "No template file available for this checklist.")
 		return redirect("user_dashboard", path=request.user.profile.path)
@@ -1876,10 +1801,13 @@ def checklist_detail_view(request, checklist_id):
 		for q in questions_list:
 			q['value'] = answers.get(str(q['row']), '')
 			q['remark'] = remarks.get(str(q['row']), '')
-			# Add MEDIA_URL to image paths
-			from django.conf import settings
+			# Add MEDIA_URL to image paths; the gallery shows thumbnails and opens the original
 			image_paths = images.get(str(q['row']), [])
 			q['images'] = [settings.MEDIA_URL + path if not path.startswith('/media') else path for path in image_paths]
+			q['photos'] = [
+				{"url": url, "thumb": _photo_thumbnail_url(checklist.id, path)}
+				for path, url in zip(image_paths, q['images'])
+			]
 	
 	# Section list for template loop
 	section_list = [
@@ -1931,26 +1859,12 @@ def checklist_data_api(request, checklist_id):
 	answers = checklist.answer_data or {}
 	dc_power = []
 	
-	# Get Tower Equipment from answer_data
-	tower_equipment = {}
-	electrical = {}
-	
-	for key, value in answers.items():
-		if key.startswith('equipment_'):
-			# Parse equipment data
-			operator = value.get('operator', '')
-			equip_type = value.get('type', '')
-			equip_data = value.get('data', {})
-			
-			equip_key = f"{operator}_{equip_type}"
-			if equip_key not in tower_equipment:
-				tower_equipment[equip_key] = []
-			tower_equipment[equip_key].append(equip_data)
-			
-		elif key.startswith('electrical_'):
-			# Parse electrical data
-			row_num = key.replace('electrical_', '')
-			electrical[row_num] = value
+	# Tower equipment keyed "<operator>_<type>", electrical readings keyed by row
+	tower_equipment = {
+		f"{operator}_{equip_type}": items
+		for (operator, equip_type), items in tower_equipment_rows(checklist).items()
+	}
+	electrical = {str(row_num): values for row_num, values in electrical_rows(checklist).items()}
 
 	zip_upload = answers.get('zip_upload')
 	
@@ -1963,64 +1877,81 @@ def checklist_data_api(request, checklist_id):
 	})
 
 
+def _autosave_operation(data: dict):
+	"""
+	(target, key, value) for an answer, remark, tower_equipment or electrical_data
+	edit, else None. target is the JSON field for answers and remarks, and
+	"tower_equipment" / "electrical_data" for edits stored in those tables.
+	"""
+	# Handle answer save
+	if 'answer' in data and 'row' in data:
+		return "answer_data", str(data['row']), data['answer']
+	
+	# Handle remark save
+	if 'remark' in data and 'row' in data:
+		return "remark_data", str(data['row']), data['remark']
+	
+	# Handle tower equipment save
+	if data.get('save_type') == 'tower_equipment':
+		edit = parse_equipment_edit(data)
+		return None if edit is None else ("tower_equipment", *edit)
+	
+	# Handle electrical data save
+	if data.get('save_type') == 'electrical_data':
+		edit = parse_electrical_edit(data)
+		return None if edit is None else ("electrical_data", *edit)
+	
+	return None
+
+
+def _apply_autosave_ops(checklist: Checklist, ops: list) -> list:
+	"""
+	Apply autosave edits in order and return one result per op. Answers and
+	remarks are patched key by key; equipment and electrical edits are
+	collected and written with one bulk upsert per table.
+	"""
+	results = [None] * len(ops)
+	row_edits = {"tower_equipment": [], "electrical_data": []}
+	for index, op in enumerate(ops):
+		operation = _autosave_operation(op) if isinstance(op, dict) else None
+		if operation is None:
+			results[index] = {'index': index, 'status': 'error', 'message': 'Invalid save type'}
+			continue
+		target, key, value = operation
+		if target in row_edits:
+			row_edits[target].append((index, key, value))
+			continue
+		changed = checklist.set_data_key(target, key, value)
+		results[index] = {'index': index, 'status': 'success', 'changed': changed}
+
+	rows_changed = False
+	for target, upsert in (("tower_equipment", upsert_tower_equipment), ("electrical_data", upsert_electrical_data)):
+		edits = row_edits[target]
+		changed = upsert(checklist, [(key, value) for _index, key, value in edits])
+		for (index, _key, _value), op_changed in zip(edits, changed):
+			results[index] = {'index': index, 'status': 'success', 'changed': op_changed}
+			rows_changed = rows_changed or op_changed
+	if rows_changed:
+		checklist.mark_content_changed()
+	return results
+
+
 @require_http_methods(["POST"])
 def checklist_autosave_api(request, checklist_id):
 	"""Auto-save endpoint for checklist data"""
 	import json
 	
-	checklist = get_object_or_404(Checklist, id=checklist_id)
+	# Edits are patched in the database, so the JSON blobs are never loaded here
+	checklist = get_object_or_404(Checklist.objects.only("id"), id=checklist_id)
 	
 	try:
 		data = json.loads(request.body)
 		
-		# Handle answer save
-		if 'answer' in data and 'row' in data:
-			row = str(data['row'])
-			answer_data = checklist.answer_data or {}
-			answer_data[row] = data['answer']
-			checklist.answer_data = answer_data
-			checklist.save()
-			return JsonResponse({'status': 'success'})
-		
-		# Handle remark save
-		if 'remark' in data and 'row' in data:
-			row = str(data['row'])
-			remark_data = checklist.remark_data or {}
-			remark_data[row] = data['remark']
-			checklist.remark_data = remark_data
-			checklist.save()
-			return JsonResponse({'status': 'success'})
-		
-		# Handle tower equipment save
-		if data.get('save_type') == 'tower_equipment':
-			operator = data.get('operator')
-			equipment_type = data.get('equipment_type')
-			unique_id = data.get('unique_id')
-			equipment_data = data.get('equipment_data', {})
-			
-			# Store in answer_data JSON for now (simple approach)
-			answer_data = checklist.answer_data or {}
-			equipment_key = f"equipment_{unique_id}"
-			answer_data[equipment_key] = {
-				'operator': operator,
-				'type': equipment_type,
-				'data': equipment_data
-			}
-			checklist.answer_data = answer_data
-			checklist.save()
-			return JsonResponse({'status': 'success'})
-		
-		# Handle electrical data save
-		if data.get('save_type') == 'electrical_data':
-			row_number = data.get('row')
-			electrical_data = data.get('electrical_data', {})
-			
-			# Store in answer_data JSON
-			answer_data = checklist.answer_data or {}
-			answer_data[f"electrical_{row_number}"] = electrical_data
-			checklist.answer_data = answer_data
-			checklist.save()
-			return JsonResponse({'status': 'success'})
+		if _autosave_operation(data) is not None:
+			# Unchanged values skip the write; changed ones mark the Excel copy stale
+			with transaction.atomic():
+				result, = _apply_autosave_ops(checklist, [data])
+			return JsonResponse({'status': 'success', 'changed': result['changed']})
 		
 		# Old format handling for backward compatibility
 		save_type = data.get('type')
@@ -2057,14 +1988,89 @@ def checklist_autosave_api(request, checklist_id):
 		return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
 
 
+AUTOSAVE_BATCH_MAX_OPS = 500
+AUTOSAVE_RECEIPT_TTL = timedelta(days=1)
+
+
+def _autosave_batch_replay(checklist: Checklist, key: str):
+	results = AutosaveBatch.objects.filter(checklist=checklist, key=key).values_list("results", flat=True).first()
+	if results is None:
+		return None
+	return JsonResponse({'status': 'success', 'replayed': True, 'results': results})
+
+
+def _edit_permission_error(request, checklist: Checklist):
+	"""
+	403 response unless the caller may change checklist: its engineer (not once
+	it is FINAL), a team lead of its project or the dev admin. Else None.
+	"""
+	profile = getattr(request.user, "profile", None) if request.user.is_authenticated else None
+	is_admin = request.session.get("is_dev_admin")
+	is_owner = request.user.is_authenticated and request.user.id == checklist.user_id
+	is_team_lead = profile and profile.role == Profile.Roles.TEAM_LEAD and checklist.project_id == profile.project_id
+	if not (is_admin or is_owner or is_team_lead):
+		return JsonResponse({'status': 'error', 'message': 'Permission denied'}, status=403)
+	if is_owner and not is_admin and not is_team_lead and checklist.status == Checklist.Status.FINAL:
+		return JsonResponse({'status': 'error', 'message': 'Cannot edit finalized checklist'}, status=403)
+	return None
+
+
+@require_http_methods(["POST"])
+def checklist_autosave_batch_api(request, checklist_id):
+	"""
+	Apply a queue of autosave edits in one transaction.
+	Body: {"key": "<idempotency key>", "ops": [<edit as sent to checklist_autosave_api>, ...]},
+	as JSON or, from navigator.sendBeacon, as a "payload" form field. Ops are
+	applied in order and a result is returned for each; a batch whose key was
+	already applied returns the stored results without writing again.
+	"""
+	checklist = get_object_or_404(Checklist.objects.only("id", "user_id", "project_id", "status"), id=checklist_id)
+	denied = _edit_permission_error(request, checklist)
+	if denied:
+		return denied
+	
+	try:
+		if request.content_type == "application/json":
+			payload = json.loads(request.body)
+		else:
+			payload = json.loads(request.POST.get("payload") or "{}")
+	except ValueError:
+		return JsonResponse({'status': 'error', 'message': 'Invalid JSON'}, status=400)
+	
+	ops = payload.get('ops') if isinstance(payload, dict) else None
+	if not isinstance(ops, list):
+		return JsonResponse({'status': 'error', 'message': 'ops must be a list'}, status=400)
+	if len(ops) > AUTOSAVE_BATCH_MAX_OPS:
+		return JsonResponse({'status': 'error', 'message': f'At most {AUTOSAVE_BATCH_MAX_OPS} ops per batch'}, status=400)
+	key = str(payload.get('key') or '')
+	if len(key) > 64:
+		return JsonResponse({'status': 'error', 'message': 'key is longer than 64 characters'}, status=400)
+	
+	if key:
+		replay = _autosave_batch_replay(checklist, key)
+		if replay is not None:
+			return replay
+	
+	try:
+		with transaction.atomic():
+			results = _apply_autosave_ops(checklist, ops)
+			if key:
+				AutosaveBatch.objects.create(checklist=checklist, key=key, results=results)
+	except IntegrityError:
+		# A retry of the same batch committed first; its edits are the ones that count
+		replay = _autosave_batch_replay(checklist, key)
+		if replay is not None:
+			return replay
+		raise
+	
+	if key:
+		AutosaveBatch.objects.filter(checklist=checklist, created_at__lt=timezone.now() - AUTOSAVE_RECEIPT_TTL).delete()
+	return JsonResponse({'status': 'success', 'results': results})
+
+
 @require_http_methods(["POST"])
 def checklist_upload_image(request, checklist_id):
 	"""Handle image upload for checklist sections"""
-	from PIL import Image as PilImage
-	import io
-	import os
-	from django.core.files.base import ContentFile
-	
 	print(f"\n{'='*60}")
 	print(f"UPLOAD IMAGE REQUEST - Checklist ID: {checklist_id}")
 	print(f"Method: {request.method}")
@@ -2110,44 +2116,22 @@ def checklist_upload_image(request, checklist_id):
 		return JsonResponse({'status': 'error', 'message': 'No images provided'}, status=400)
 	
 	try:
-		image_data = checklist.image_data or {}
-		row_images = image_data.get(str(row), [])
-		new_images = []  # Track newly added images
-		
+		row = int(row)
+	except ValueError:
+		return JsonResponse({'status': 'error', 'message': 'Row number must be an integer'}, status=400)
+	
+	try:
 		print(f"Processing {len(uploaded_files)} image(s)...")
+		new_images, bytes_saved, rejected = _store_photos(checklist, row, uploaded_files)
+		if not new_images:
+			return JsonResponse({
+				'status': 'error',
+				'message': 'None of the files could be read as an image',
+				'rejected': rejected,
+			}, status=400)
 		
-		for uploaded_file in uploaded_files:
-			print(f"Processing file: {uploaded_file.name}, size: {uploaded_file.size} bytes")
-			
-			# Save image at full resolution without resizing
-			# Generate unique filename with timestamp
-			import time
-			ext = os.path.splitext(uploaded_file.name)[1] or '.jpg'
-			timestamp = int(time.time() * 1000)
-			filename = f"checklist_{checklist.id}_row_{row}_{timestamp}{ext}"
-			
-			# Save file using the custom path builder
-			from django.core.files.storage import default_storage
-			file_path = _build_image_path(checklist, filename)
-			
-			# Reset file pointer to beginning
-			uploaded_file.seek(0)
-			file_path = default_storage.save(file_path, uploaded_file)
-			
-			print(f"✅ Saved image to: {file_path}")
-			
-			# Add to image list
-			row_images.append(file_path)
-			new_images.append(file_path)
-		
-		image_data[str(row)] = row_images
-		checklist.image_data = image_data
-		checklist.save()
-		
-		print(f"✅ SUCCESS - Saved {len(new_images)} new image(s)")
-		print(f"Response: {{'status': 'success', 'images': {len(row_images)} total, 'new_images': {new_images}}}")
-		
-		return JsonResponse({'status': 'success', 'images': row_images, 'new_images': new_images})
+		print(f"✅ SUCCESS - Saved {len(new_images)} new image(s), {bytes_saved} bytes saved by ingestion")
+		return _photos_stored_response(checklist, row, new_images, bytes_saved, rejected)
 	
 	except Exception as e:
 		import traceback
@@ -2155,6 +2139,57 @@ def checklist_upload_image(request, checklist_id):
 		return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
 
 
+def _photos_stored_response(checklist: Checklist, row: int, new_images: list, bytes_saved: int, rejected: list):
+	checklist.mark_content_changed()
+	return JsonResponse({
+		'status': 'success',
+		'images': checklist.row_images(row),
+		'new_images': new_images,
+		'new_thumbnails': [_photo_thumbnail_url(checklist.id, image_name) for image_name in new_images],
+		'bytes_saved': bytes_saved,
+		'rejected': rejected,
+	})
+
+
+@require_http_methods(["GET"])
+def checklist_photo_thumbnail(request, checklist_id: int, size: int, version: str, image_name: str):
+	"""
+	Thumbnail of a checklist photo, made on first request. The URL carries the
+	photo's version, so the response may be cached by the browser for good.
+	"""
+	from PIL import Image as PilImage
+
+	checklist = get_object_or_404(Checklist, id=checklist_id)
+	profile = getattr(request.user, "profile", None)
+	is_team_lead = profile and profile.role == Profile.Roles.TEAM_LEAD
+	if not (
+		request.session.get("is_dev_admin")
+		or request.user == checklist.user
+		or (is_team_lead and checklist.project_id == profile.project_id)
+	):
+		raise Http404("Not authorized")
+	if not checklist.images.filter(image=image_name).exists():
+		raise Http404("Photo not found")
+
+	current_version = thumbnail_version(image_name)
+	if current_version is None:
+		raise Http404("Photo not found")
+	if current_version != version:
+		# The photo was replaced since the page was rendered
+		return redirect("checklist_photo_thumbnail", checklist_id, size, current_version, image_name)
+	try:
+		path = thumbnail_path(image_name, size, version)
+	except ValueError:
+		raise Http404("Unsupported size")
+	except (OSError, PilImage.DecompressionBombError):
+		# Not a decodable image; let the browser have the original
+		return redirect(settings.MEDIA_URL + image_name)
+
+	response = FileResponse(open(path, "rb"), content_type="image/jpeg")
+	patch_cache_control(response, private=True, max_age=365 * 24 * 60 * 60, immutable=True)
+	return response
+
+
 @require_http_methods(["POST"])
 def checklist_delete_image(request):
 	"""Delete a checklist image"""
@@ -2192,24 +2227,13 @@ def checklist_delete_image(request):
 			print("❌ Permission denied")
 			return JsonResponse({'status': 'error', 'message': 'Permission denied'}, status=403)
 		
-		image_data = checklist.image_data or {}
+		print(f"Current images in row {row}: {checklist.row_images(row)}")
 		
-		print(f"Current images in row {row}: {image_data.get(row, [])}")
-		
-		if row in image_data and image_path in image_data[row]:
-			image_data[row].remove(image_path)
-			checklist.image_data = image_data
-			checklist.save()
+		# The file itself is deleted once no row shows it any more (see core.models.release_photo_file)
+		if checklist.remove_image(row, image_path):
+			checklist.mark_content_changed()
 			
 			print(f"✅ Removed from database")
-			
-			# Delete physical file
-			from django.core.files.storage import default_storage
-			if default_storage.exists(image_path):
-				default_storage.delete(image_path)
-				print(f"✅ Deleted physical file")
-			else:
-				print(f"⚠️ Physical file not found: {image_path}")
 		else:
 			print(f"❌ Image not found in database")
 		
@@ -2221,36 +2245,180 @@ def checklist_delete_image(request):
 
 @require_http_methods(["POST"])
 def checklist_upload_zip(request, checklist_id):
-	"""Upload a ZIP file for the checklist."""
-	from django.core.files.storage import default_storage
-	from django.utils.text import slugify
-
+	"""Upload a ZIP file for the checklist in one request (see checklist_upload_start for resumable uploads)."""
 	checklist = get_object_or_404(Checklist, id=checklist_id)
 	zip_file = request.FILES.get('zip_file')
 	if not zip_file:
 		return JsonResponse({'status': 'error', 'message': 'No file provided'}, status=400)
 
-	answers = checklist.answer_data or {}
-	old_zip = answers.get('zip_upload', {})
+	saved_path = default_storage.save(_checklist_zip_path(checklist, zip_file.name), zip_file)
+	zip_info = _attach_checklist_zip(checklist, saved_path, zip_file.name, zip_file.size)
+	return JsonResponse({'status': 'success', 'zip': zip_info})
+
+
+def _checklist_zip_path(checklist: Checklist, filename: str) -> str:
+	safe_name = slugify(filename.rsplit('.', 1)[0]) or 'checklist'
+	ext = filename.split('.')[-1]
+	return f"checklist_zips/{checklist.id}/{safe_name}.{ext}"
+
+
+def _attach_checklist_zip(checklist: Checklist, path: str, name: str, size: int) -> dict:
+	"""Record path as the checklist's archive and delete the one it replaces."""
+	old_zip = Checklist.objects.filter(pk=checklist.pk).values_list("answer_data__zip_upload", flat=True).first()
+	zip_info = {
+		'path': path,
+		'name': name,
+		'size': size,
+	}
+	# Only this key is written, so answers autosaved meanwhile are kept; the workbook does not show it
+	checklist.set_data_key("answer_data", "zip_upload", zip_info, mark_stale=False)
 	old_path = old_zip.get('path') if isinstance(old_zip, dict) else None
-	if old_path and default_storage.exists(old_path):
+	if old_path and old_path != path and default_storage.exists(old_path):
 		default_storage.delete(old_path)
+	return zip_info
 
-	safe_name = slugify(zip_file.name.rsplit('.', 1)[0]) or 'checklist'
-	ext = zip_file.name.split('.')[-1]
-	filename = f"{safe_name}.{ext}"
-	file_path = f"checklist_zips/{checklist.id}/{filename}"
-	saved_path = default_storage.save(file_path, zip_file)
 
-	answers['zip_upload'] = {
-		'path': saved_path,
-		'name': zip_file.name,
-		'size': zip_file.size,
+def _upload_state(session: UploadSession, status: str = 'success', **extra) -> dict:
+	return {
+		'status': status,
+		'id': str(session.id),
+		'received': session.received,
+		'size': session.size,
+		'complete': session.complete,
+		**extra,
 	}
-	checklist.answer_data = answers
-	checklist.save(update_fields=["answer_data", "updated_at"])
 
-	return JsonResponse({'status': 'success', 'zip': answers['zip_upload']})
+
+def _upload_session(request, upload_id):
+	"""(session, None) for an upload the user may write to, else (None, error response)."""
+	session = get_object_or_404(UploadSession.objects.select_related("checklist"), id=upload_id)
+	return session, _edit_permission_error(request, session.checklist)
+
+
+@require_http_methods(["POST"])
+def checklist_upload_start(request, checklist_id):
+	"""
+	Start a resumable upload (core.uploads). Takes JSON {kind: "zip" | "photo",
+	filename, size, row (photos only)}; returns the session's URLs and the
+	chunk size to PUT.
+	"""
+	checklist = get_object_or_404(Checklist, id=checklist_id)
+	denied = _edit_permission_error(request, checklist)
+	if denied:
+		return denied
+	try:
+		data = json.loads(request.body)
+		kind = data.get('kind')
+		filename = os.path.basename(str(data.get('filename') or '')).strip()
+		size = int(data.get('size'))
+		row = int(data['row']) if kind == UploadSession.Kind.PHOTO else None
+	except (ValueError, TypeError, KeyError, AttributeError):
+		return JsonResponse({'status': 'error', 'message': 'Expected JSON with kind, filename, size and, for photos, row'}, status=400)
+	if kind not in UploadSession.Kind.values or not filename or size <= 0:
+		return JsonResponse({'status': 'error', 'message': 'Invalid kind, filename or size'}, status=400)
+	if size > uploads.max_bytes(kind):
+		return JsonResponse({'status': 'error', 'message': f'File is larger than {uploads.max_bytes(kind)} bytes'}, status=413)
+
+	if kind == UploadSession.Kind.ZIP:
+		# Chunks go straight to the archive's final name; the old archive stays until finish
+		path = uploads.reserve(_checklist_zip_path(checklist, filename))
+	else:
+		path = uploads.reserve(f"uploads/{checklist.id}/{uuid.uuid4().hex}.part")
+	session = UploadSession.objects.create(
+		checklist=checklist, user=request.user if request.user.is_authenticated else None,
+		kind=kind, row_number=row, filename=filename, size=size, path=path,
+	)
+	return JsonResponse(_upload_state(
+		session,
+		url=reverse("checklist_upload_chunk", args=[session.id]),
+		finish_url=reverse("checklist_upload_finish", args=[session.id]),
+		chunk_size=uploads.chunk_size(),
+	), status=201)
+
+
+@require_http_methods(["GET", "PUT", "DELETE"])
+def checklist_upload_chunk(request, upload_id):
+	"""
+	GET: bytes received so far, to resume from after a dropped connection.
+	PUT: one chunk as the raw body, placed by its Content-Range header. A chunk
+	may repeat bytes already received but not leave a gap (409 with the offset
+	to continue from).
+	DELETE: abandon the upload.
+	"""
+	session, denied = _upload_session(request, upload_id)
+	if denied:
+		return denied
+	if request.method == "GET":
+		return JsonResponse(_upload_state(session))
+	if request.method == "DELETE":
+		session.discard()
+		return JsonResponse({'status': 'success'})
+
+	try:
+		first, last, total = uploads.parse_content_range(request.headers.get("Content-Range", ""))
+	except ValueError as exc:
+		return JsonResponse(_upload_state(session, 'error', message=str(exc)), status=400)
+	if total != session.size:
+		return JsonResponse(_upload_state(session, 'error', message='Content-Range size does not match the upload'), status=400)
+	if last - first + 1 > uploads.chunk_size():
+		return JsonResponse(_upload_state(session, 'error', message=f'Chunks are limited to {uploads.chunk_size()} bytes'), status=413)
+	if first > session.received:
+		return JsonResponse(_upload_state(session, 'error', message='Chunk starts past the bytes received'), status=409)
+
+	try:
+		uploads.write_chunk(session.path, first, request, last - first + 1)
+	except uploads.IncompleteChunk as exc:
+		return JsonResponse(_upload_state(session, 'error', message=str(exc)), status=400)
+	UploadSession.objects.filter(id=session.id).update(
+		received=Greatest("received", last + 1), updated_at=timezone.now(),
+	)
+	session.refresh_from_db(fields=["received"])
+	return JsonResponse(_upload_state(session))
+
+
+@require_http_methods(["POST"])
+def checklist_upload_finish(request, upload_id):
+	"""
+	Finish a resumable upload once all bytes are in. Takes JSON {sha256}; the
+	stored bytes must hash to it, else the upload is dropped and must be sent
+	again. A ZIP replaces the checklist's archive; a photo is ingested into
+	its row, with the same response as checklist_upload_image.
+	"""
+	session, denied = _upload_session(request, upload_id)
+	if denied:
+		return denied
+	try:
+		expected = str(json.loads(request.body).get('sha256') or '').lower()
+	except (ValueError, AttributeError):
+		expected = ''
+	if not re.fullmatch(r"[0-9a-f]{64}", expected):
+		return JsonResponse(_upload_state(session, 'error', message='sha256 of the file is required'), status=400)
+	if not session.complete:
+		return JsonResponse(_upload_state(session, 'error', message='Upload is incomplete'), status=409)
+
+	digest = uploads.file_sha256(session.path)
+	if digest != expected:
+		session.discard()
+		return JsonResponse(_upload_state(session, 'error', message='Checksum mismatch; upload the file again'), status=400)
+	# Only one finish request may use the file
+	if not UploadSession.objects.filter(id=session.id).delete()[0]:
+		raise Http404("Upload already finished.")
+
+	checklist = session.checklist
+	if session.kind == UploadSession.Kind.ZIP:
+		zip_info = _attach_checklist_zip(checklist, session.path, session.filename, session.size)
+		return JsonResponse({'status': 'success', 'zip': {**zip_info, 'sha256': digest}})
+
+	try:
+		with default_storage.open(session.path, "rb") as handle:
+			upload = File(handle, name=session.filename)
+			upload.sha256 = digest
+			new_images, bytes_saved, rejected = _store_photos(checklist, session.row_number, [upload])
+	finally:
+		uploads.discard(session.path)
+	if not new_images:
+		return JsonResponse({'status': 'error', 'message': 'The file could not be read as an image', 'rejected': rejected}, status=400)
+	return _photos_stored_response(checklist, session.row_number, new_images, bytes_saved, rejected)
 
 
 @require_http_methods(["GET"])
@@ -2269,6 +2437,25 @@ def checklist_download_zip(request, checklist_id):
 	return FileResponse(file_handle, as_attachment=True, filename=filename)
 
 
+@require_http_methods(["GET"])
+def checklist_download_photos(request, checklist_id):
+	"""Every photo of the checklist in one ZIP, built while it streams out (see core.photo_export)."""
+	checklist = get_object_or_404(Checklist.objects.select_related("project"), id=checklist_id)
+	profile = getattr(request.user, "profile", None)
+	is_same_project = profile and profile.role == Profile.Roles.TEAM_LEAD and checklist.project == profile.project
+	if not (request.user == checklist.user or request.session.get("is_dev_admin") or is_same_project):
+		raise Http404("Not authorized")
+
+	entries = photo_entries(checklist.image_data)
+	filename = f"{_safe_slug(checklist.site_id, f'checklist_{checklist.id}')}-photos.zip"
+	response = StreamingHttpResponse(iter_photo_zip(entries), content_type="application/zip")
+	response["Content-Disposition"] = content_disposition_header(True, filename)
+	# Pass the archive on as it is produced instead of buffering it in the proxy
+	response["X-Accel-Buffering"] = "no"
+	patch_cache_control(response, private=True, no_store=True)
+	return response
+
+
 @require_http_methods(["POST"])
 def checklist_delete_equipment(request, equipment_id):
 	"""Delete tower equipment row"""
@@ -2277,6 +2464,7 @@ def checklist_delete_equipment(request, equipment_id):
 	try:
 		equipment = get_object_or_404(TowerEquipment, id=equipment_id)
 		equipment.delete()
+		equipment.checklist.mark_content_changed()
 		return JsonResponse({'status': 'success'})
 	except Exception as e:
 		return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
@@ -2290,6 +2478,7 @@ def checklist_delete_electrical(request, electrical_id):
 	try:
 		electrical = get_object_or_404(ElectricalData, id=electrical_id)
 		electrical.delete()
+		electrical.checklist.mark_content_changed()
 		return JsonResponse({'status': 'success'})
 	except Exception as e:
 		return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
@@ -2307,8 +2496,8 @@ def checklist_submit(request, checklist_id):
 		messages.error(request, "Not authorized")
 		return redirect("login")
 	
-	# Update Excel with all current data
-	_create_or_update_excel_copy(checklist)
+	# Rebuild the Excel copy in the background
+	enqueue_checklist_rebuild(checklist)
 	
 	# Update status to SUBMITTED
 	checklist.status = Checklist.Status.SUBMITTED
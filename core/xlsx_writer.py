@@ -0,0 +1,627 @@
+"""
+Copy-through XLSX writer for checklist copies.
+
+Treats the project template as a zip package: every part that a checklist
+does not touch (styles, theme, media, printer settings, form controls...) is
+copied byte-for-byte without being decompressed, and only the active
+worksheet, its drawing (when photos are embedded) and [Content_Types].xml are
+regenerated. Cell values are written the same way openpyxl writes them
+(inline strings, numbers, booleans, formulas) so the result reads back
+cell-for-cell identical to a full openpyxl round-trip.
+"""
+import os
+import posixpath
+import re
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from io import BytesIO
+from xml.sax.saxutils import escape, quoteattr
+
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import column_index_from_string, get_column_letter
+from PIL import Image as PilImage
+
+NS_REL_DOC = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+REL_TYPE_DRAWING = NS_REL_DOC + "/drawing"
+REL_TYPE_IMAGE = NS_REL_DOC + "/image"
+
+# Pixels to EMU (English Metric Units) at 96 DPI, as used by openpyxl
+EMU_PER_PIXEL = 9525
+
+IMAGE_CONTENT_TYPES = {
+	"jpeg": "image/jpeg",
+	"png": "image/png",
+	"gif": "image/gif",
+}
+
+_ZIP_LIMIT = 0xFFFFFFFF
+
+_COORD_RE = re.compile(r"^([A-Z]+)(\d+)$")
+_MERGE_RE = re.compile(r'<mergeCell\b[^>]*\bref="([A-Z]+\d+):([A-Z]+\d+)"')
+_ROW_RE = re.compile(r'<row\b([^>]*?)(/>|>(.*?)</row>)', re.S)
+_CELL_RE = re.compile(r'<c\b([^>]*?)(/>|>(.*?)</c>)', re.S)
+_ATTR_RE = re.compile(r'([\w:]+)="([^"]*)"')
+_COL_RE = re.compile(r'<col\b([^>]*?)/>')
+_REL_RE = re.compile(r'<Relationship\b([^>]*?)/>')
+
+
+class XlsxPatchError(Exception):
+	"""The template cannot be patched at zip level; use the openpyxl path."""
+
+
+class SheetPatch:
+	"""
+	Everything a checklist changes on top of the template's active sheet.
+
+	- cells: coordinate -> value, applied in insertion order; writes into a
+	  merged range land on its top-left cell
+	- column_min_widths: column index -> minimum width (characters)
+	- row_heights: row -> height (points)
+	- images: (coordinate, abs_path, width_px, height_px) one-cell anchors
+	"""
+
+	def __init__(self):
+		self.cells = {}
+		self.column_min_widths = {}
+		self.row_heights = {}
+		self.images = []
+
+	def write(self, coordinate: str, value):
+		# Re-insert so the latest write also wins on ordering
+		self.cells.pop(coordinate, None)
+		self.cells[coordinate] = value
+
+	def add_image(self, coordinate: str, abs_path: str, width: int, height: int):
+		self.images.append((coordinate, abs_path, width, height))
+
+
+def split_coordinate(coordinate: str):
+	match = _COORD_RE.match(coordinate)
+	if not match:
+		raise XlsxPatchError(f"Invalid cell coordinate: {coordinate}")
+	return int(match.group(2)), column_index_from_string(match.group(1))
+
+
+def _anchor_index(bounds):
+	index = {}
+	for min_row, min_col, max_row, max_col in bounds:
+		for row in range(min_row, max_row + 1):
+			for col in range(min_col, max_col + 1):
+				index[(row, col)] = (min_row, min_col)
+	return index
+
+
+def merged_anchor_index(merge_refs):
+	"""Map every (row, col) covered by a merged range to its top-left (row, col)."""
+	bounds = []
+	for start, end in merge_refs:
+		bounds.append(split_coordinate(start) + split_coordinate(end))
+	return _anchor_index(bounds)
+
+
+def worksheet_merged_anchor_index(worksheet):
+	"""merged_anchor_index() for an openpyxl worksheet."""
+	return _anchor_index(
+		(cell_range.min_row, cell_range.min_col, cell_range.max_row, cell_range.max_col)
+		for cell_range in worksheet.merged_cells.ranges
+	)
+
+
+# ---------------------------------------------------------------------------
+# Zip assembly
+# ---------------------------------------------------------------------------
+
+def _dos_datetime(date_time):
+	year, month, day, hour, minute, second = date_time
+	dos_date = ((max(year, 1980) - 1980) << 9) | (month << 5) | day
+	dos_time = (hour << 11) | (minute << 5) | (second // 2)
+	return dos_time, dos_date
+
+
+class _ZipAssembler:
+	"""Minimal zip writer that can copy already-compressed members verbatim."""
+
+	def __init__(self, fileobj):
+		self.fp = fileobj
+		self.entries = []
+
+	def _write_entry(self, name: str, method: int, flags: int, date_time, crc: int, compressed_size: int, size: int, payload_writer):
+		encoded = name.encode("utf-8")
+		if not name.isascii():
+			flags |= 0x800
+		# Sizes are known up front, so never emit data descriptors
+		flags &= ~0x08
+		offset = self.fp.tell()
+		if offset > _ZIP_LIMIT or compressed_size > _ZIP_LIMIT or size > _ZIP_LIMIT:
+			raise XlsxPatchError("Workbook too large for a non-zip64 package")
+		dos_time, dos_date = _dos_datetime(date_time)
+		self.fp.write(struct.pack(
+			"<4s2B4HL2L2H",
+			b"PK\003\004", 20, 0, flags, method, dos_time, dos_date,
+			crc, compressed_size, size, len(encoded), 0,
+		))
+		self.fp.write(encoded)
+		payload_writer()
+		self.entries.append((encoded, flags, method, dos_time, dos_date, crc, compressed_size, size, offset))
+
+	def copy_payload(self, info: zipfile.ZipInfo, payload: bytes):
+		"""Write a member whose compressed bytes were read ahead of time."""
+		self._write_entry(
+			info.filename, info.compress_type, info.flag_bits, info.date_time,
+			info.CRC, info.compress_size, info.file_size, lambda: self.fp.write(payload),
+		)
+
+	def write_bytes(self, name: str, data: bytes, compress: bool = True):
+		crc = zlib.crc32(data) & 0xFFFFFFFF
+		if compress:
+			compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+			payload = compressor.compress(data) + compressor.flush()
+			method = zipfile.ZIP_DEFLATED
+		else:
+			payload = data
+			method = zipfile.ZIP_STORED
+		self._write_entry(
+			name, method, 0, time.localtime()[:6], crc, len(payload), len(data),
+			lambda: self.fp.write(payload),
+		)
+
+	def close(self):
+		central_offset = self.fp.tell()
+		for encoded, flags, method, dos_time, dos_date, crc, compressed_size, size, offset in self.entries:
+			self.fp.write(struct.pack(
+				"<4s4B4HL2L5H2L",
+				b"PK\001\002", 20, 0, 20, 0, flags, method, dos_time, dos_date,
+				crc, compressed_size, size, len(encoded), 0, 0, 0, 0, 0, offset,
+			))
+			self.fp.write(encoded)
+		central_size = self.fp.tell() - central_offset
+		if len(self.entries) > 0xFFFF or central_offset > _ZIP_LIMIT:
+			raise XlsxPatchError("Workbook too large for a non-zip64 package")
+		self.fp.write(struct.pack(
+			"<4s4H2LH",
+			b"PK\005\006", 0, 0, len(self.entries), len(self.entries),
+			central_size, central_offset, 0,
+		))
+
+
+# ---------------------------------------------------------------------------
+# Package helpers
+# ---------------------------------------------------------------------------
+
+def _attrs(raw: str) -> dict:
+	return dict(_ATTR_RE.findall(raw))
+
+
+def _rels_path(part: str) -> str:
+	directory, name = posixpath.split(part)
+	return posixpath.join(directory, "_rels", name + ".rels")
+
+
+def _resolve_target(source_part: str, target: str) -> str:
+	if target.startswith("/"):
+		return target.lstrip("/")
+	return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+
+def _relative_target(source_part: str, target_part: str) -> str:
+	return posixpath.relpath(target_part, posixpath.dirname(source_part))
+
+
+def _read_relationships(archive: zipfile.ZipFile, part: str):
+	rels_path = _rels_path(part)
+	if rels_path not in archive.NameToInfo:
+		return rels_path, None, []
+	xml = archive.read(rels_path).decode("utf-8")
+	return rels_path, xml, [_attrs(raw) for raw in _REL_RE.findall(xml)]
+
+
+def _workbook_part(archive: zipfile.ZipFile) -> str:
+	for raw in _REL_RE.findall(archive.read("_rels/.rels").decode("utf-8")):
+		attrs = _attrs(raw)
+		if attrs.get("Type", "").endswith("/officeDocument"):
+			return _resolve_target("", attrs["Target"])
+	return "xl/workbook.xml"
+
+
+def active_sheet_part(archive: zipfile.ZipFile) -> str:
+	"""Part name of the sheet openpyxl would return as workbook.active."""
+	workbook_part = _workbook_part(archive)
+	workbook_xml = archive.read(workbook_part).decode("utf-8")
+
+	active_tab = 0
+	view = re.search(r"<workbookView\b([^>]*?)/?>", workbook_xml)
+	if view:
+		active_tab = int(_attrs(view.group(1)).get("activeTab", 0))
+	sheets = [_attrs(raw) for raw in re.findall(r"<sheet\b([^>]*?)/>", workbook_xml)]
+	if not sheets:
+		raise XlsxPatchError("Workbook has no sheets")
+	sheet = sheets[active_tab] if active_tab < len(sheets) else sheets[0]
+
+	_path, _xml, rels = _read_relationships(archive, workbook_part)
+	for rel in rels:
+		if rel.get("Id") == sheet.get("r:id"):
+			return _resolve_target(workbook_part, rel["Target"])
+	raise XlsxPatchError("Active sheet relationship not found")
+
+
+def shared_strings_part(archive: zipfile.ZipFile):
+	"""Part name of the shared strings table, or None if the workbook has none."""
+	workbook_part = _workbook_part(archive)
+	_path, _xml, rels = _read_relationships(archive, workbook_part)
+	for rel in rels:
+		if rel.get("Type", "").endswith("/sharedStrings"):
+			part = _resolve_target(workbook_part, rel["Target"])
+			return part if part in archive.NameToInfo else None
+	return None
+
+
+def _next_rel_id(rels) -> int:
+	numbers = [int(rel["Id"][3:]) for rel in rels if rel.get("Id", "").startswith("rId") and rel["Id"][3:].isdigit()]
+	return max(numbers, default=0) + 1
+
+
+# ---------------------------------------------------------------------------
+# Worksheet XML patching
+# ---------------------------------------------------------------------------
+
+def _format_number(value) -> str:
+	return repr(value) if isinstance(value, float) else str(value)
+
+
+def _cell_xml(coordinate: str, style, value) -> str:
+	"""Serialize a cell the same way openpyxl's writer does."""
+	attrs = f'r="{coordinate}"'
+	if style is not None:
+		attrs += f' s="{style}"'
+	if value is None or value == "":
+		return f"<c {attrs}/>"
+	if isinstance(value, bool):
+		return f'<c {attrs} t="b"><v>{int(value)}</v></c>'
+	if isinstance(value, (int, float)):
+		return f'<c {attrs} t="n"><v>{_format_number(value)}</v></c>'
+	text = ILLEGAL_CHARACTERS_RE.sub("", str(value))
+	if text.startswith("=") and len(text) > 1:
+		return f"<c {attrs}><f>{escape(text[1:])}</f></c>"
+	space = ' xml:space="preserve"' if text.strip() != text else ""
+	return f'<c {attrs} t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+
+def _format_height(height: float) -> str:
+	return repr(float(height))
+
+
+def _patch_row(row_number: int, attrs_raw: str, body: str, cell_values: dict, height):
+	"""Return the XML for one <row> with the given cells replaced."""
+	if height is not None:
+		attrs_raw = re.sub(r'\s(ht|customHeight)="[^"]*"', "", attrs_raw)
+		attrs_raw += f' ht="{_format_height(height)}" customHeight="1"'
+
+	if cell_values:
+		cells = []
+		for match in _CELL_RE.finditer(body or ""):
+			cell_attrs = _attrs(match.group(1))
+			_row, col = split_coordinate(cell_attrs["r"])
+			cells.append([col, cell_attrs.get("s"), match.group(0)])
+		by_col = {entry[0]: entry for entry in cells}
+		new_cells = False
+		for col, value in cell_values.items():
+			coordinate = f"{get_column_letter(col)}{row_number}"
+			if col in by_col:
+				by_col[col][2] = _cell_xml(coordinate, by_col[col][1], value)
+			else:
+				entry = [col, None, _cell_xml(coordinate, None, value)]
+				cells.append(entry)
+				by_col[col] = entry
+				new_cells = True
+		if new_cells:
+			cells.sort(key=lambda entry: entry[0])
+			# spans is only a hint and may now be wrong
+			attrs_raw = re.sub(r'\sspans="[^"]*"', "", attrs_raw)
+		body = "".join(entry[2] for entry in cells)
+
+	if body:
+		return f"<row{attrs_raw}>{body}</row>"
+	return f"<row{attrs_raw}/>"
+
+
+def _patch_sheet_data(sheet_data: str, writes: dict, row_heights: dict) -> str:
+	cells_by_row = {}
+	for (row, col), value in writes.items():
+		cells_by_row.setdefault(row, {})[col] = value
+	touched = set(cells_by_row) | set(row_heights)
+	if not touched:
+		return sheet_data
+
+	pieces = []
+	last_end = 0
+	seen = set()
+
+	def _new_rows_before(limit):
+		for row in sorted(r for r in touched if r not in seen and (limit is None or r < limit)):
+			seen.add(row)
+			pieces.append(_patch_row(row, f' r="{row}"', "", cells_by_row.get(row, {}), row_heights.get(row)))
+
+	for match in _ROW_RE.finditer(sheet_data):
+		row_number = int(_attrs(match.group(1))["r"])
+		if row_number not in touched:
+			continue
+		pieces.append(sheet_data[last_end:match.start()])
+		_new_rows_before(row_number)
+		seen.add(row_number)
+		pieces.append(_patch_row(
+			row_number, match.group(1), match.group(3) or "",
+			cells_by_row.get(row_number, {}), row_heights.get(row_number),
+		))
+		last_end = match.end()
+
+	tail = sheet_data[last_end:]
+	# Rows past the last existing row go right before </sheetData>
+	close = tail.rfind("</sheetData>")
+	if close == -1:
+		pieces.append(tail.replace("<sheetData/>", "<sheetData>", 1))
+		_new_rows_before(None)
+		pieces.append("</sheetData>")
+	else:
+		pieces.append(tail[:close])
+		_new_rows_before(None)
+		pieces.append(tail[close:])
+	return "".join(pieces)
+
+
+def _patch_cols(sheet_xml: str, column_min_widths: dict) -> str:
+	if not column_min_widths:
+		return sheet_xml
+
+	cols_match = re.search(r"<cols>(.*?)</cols>", sheet_xml, re.S)
+	cols = []
+	if cols_match:
+		for raw in _COL_RE.findall(cols_match.group(1)):
+			attrs = _attrs(raw)
+			cols.append([int(attrs["min"]), int(attrs["max"]), raw])
+
+	for col_idx, min_width in sorted(column_min_widths.items()):
+		for position, (col_min, col_max, raw) in enumerate(cols):
+			if col_min <= col_idx <= col_max:
+				current = float(_attrs(raw).get("width", 0) or 0)
+				if current >= min_width:
+					break
+				base = re.sub(r'\s(min|max|width|customWidth)="[^"]*"', "", raw)
+				replacement = []
+				if col_min < col_idx:
+					replacement.append([col_min, col_idx - 1, raw])
+				replacement.append([col_idx, col_idx, f'{base} width="{min_width!r}" customWidth="1"'])
+				if col_idx < col_max:
+					replacement.append([col_idx + 1, col_max, raw])
+				cols[position:position + 1] = replacement
+				break
+		else:
+			cols.append([col_idx, col_idx, f' width="{min_width!r}" customWidth="1"'])
+			cols.sort(key=lambda entry: entry[0])
+
+	rendered = []
+	for col_min, col_max, raw in cols:
+		raw = re.sub(r'\s(min|max)="[^"]*"', "", raw)
+		rendered.append(f'<col min="{col_min}" max="{col_max}"{raw}/>')
+	cols_xml = "<cols>" + "".join(rendered) + "</cols>"
+
+	if cols_match:
+		return sheet_xml[:cols_match.start()] + cols_xml + sheet_xml[cols_match.end():]
+	insert_at = re.search(r"<sheetData\b", sheet_xml).start()
+	return sheet_xml[:insert_at] + cols_xml + sheet_xml[insert_at:]
+
+
+def patch_sheet_xml(sheet_xml: str, patch: SheetPatch, anchors=None) -> str:
+	data_match = re.search(r"<sheetData\b[^>]*?(?:/>|>.*?</sheetData>)", sheet_xml, re.S)
+	if not data_match:
+		raise XlsxPatchError("Worksheet has no sheetData")
+
+	if anchors is None:
+		anchors = merged_anchor_index(_MERGE_RE.findall(sheet_xml))
+	writes = {}
+	for coordinate, value in patch.cells.items():
+		key = split_coordinate(coordinate)
+		key = anchors.get(key, key)
+		writes.pop(key, None)
+		writes[key] = value
+
+	sheet_data = _patch_sheet_data(data_match.group(0), writes, patch.row_heights)
+	sheet_xml = sheet_xml[:data_match.start()] + sheet_data + sheet_xml[data_match.end():]
+	return _patch_cols(sheet_xml, patch.column_min_widths)
+
+
+# ---------------------------------------------------------------------------
+# Drawing patching
+# ---------------------------------------------------------------------------
+
+def _image_payload(abs_path: str):
+	"""Return (extension, bytes); JPEG/PNG/GIF pass through, others become PNG like openpyxl."""
+	with PilImage.open(abs_path) as image:
+		image_format = (image.format or "png").lower()
+		# MPO is a multi-frame JPEG straight from phone cameras; its bytes are valid JPEG
+		if image_format == "mpo":
+			image_format = "jpeg"
+		if image_format not in IMAGE_CONTENT_TYPES:
+			buffer = BytesIO()
+			image.save(buffer, format="png")
+			return "png", buffer.getvalue()
+	with open(abs_path, "rb") as handle:
+		return image_format, handle.read()
+
+
+def _anchor_xml(coordinate: str, shape_id: int, rel_id: str, width: int, height: int) -> str:
+	row, col = split_coordinate(coordinate)
+	return (
+		"<xdr:oneCellAnchor>"
+		f"<xdr:from><xdr:col>{col - 1}</xdr:col><xdr:colOff>0</xdr:colOff>"
+		f"<xdr:row>{row - 1}</xdr:row><xdr:rowOff>0</xdr:rowOff></xdr:from>"
+		f'<xdr:ext cx="{int(width * EMU_PER_PIXEL)}" cy="{int(height * EMU_PER_PIXEL)}"/>'
+		"<xdr:pic><xdr:nvPicPr>"
+		f'<xdr:cNvPr id="{shape_id}" name="Image {shape_id}"/><xdr:cNvPicPr/>'
+		"</xdr:nvPicPr><xdr:blipFill>"
+		f'<a:blip xmlns:r="{NS_REL_DOC}" r:embed="{rel_id}"/>'
+		"<a:stretch><a:fillRect/></a:stretch></xdr:blipFill>"
+		'<xdr:spPr><a:prstGeom prst="rect"/></xdr:spPr>'
+		"</xdr:pic><xdr:clientData/></xdr:oneCellAnchor>"
+	)
+
+
+def _append_relationships(rels_xml, new_rels) -> str:
+	body = "".join(
+		f"<Relationship Id={quoteattr(rel_id)} Type={quoteattr(rel_type)} Target={quoteattr(target)}/>"
+		for rel_id, rel_type, target in new_rels
+	)
+	if rels_xml is None:
+		return (
+			'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+			'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+			f"{body}</Relationships>"
+		)
+	if rels_xml.rstrip().endswith("/>") and "</Relationships>" not in rels_xml:
+		rels_xml = re.sub(r"<Relationships\b([^>]*)/>", r"<Relationships\1></Relationships>", rels_xml)
+	return rels_xml.replace("</Relationships>", body + "</Relationships>", 1)
+
+
+# ---------------------------------------------------------------------------
+# Template prototypes
+# ---------------------------------------------------------------------------
+
+def _raw_payload(source_fp, info: zipfile.ZipInfo) -> bytes:
+	source_fp.seek(info.header_offset)
+	header = source_fp.read(30)
+	if len(header) != 30 or header[:4] != b"PK\003\004":
+		raise XlsxPatchError(f"Bad local header for {info.filename}")
+	name_len, extra_len = struct.unpack("<2H", header[26:30])
+	source_fp.seek(info.header_offset + 30 + name_len + extra_len)
+	payload = source_fp.read(info.compress_size)
+	if len(payload) != info.compress_size:
+		raise XlsxPatchError(f"Truncated member {info.filename}")
+	return payload
+
+
+class TemplatePrototype:
+	"""
+	A template parsed once and reused for every checklist build.
+
+	Holds the compressed bytes of every zip member (copied verbatim into each
+	output), the active sheet XML with its merged-range index, the sheet's
+	drawing and relationships, and the next free ids for new photos. A build
+	only splices the checklist's cells and anchors into these strings, so the
+	template is never reopened, re-inflated or reparsed. Instances are never
+	modified after construction and can be shared freely.
+	"""
+
+	def __init__(self, template_path: str):
+		self.path = template_path
+		with open(template_path, "rb") as source_fp:
+			self.data = source_fp.read()
+		source_fp = BytesIO(self.data)
+		with zipfile.ZipFile(source_fp) as archive:
+			self.members = [(info, _raw_payload(source_fp, info)) for info in archive.infolist()]
+			self.sheet_part = active_sheet_part(archive)
+			self.sheet_xml = archive.read(self.sheet_part).decode("utf-8")
+			self.merged_anchors = merged_anchor_index(_MERGE_RE.findall(self.sheet_xml))
+			self.content_types = archive.read("[Content_Types].xml").decode("utf-8")
+
+			self.drawing_part = None
+			self.drawing_xml = None
+			self.drawing_rels_path = None
+			self.drawing_rels_xml = None
+			self.next_rel = self.next_shape = self.next_media = 1
+			_sheet_rels_path, _sheet_rels_xml, sheet_rels = _read_relationships(archive, self.sheet_part)
+			for rel in sheet_rels:
+				if rel.get("Type") == REL_TYPE_DRAWING and rel.get("TargetMode") != "External":
+					drawing_part = _resolve_target(self.sheet_part, rel["Target"])
+					if drawing_part in archive.NameToInfo:
+						self.drawing_part = drawing_part
+			if self.drawing_part:
+				self.drawing_xml = archive.read(self.drawing_part).decode("utf-8")
+				self.drawing_rels_path, self.drawing_rels_xml, drawing_rels = _read_relationships(archive, self.drawing_part)
+				self.next_rel = _next_rel_id(drawing_rels)
+				self.next_shape = max((int(n) for n in re.findall(r'<xdr:cNvPr\b[^>]*?\bid="(\d+)"', self.drawing_xml)), default=0) + 1
+				media_numbers = [
+					int(m.group(1)) for m in
+					(re.match(r"xl/media/image(\d+)\.\w+$", name) for name in archive.NameToInfo)
+					if m
+				]
+				self.next_media = max(media_numbers, default=0) + 1
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def write_patched_workbook(template, output_path: str, patch: SheetPatch):
+	"""
+	Write template + patch to output_path. `template` is a TemplatePrototype
+	or a path to the template file.
+	The file is written next to output_path and renamed into place, so a
+	concurrent download never sees a half-written workbook.
+	"""
+	prototype = template if isinstance(template, TemplatePrototype) else TemplatePrototype(template)
+	replaced = {}
+	replaced[prototype.sheet_part] = patch_sheet_xml(prototype.sheet_xml, patch, prototype.merged_anchors).encode("utf-8")
+
+	new_media = []
+	if patch.images:
+		if not prototype.drawing_part:
+			raise XlsxPatchError("Template sheet has no drawing part to add photos to")
+		drawing_part = prototype.drawing_part
+		drawing_xml = prototype.drawing_xml
+		next_rel = prototype.next_rel
+		next_shape = prototype.next_shape
+		next_media = prototype.next_media
+
+		anchors = []
+		new_rels = []
+		for coordinate, abs_path, width, height in patch.images:
+			extension, data = _image_payload(abs_path)
+			media_part = f"xl/media/image{next_media}.{extension}"
+			rel_id = f"rId{next_rel}"
+			new_media.append((media_part, data))
+			new_rels.append((rel_id, REL_TYPE_IMAGE, _relative_target(drawing_part, media_part)))
+			anchors.append(_anchor_xml(coordinate, next_shape, rel_id, width, height))
+			next_media += 1
+			next_rel += 1
+			next_shape += 1
+
+		if "</xdr:wsDr>" not in drawing_xml:
+			raise XlsxPatchError("Unexpected drawing part layout")
+		replaced[drawing_part] = drawing_xml.replace("</xdr:wsDr>", "".join(anchors) + "</xdr:wsDr>", 1).encode("utf-8")
+		replaced[prototype.drawing_rels_path] = _append_relationships(prototype.drawing_rels_xml, new_rels).encode("utf-8")
+
+		content_types = prototype.content_types
+		known = {ext.lower() for ext in re.findall(r'<Default\b[^>]*?\bExtension="([^"]+)"', content_types)}
+		missing = sorted({part.rsplit(".", 1)[1] for part, _data in new_media} - known)
+		if missing:
+			defaults = "".join(
+				f'<Default Extension="{ext}" ContentType="{IMAGE_CONTENT_TYPES[ext]}"/>' for ext in missing
+			)
+			content_types = re.sub(r"(<Types\b[^>]*>)", lambda m: m.group(1) + defaults, content_types, count=1)
+			replaced["[Content_Types].xml"] = content_types.encode("utf-8")
+
+	output_dir = os.path.dirname(output_path) or "."
+	os.makedirs(output_dir, exist_ok=True)
+	fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".xlsx.tmp")
+	try:
+		with os.fdopen(fd, "wb") as out_fp:
+			assembler = _ZipAssembler(out_fp)
+			for info, payload in prototype.members:
+				if info.filename in replaced:
+					assembler.write_bytes(info.filename, replaced.pop(info.filename))
+				else:
+					assembler.copy_payload(info, payload)
+			# Parts that did not exist in the template (e.g. a new drawing .rels)
+			for name, data in replaced.items():
+				assembler.write_bytes(name, data)
+			# Photos are already compressed; deflating them again only costs CPU
+			for media_part, data in new_media:
+				assembler.write_bytes(media_part, data, compress=False)
+			assembler.close()
+		os.replace(tmp_path, output_path)
+	except BaseException:
+		if os.path.exists(tmp_path):
+			os.remove(tmp_path)
+		raise
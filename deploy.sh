@@ -62,9 +62,10 @@ sudo chmod -R 775 $APP_DIR/staticfiles
 # Copy systemd service file
 echo -e "\n${GREEN}⚙️  Setting up systemd service...${NC}"
 sudo cp $APP_DIR/checklist.service /etc/systemd/system/
+sudo cp $APP_DIR/checklist-workers.service /etc/systemd/system/
 sudo systemctl daemon-reload
-sudo systemctl enable checklist
-sudo systemctl start checklist
+sudo systemctl enable checklist checklist-workers
+sudo systemctl start checklist checklist-workers
 sudo systemctl status checklist
 
 # Configure Nginx
@@ -114,5 +115,6 @@ echo ""
 echo -e "${YELLOW}⚙️  Useful commands:${NC}"
 echo "  Restart app:    sudo systemctl restart checklist"
 echo "  View logs:      sudo journalctl -u checklist -f"
+echo "  Worker logs:    sudo journalctl -u checklist-workers -f"
 echo "  Nginx reload:   sudo systemctl reload nginx"
 echo "  Test SSL:       sudo certbot renew --dry-run"
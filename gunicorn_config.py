@@ -14,6 +14,10 @@ loglevel = "info"
 # Process naming
 proc_name = "checklist_app"
 
+# Load Django in the master so parsed templates are shared with the workers
+# (copy-on-write). Code changes need a restart rather than a HUP reload.
+preload_app = True
+
 # Server mechanics
 daemon = False
 pidfile = None
@@ -23,3 +27,15 @@ tmp_upload_dir = None
 
 # SSL handled by Nginx + Certbot
 # Gunicorn serves HTTP on localhost only
+
+
+def when_ready(server):
+    """Parse project templates once in the master, before workers fork."""
+    from django.db import connections
+
+    from core.template_cache import preload_template_prototypes
+
+    loaded = preload_template_prototypes()
+    # Forked workers must not inherit the master's database connection
+    connections.close_all()
+    server.log.info("Preloaded %d checklist template(s)", loaded)